@@ -1,12 +1,16 @@
 # Utility functions for working with AnalysisResult objects.
 
 import logging
+from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from .models import AnalysisResult
+from .report_store import load_report, load_reports_async
 
 
 def create_analysis_result(new_analysis_data: dict, db: Session) -> AnalysisResult:
@@ -79,8 +83,74 @@ def get_analysis_result(analysis_id: int, db: Session) -> Optional[AnalysisResul
         raise
 
 
-def get_user_analysis_results(user_id: str, db: Session) -> list[AnalysisResult]:
-    """Retrieve all AnalysisResults for a given user ordered by newest first.
+# Columns returned for result listings; the report itself is opt-in
+SUMMARY_COLUMNS = (
+    AnalysisResult.id,
+    AnalysisResult.query_text,
+    AnalysisResult.result_summary,
+    AnalysisResult.created_at,
+    AnalysisResult.user_id,
+    AnalysisResult.status,
+)
+
+
+def _page_statement(
+    user_id: str,
+    cursor: Optional[datetime],
+    before_id: Optional[int],
+    limit: Optional[int],
+    include_report: bool,
+) -> Select:
+    """Build the keyset query for a page of a user's results."""
+    columns = list(SUMMARY_COLUMNS)
+    if include_report:
+        columns += [AnalysisResult.full_report_json, AnalysisResult.report_digest]
+    statement = select(*columns).where(AnalysisResult.user_id == user_id)
+    if cursor is not None:
+        # The first bound lets the (user_id, created_at, id) index seek
+        statement = statement.where(
+            AnalysisResult.created_at <= cursor,
+            or_(
+                AnalysisResult.created_at < cursor,
+                and_(
+                    AnalysisResult.created_at == cursor,
+                    AnalysisResult.id < before_id,
+                ),
+            ),
+        )
+    statement = statement.order_by(
+        AnalysisResult.created_at.desc(), AnalysisResult.id.desc()
+    )
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def _cursor_statement(user_id: str, before_id: int) -> Select:
+    return select(AnalysisResult.created_at).where(
+        AnalysisResult.id == before_id, AnalysisResult.user_id == user_id
+    )
+
+
+def _attach_reports(db: Session, results: list[dict]) -> list[dict]:
+    """Fill ``full_report_json`` of results whose report is stored as a blob."""
+    for result in results:
+        digest = result.pop("report_digest")
+        if digest and not result["full_report_json"]:
+            report = load_report(db, digest)
+            if report is not None:
+                result["full_report_json"] = report.decode("utf-8")
+    return results
+
+
+def get_user_analysis_results(
+    user_id: str,
+    db: Session,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    include_report: bool = False,
+) -> list[dict]:
+    """Retrieve a page of AnalysisResults for a given user ordered by newest first.
 
     Parameters
     ----------
@@ -88,27 +158,128 @@ def get_user_analysis_results(user_id: str, db: Session) -> list[AnalysisResult]
         Identifier of the user whose analysis results should be fetched.
     db : Session
         SQLAlchemy session used for the query.
+    before_id : Optional[int]
+        Only return results that come after this result in the listing,
+        i.e. the id of the last result of the previous page.
+    limit : Optional[int]
+        Maximum number of results to return.
+    include_report : bool
+        Also load ``full_report_json``. Otherwise the report is never read.
 
     Returns
     -------
-    list[AnalysisResult]
-        Collection of AnalysisResult objects, empty if none found.
+    list[dict]
+        Column values of the matching results, empty if none found.
     """
     try:
-        return (
-            db.query(AnalysisResult)
-            .filter(AnalysisResult.user_id == user_id)
-            .order_by(AnalysisResult.created_at.desc())
-            .all()
+        cursor = None
+        if before_id is not None:
+            cursor = db.execute(_cursor_statement(user_id, before_id)).scalar()
+            if cursor is None:
+                return []
+        statement = _page_statement(user_id, cursor, before_id, limit, include_report)
+        results = [dict(row) for row in db.execute(statement).mappings()]
+    except SQLAlchemyError as exc:
+        logging.error(
+            "Failed to fetch AnalysisResults for user %s: %s", user_id, exc
         )
+        raise
+
+    if include_report:
+        _attach_reports(db, results)
+    return results
+
+
+async def get_user_analysis_results_async(
+    user_id: str,
+    db: AsyncSession,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    include_report: bool = False,
+) -> list[dict]:
+    """Async version of ``get_user_analysis_results``.
+
+    Parameters
+    ----------
+    user_id : str
+        Identifier of the user whose analysis results should be fetched.
+    db : AsyncSession
+        Async SQLAlchemy session used for the query.
+    before_id : Optional[int]
+        Id of the last result of the previous page.
+    limit : Optional[int]
+        Maximum number of results to return.
+    include_report : bool
+        Also load ``full_report_json``.
+
+    Returns
+    -------
+    list[dict]
+        Column values of the matching results, empty if none found.
+    """
+    try:
+        cursor = None
+        if before_id is not None:
+            cursor = (
+                await db.execute(_cursor_statement(user_id, before_id))
+            ).scalar()
+            if cursor is None:
+                return []
+        statement = _page_statement(user_id, cursor, before_id, limit, include_report)
+        results = [dict(row) for row in (await db.execute(statement)).mappings()]
     except SQLAlchemyError as exc:
         logging.error(
             "Failed to fetch AnalysisResults for user %s: %s", user_id, exc
         )
         raise
 
+    if include_report:
+        reports = await load_reports_async(
+            db,
+            [
+                result["report_digest"]
+                for result in results
+                if result["report_digest"] and not result["full_report_json"]
+            ],
+        )
+        for result in results:
+            report = reports.get(result.pop("report_digest"))
+            if report is not None and not result["full_report_json"]:
+                result["full_report_json"] = report.decode("utf-8")
+    return results
+
+
+def get_user_results_from_db(
+    db: Session,
+    user_id: str,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    include_report: bool = False,
+) -> list[dict]:
+    """Wrapper to fetch a page of results for a given user using ``get_user_analysis_results``."""
+
+    return get_user_analysis_results(
+        user_id=user_id,
+        db=db,
+        before_id=before_id,
+        limit=limit,
+        include_report=include_report,
+    )
+
 
-def get_user_results_from_db(db: Session, user_id: str) -> list[AnalysisResult]:
-    """Wrapper to fetch all results for a given user using ``get_user_analysis_results``."""
+async def get_user_results_from_db_async(
+    db: AsyncSession,
+    user_id: str,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    include_report: bool = False,
+) -> list[dict]:
+    """Async wrapper around ``get_user_analysis_results_async``."""
 
-    return get_user_analysis_results(user_id=user_id, db=db)
+    return await get_user_analysis_results_async(
+        user_id=user_id,
+        db=db,
+        before_id=before_id,
+        limit=limit,
+        include_report=include_report,
+    )
@@ -0,0 +1,469 @@
+# Shared analysis pipeline used by the API endpoints and the job workers.
+
+import hashlib
+import json
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from .models import AnalysisRecord
+from .analysis_result_service import store_analysis_in_db
+from .graph_pool import GRAPH_POOL_SIZE, graph_pool
+from .metrics import observe_run, track_analysis
+from .serialization import splice
+from .report_store import store_report
+
+DEFAULT_ANALYSTS = ["market", "social", "news", "fundamentals"]
+
+REPORT_KEYS = [
+    "market_report",
+    "fundamentals_report",
+    "sentiment_report",
+    "news_report",
+    "investment_plan",
+    "trader_investment_plan",
+    "final_trade_decision",
+]
+
+
+class AnalyzeRequest(BaseModel):
+    """Request model for /analyze endpoint."""
+
+    ticker: str
+    date: str
+    research_depth: int = 1
+    analysts: Optional[List[str]] = None
+    llm_provider: Optional[str] = None
+    backend_url: Optional[str] = None
+    quick_model: Optional[str] = None
+    deep_model: Optional[str] = None
+    # Continue a previously interrupted run for the same ticker and date
+    resume: bool = False
+
+
+def compute_data_availability(state: dict) -> dict:
+    """Return flags indicating which sections contain useful data."""
+    return {
+        "macro_news": bool(state.get("news_report")),
+        "analyst_breakdown": bool(
+            state.get("investment_debate_state", {}).get("history")
+        ),
+        "risk_assessment": bool(state.get("risk_debate_state", {}).get("history")),
+        "bullish_momentum": bool(state.get("market_report")),
+        "inflow_up": bool(state.get("fundamentals_report")),
+    }
+
+
+def compute_metrics(state: dict, run_metrics: Optional[dict] = None) -> dict:
+    """Return counts for tool calls, LLM calls and generated reports.
+
+    Calls are taken from ``run_metrics`` (see ``RunMetrics``) when given;
+    otherwise they are estimated from the messages left in the state, which
+    undercounts since the analysts' messages are cleared after each report.
+    """
+    if run_metrics:
+        tool_calls = run_metrics["totals"]["tool_calls"]
+        llm_calls = run_metrics["totals"]["llm_calls"]
+    else:
+        messages = state.get("messages", [])
+        llm_calls = max(len(messages) - 1, 0)
+        tool_calls = 0
+        for msg in messages:
+            if hasattr(msg, "tool_calls"):
+                tool_calls += len(msg.tool_calls)
+            elif isinstance(msg, dict) and msg.get("tool_calls"):
+                tool_calls += len(msg["tool_calls"])
+
+    reports_generated = sum(1 for k in REPORT_KEYS if state.get(k))
+    return {
+        "tool_calls": tool_calls,
+        "llm_calls": llm_calls,
+        "reports": reports_generated,
+    }
+
+
+def content_text(content) -> str:
+    """Text of a message's content, joining the text blocks of list content.
+
+    Providers such as Anthropic stream content as a list of blocks, where
+    tool-call and other non-text blocks carry no text.
+    """
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content or []:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text") or "")
+    return "".join(parts)
+
+
+def thread_id_for(user_id: int, request: AnalyzeRequest) -> str:
+    """Checkpoint thread of a user's analysis of a ticker on a date.
+
+    Includes a digest of the analysts, models and research depth, so a
+    resume only continues a run made with the same settings.
+    """
+    settings = repr(pool_key(request, build_config(request))).encode("utf-8")
+    digest = hashlib.sha256(settings).hexdigest()[:12]
+    return f"{user_id}:{request.ticker}:{request.date}:{digest}"
+
+
+def build_config(request: AnalyzeRequest) -> dict:
+    """Build the graph configuration for an analysis request."""
+    config = DEFAULT_CONFIG.copy()
+    config["max_debate_rounds"] = request.research_depth
+    config["max_risk_discuss_rounds"] = request.research_depth
+    if request.llm_provider is not None:
+        config["llm_provider"] = request.llm_provider
+    if request.backend_url is not None:
+        config["backend_url"] = request.backend_url
+    if request.quick_model is not None:
+        config["quick_think_llm"] = request.quick_model
+    if request.deep_model is not None:
+        config["deep_think_llm"] = request.deep_model
+    # Always checkpoint, so a failed run can be resumed by a later request
+    config["checkpoint_enabled"] = True
+    return config
+
+
+def create_graph(request: AnalyzeRequest, user):
+    """Initialize a graph for ``request`` using ``user``'s API keys."""
+    # Imported on first use so API processes that never run an analysis
+    # don't load the LLM clients and data libraries
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    return TradingAgentsGraph(
+        request.analysts or DEFAULT_ANALYSTS,
+        debug=True,
+        config=build_config(request),
+        openai_api_key=user.openai_api_key,
+        finnhub_api_key=user.finnhub_api_key,
+        run_observer=observe_run,
+    )
+
+
+def pool_key(request: AnalyzeRequest, config: dict) -> tuple:
+    """Everything that is fixed when a graph is built."""
+    return (
+        tuple(request.analysts or DEFAULT_ANALYSTS),
+        config["llm_provider"],
+        config["backend_url"],
+        config["quick_think_llm"],
+        config["deep_think_llm"],
+        config["max_debate_rounds"],
+        config["max_risk_discuss_rounds"],
+    )
+
+
+@contextmanager
+def checkout_graph(request: AnalyzeRequest, user):
+    """Borrow a graph for ``request`` from the pool, set up with ``user``'s keys."""
+    if GRAPH_POOL_SIZE <= 0:
+        graph = create_graph(request, user)
+        try:
+            with track_analysis(graph):
+                yield graph
+        finally:
+            graph.close()
+        return
+
+    with graph_pool.checkout(
+        pool_key(request, build_config(request)),
+        lambda: create_graph(request, user),
+        lambda graph: graph.set_api_keys(
+            user.openai_api_key, user.finnhub_api_key
+        ),
+    ) as graph, track_analysis(graph):
+        yield graph
+
+
+def persist_analysis(
+    db: Session,
+    user_id: int,
+    request: AnalyzeRequest,
+    report: bytes,
+    decision: str,
+    metrics: dict,
+    store_summary: bool = True,
+    sections: Optional[Dict[str, bytes]] = None,
+    run_metrics: Optional[dict] = None,
+) -> AnalysisRecord:
+    """Store the detailed record and, optionally, the summarized result.
+
+    ``report`` is the final state already encoded as JSON and ``sections``
+    its encoded top-level fields. The report is stored once as a compressed
+    blob that both rows reference. ``run_metrics`` is kept on the record
+    rather than in the report, so identical reports still share a blob.
+    """
+    digest = store_report(db, report, sections)
+    record = AnalysisRecord(
+        user_id=user_id,
+        ticker=request.ticker,
+        date=request.date,
+        decision=decision,
+        full_report="",
+        report_digest=digest,
+        tool_calls=metrics["tool_calls"],
+        llm_calls=metrics["llm_calls"],
+        reports_generated=metrics["reports"],
+        run_metrics=json.dumps(run_metrics) if run_metrics else None,
+    )
+    db.add(record)
+    db.commit()
+    db.refresh(record)
+
+    if store_summary:
+        new_analysis_data = {
+            "query_text": request.ticker,
+            "result_summary": decision,
+            "full_report_json": None,
+            "report_digest": digest,
+            "user_id": str(user_id),
+            "status": "completed",
+        }
+        stored_summary = store_analysis_in_db(db=db, analysis_data=new_analysis_data)
+        if stored_summary is None:
+            raise RuntimeError("Failed to store summary")
+    return record
+
+
+def complete_body(
+    request: AnalyzeRequest,
+    final_state: dict,
+    report: bytes,
+    decision: str,
+    metrics: dict,
+    **extra,
+) -> bytes:
+    """Encode the response body of a finished analysis.
+
+    ``report`` is the encoded final state and is spliced in as is.
+    """
+    payload = {
+        "ticker": request.ticker,
+        "date": request.date,
+        "decision": decision,
+        "availability": compute_data_availability(final_state),
+        "metrics": metrics,
+        **extra,
+    }
+    return splice(payload, "report", report)
+
+
+class AnalysisStream:
+    """Run an analysis while yielding ``(event, data)`` progress pairs.
+
+    Events are built from each node's state update rather than the full
+    state. With ``stream_tokens`` LLM output is also yielded as ``token``
+    events carrying the new text and the node generating it.
+
+    Once iteration finishes, ``final_state``, ``decision``, ``metrics`` and
+    ``run_metrics`` hold the outcome of the run.
+    """
+
+    def __init__(
+        self,
+        request: AnalyzeRequest,
+        user,
+        thread_id: Optional[str] = None,
+        stream_tokens: bool = True,
+    ):
+        self.request = request
+        self.user = user
+        self.thread_id = thread_id or thread_id_for(user.id, request)
+        self.stream_tokens = stream_tokens
+        self.final_state = None
+        self.decision = None
+        self.metrics = None
+        self.run_metrics = None
+        self.agent_status = {
+            # Analyst Team
+            "Market Analyst": "pending",
+            "Social Analyst": "pending",
+            "News Analyst": "pending",
+            "Fundamentals Analyst": "pending",
+            # Research Team
+            "Bull Researcher": "pending",
+            "Bear Researcher": "pending",
+            "Research Manager": "pending",
+            "Trader": "pending",
+            # Risk Management Team
+            "Risky Analyst": "pending",
+            "Neutral Analyst": "pending",
+            "Safe Analyst": "pending",
+            # Portfolio Management Team
+            "Portfolio Manager": "pending",
+        }
+
+    def update_status(self, agent: str, status: str) -> Optional[Tuple[str, dict]]:
+        if self.agent_status.get(agent) != status:
+            self.agent_status[agent] = status
+            return "status", {"agent": agent, "status": status}
+        return None
+
+    def update_research_team(self, status: str) -> List[Tuple[str, dict]]:
+        events = []
+        for a in ["Bull Researcher", "Bear Researcher", "Research Manager", "Trader"]:
+            ev = self.update_status(a, status)
+            if ev:
+                events.append(ev)
+        return events
+
+    def __iter__(self) -> Iterator[Tuple[str, dict]]:
+        request = self.request
+        with checkout_graph(request, self.user) as graph:
+            init_state, args = graph.prepare_run(
+                request.ticker,
+                request.date,
+                resume=request.resume,
+                thread_id=self.thread_id,
+            )
+            completed = False
+            try:
+                yield from self._run(graph, init_state, args)
+                completed = True
+            finally:
+                graph.finish_run(args, completed)
+
+    def _status_events(self, update: dict) -> List[Tuple[str, dict]]:
+        """Agent status changes implied by one node's state update."""
+        update_status = self.update_status
+        update_research_team = self.update_research_team
+        selected_analysts = self.request.analysts or DEFAULT_ANALYSTS
+
+        events_to_send = []
+        if update.get("market_report"):
+            ev = update_status("Market Analyst", "completed")
+            if ev:
+                events_to_send.append(ev)
+            if "social" in selected_analysts:
+                ev = update_status("Social Analyst", "in_progress")
+                if ev:
+                    events_to_send.append(ev)
+
+        if update.get("sentiment_report"):
+            ev = update_status("Social Analyst", "completed")
+            if ev:
+                events_to_send.append(ev)
+            if "news" in selected_analysts:
+                ev = update_status("News Analyst", "in_progress")
+                if ev:
+                    events_to_send.append(ev)
+
+        if update.get("news_report"):
+            ev = update_status("News Analyst", "completed")
+            if ev:
+                events_to_send.append(ev)
+            if "fundamentals" in selected_analysts:
+                ev = update_status("Fundamentals Analyst", "in_progress")
+                if ev:
+                    events_to_send.append(ev)
+
+        if update.get("fundamentals_report"):
+            ev = update_status("Fundamentals Analyst", "completed")
+            if ev:
+                events_to_send.append(ev)
+            events_to_send.extend(update_research_team("in_progress"))
+
+        if update.get("investment_debate_state") and update["investment_debate_state"].get("judge_decision"):
+            events_to_send.extend(update_research_team("completed"))
+            ev = update_status("Risky Analyst", "in_progress")
+            if ev:
+                events_to_send.append(ev)
+
+        if update.get("trader_investment_plan"):
+            ev = update_status("Trader", "completed")
+            if ev:
+                events_to_send.append(ev)
+
+        if update.get("risk_debate_state"):
+            risk_state = update["risk_debate_state"]
+            if risk_state.get("current_risky_response"):
+                ev = update_status("Risky Analyst", "in_progress")
+                if ev:
+                    events_to_send.append(ev)
+            if risk_state.get("current_safe_response"):
+                ev = update_status("Safe Analyst", "in_progress")
+                if ev:
+                    events_to_send.append(ev)
+            if risk_state.get("current_neutral_response"):
+                ev = update_status("Neutral Analyst", "in_progress")
+                if ev:
+                    events_to_send.append(ev)
+            if risk_state.get("judge_decision"):
+                for a in ["Risky Analyst", "Safe Analyst", "Neutral Analyst", "Portfolio Manager"]:
+                    ev = update_status(a, "completed")
+                    if ev:
+                        events_to_send.append(ev)
+        return events_to_send
+
+    def _run(self, graph, init_state, args) -> Iterator[Tuple[str, dict]]:
+        from langchain_core.messages import AIMessageChunk, RemoveMessage
+
+        reports_generated = 0
+        seen_reports = set()
+
+        # Events come from per-node state deltas and LLM tokens; the final
+        # state is read from the checkpoint once the run ends
+        modes = ["updates"]
+        if self.stream_tokens:
+            modes.append("messages")
+        stream_args = dict(args, stream_mode=modes)
+        for mode, payload in graph.graph.stream(init_state, **stream_args):
+            if mode == "messages":
+                chunk, metadata = payload
+                delta = content_text(chunk.content) if isinstance(chunk, AIMessageChunk) else ""
+                if delta:
+                    yield "token", {
+                        "node": metadata.get("langgraph_node"),
+                        "delta": delta,
+                    }
+                continue
+
+            for update in payload.values():
+                if not update:
+                    continue
+                for msg_obj in update.get("messages") or []:
+                    if isinstance(msg_obj, RemoveMessage):
+                        continue
+                    if hasattr(msg_obj, "content"):
+                        message = msg_obj.content
+                    elif isinstance(msg_obj, dict):
+                        message = json.dumps(msg_obj)
+                    else:
+                        message = str(msg_obj)
+                    totals = graph.run_metrics.totals()
+                    yield "update", {
+                        "message": message,
+                        "tool_calls": totals["tool_calls"],
+                        "llm_calls": totals["llm_calls"],
+                        "reports": reports_generated,
+                    }
+
+                for ev in self._status_events(update):
+                    yield ev
+
+                for key in REPORT_KEYS:
+                    if update.get(key) and key not in seen_reports:
+                        reports_generated += 1
+                        seen_reports.add(key)
+
+        last_state = graph.graph.get_state(args["config"]).values or None
+        if last_state is None:
+            raise RuntimeError("Analysis produced no output")
+
+        self.final_state = last_state
+        self.decision = graph.process_signal(last_state["final_trade_decision"])
+        self.run_metrics = graph.run_metrics.summary()
+        self.metrics = compute_metrics(last_state, self.run_metrics)
+
+        # Mark remaining agents completed
+        for agent in list(self.agent_status.keys()):
+            ev = self.update_status(agent, "completed")
+            if ev:
+                yield ev
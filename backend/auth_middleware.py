@@ -1,24 +1,49 @@
 import os
 import jwt
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 SECRET_KEY = os.environ.get("SECRET_KEY", "change-me")
 ALGORITHM = "HS256"
 
-class AuthTokenMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
-        request.state.user = None
-        auth_header = request.headers.get("Authorization")
+
+class AuthUserObj:
+    """Minimal user info available to middlewares as ``request.state.user``."""
+
+    __slots__ = ("id",)
+
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+class AuthTokenMiddleware:
+    """Decode the bearer token once per request.
+
+    The decoded payload is stored on ``request.state.auth_payload`` (``None``
+    for a missing or invalid token) for ``get_current_user`` to reuse.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["user"] = None
+        state["auth_payload"] = None
+        auth_header = Headers(scope=scope).get("Authorization")
         if auth_header and auth_header.lower().startswith("bearer "):
             token = auth_header.split(" ", 1)[1]
             try:
                 payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+                state["auth_payload"] = payload
                 user_id = payload.get("id")
                 if user_id is not None:
-                    request.state.user = type("UserObj", (), {"id": user_id})()
+                    state["user"] = AuthUserObj(user_id)
             except Exception:
                 # Ignore token errors and continue without user info
                 pass
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
@@ -1,11 +1,35 @@
 import os
+import threading
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import cx_Oracle
 from sqlalchemy.exc import SQLAlchemyError
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./users.db")
 WALLET_PATH = os.getenv("ORACLE_WALLET_PATH")
+# Password of the wallet's ewallet.pem, needed by the thin async driver; the
+# thick client of the sync engine opens the auto-login cwallet.sso instead
+WALLET_PASSWORD = os.getenv("ORACLE_WALLET_PASSWORD")
+
+# Connection pool sizing, shared by the sync and async engines
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+
+def _async_url(url: str) -> str:
+    """Map a sync database URL to the matching asyncio driver."""
+    if url.startswith("sqlite+aiosqlite") or url.startswith("oracle+oracledb_async"):
+        return url
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    if url.startswith("oracle"):
+        return "oracle+oracledb_async" + url[url.index(":"):]
+    raise RuntimeError(f"No async driver configured for {url.split(':')[0]}")
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
 
 if DATABASE_URL.startswith("oracle+cx_oracle") and WALLET_PATH:
     # Initialize Oracle client so it can locate the wallet files
@@ -19,18 +43,81 @@ if DATABASE_URL.startswith("oracle+cx_oracle") and WALLET_PATH:
         raise RuntimeError(f"Oracle client initialization failed: {exc}") from exc
 
 
+def _pool_args(url: str) -> dict:
+    # In-memory SQLite uses a single connection, which takes no pool sizing
+    if ":memory:" in url:
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+
 try:
     engine = create_engine(
         DATABASE_URL,
         pool_pre_ping=True,
-        connect_args={"check_same_thread": False}
+        # Job workers write from other processes; wait for their locks
+        connect_args={"check_same_thread": False, "timeout": 30}
         if DATABASE_URL.startswith("sqlite")
         else {},
+        **_pool_args(DATABASE_URL),
     )
 except SQLAlchemyError as exc:
     raise RuntimeError(f"Could not create SQLAlchemy engine: {exc}") from exc
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Bound to the async engine on first use, see get_async_engine()
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+_async_engine = None
+_async_engine_lock = threading.Lock()
+
+
+def _async_connect_args() -> dict:
+    if ASYNC_DATABASE_URL.startswith("sqlite"):
+        return {"timeout": 30}
+    if not WALLET_PATH:
+        return {}
+    args = {"config_dir": WALLET_PATH, "wallet_location": WALLET_PATH}
+    if WALLET_PASSWORD:
+        args["wallet_password"] = WALLET_PASSWORD
+    return args
+
+
+def get_async_engine():
+    """The async engine, created on first use.
+
+    Job workers and CLI scripts only use the sync engine, so they never load
+    the async driver or open its pool.
+    """
+    global _async_engine
+    if _async_engine is not None:
+        return _async_engine
+    with _async_engine_lock:
+        if _async_engine is None:
+            try:
+                _async_engine = create_async_engine(
+                    ASYNC_DATABASE_URL,
+                    pool_pre_ping=True,
+                    connect_args=_async_connect_args(),
+                    **_pool_args(ASYNC_DATABASE_URL),
+                )
+            except SQLAlchemyError as exc:
+                raise RuntimeError(
+                    f"Could not create SQLAlchemy async engine: {exc}"
+                ) from exc
+            AsyncSessionLocal.configure(bind=_async_engine)
+        return _async_engine
+
+
+def engines() -> dict:
+    """The engines created so far, by label."""
+    created = {"sync": engine}
+    if _async_engine is not None:
+        created["async"] = _async_engine
+    return created
 
 Base = declarative_base()
 
@@ -40,3 +127,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,60 @@
+# Per-process pool of compiled TradingAgents graphs.
+
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Hashable
+
+GRAPH_POOL_SIZE = int(os.getenv("GRAPH_POOL_SIZE", "4"))
+
+
+class GraphPool:
+    """Keep idle graphs around so requests skip building them.
+
+    A graph is checked out by one request at a time. Graphs are grouped by a
+    key describing everything fixed at build time; up to ``max_idle`` idle
+    graphs are kept per key and any extra ones are closed on check-in.
+    """
+
+    def __init__(self, max_idle: int = GRAPH_POOL_SIZE):
+        self.max_idle = max_idle
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @contextmanager
+    def checkout(self, key: Hashable, factory: Callable, prepare: Callable):
+        """Yield an idle graph for ``key`` or a new one from ``factory``.
+
+        ``prepare`` is called on reused graphs before they are handed out.
+        """
+        with self._lock:
+            graph = self._idle[key].pop() if self._idle[key] else None
+
+        if graph is None:
+            graph = factory()
+            self.created += 1
+        else:
+            prepare(graph)
+            self.reused += 1
+
+        try:
+            yield graph
+        finally:
+            graph.reset()
+            with self._lock:
+                keep = len(self._idle[key]) < self.max_idle
+                if keep:
+                    self._idle[key].append(graph)
+            if not keep:
+                graph.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            idle = sum(len(graphs) for graphs in self._idle.values())
+        return {"created": self.created, "reused": self.reused, "idle": idle}
+
+
+graph_pool = GraphPool()
@@ -0,0 +1,346 @@
+# Background analysis jobs.
+#
+# Jobs are queued in the application database and executed by worker
+# processes, so long analyses never hold an API request open. The API
+# process starts ``JOB_WORKERS`` workers on startup; workers can also run on
+# their own with ``python -m backend.jobs``.
+#
+# A worker renews the lease of its running job every few seconds. Running
+# jobs whose lease expired (the worker was terminated or crashed) are failed
+# by the next worker that polls the queue. Finished jobs and their events are
+# deleted ``JOB_RETENTION_SECONDS`` after they end; the analyses they stored
+# stay in the history.
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, update
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .metrics import disable_recording
+from .models import AnalysisJob, AnalysisJobEvent, User
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+# Seconds a running job stays claimed without its worker renewing the lease
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# Seconds finished jobs and their events are kept for polling and replay
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+# Seconds between two retention sweeps of a worker
+JOB_PURGE_INTERVAL = 300.0
+
+TERMINAL_STATUSES = ("completed", "failed")
+TERMINAL_EVENTS = ("complete", "error")
+
+
+def enqueue_job(db: Session, user_id: int, request) -> AnalysisJob:
+    """Queue an analysis request for the workers."""
+    job = AnalysisJob(
+        user_id=user_id, status="queued", request_json=request.json()
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_next_job(db: Session) -> Optional[AnalysisJob]:
+    """Atomically move the oldest queued job to ``running`` and return it.
+
+    The conditional update only succeeds for one worker, so several worker
+    processes (or API replicas) can poll the same queue.
+    """
+    while True:
+        job_id = (
+            db.query(AnalysisJob.id)
+            .filter(AnalysisJob.status == "queued")
+            .order_by(AnalysisJob.id)
+            .limit(1)
+            .scalar()
+        )
+        if job_id is None:
+            return None
+        claimed = db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, AnalysisJob.status == "queued")
+            .values(
+                status="running",
+                started_at=datetime.utcnow(),
+                heartbeat_at=datetime.utcnow(),
+            )
+        ).rowcount
+        db.commit()
+        if claimed:
+            return db.get(AnalysisJob, job_id)
+
+
+def _stale_condition(cutoff: datetime):
+    return and_(
+        AnalysisJob.status == "running",
+        or_(
+            AnalysisJob.heartbeat_at < cutoff,
+            and_(AnalysisJob.heartbeat_at.is_(None), AnalysisJob.started_at < cutoff),
+        ),
+    )
+
+
+def fail_stale_jobs(db: Session) -> int:
+    """Fail running jobs whose worker stopped renewing their lease.
+
+    The job gets an ``error`` event, so SSE clients following it are told
+    instead of waiting forever. Returns the number of jobs failed.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=JOB_LEASE_SECONDS)
+    job_ids = [
+        job_id
+        for (job_id,) in db.query(AnalysisJob.id).filter(_stale_condition(cutoff))
+    ]
+    failed = 0
+    for job_id in job_ids:
+        # Conditional, in case the worker renewed the lease meanwhile
+        if db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, _stale_condition(cutoff))
+            .values(
+                status="failed",
+                error="Worker stopped before finishing the job",
+                finished_at=datetime.utcnow(),
+            )
+        ).rowcount:
+            logger.warning("Failing job %s abandoned by its worker", job_id)
+            add_event(
+                db, job_id, "error", {"detail": "Worker stopped before finishing the job"}
+            )
+            failed += 1
+    db.commit()
+    return failed
+
+
+def purge_finished_jobs(db: Session) -> int:
+    """Delete jobs that ended over ``JOB_RETENTION_SECONDS`` ago, with their events.
+
+    Returns the number of jobs deleted.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=JOB_RETENTION_SECONDS)
+    job_ids = [
+        job_id
+        for (job_id,) in db.query(AnalysisJob.id).filter(
+            AnalysisJob.status.in_(TERMINAL_STATUSES),
+            AnalysisJob.finished_at < cutoff,
+        )
+    ]
+    # In chunks, to stay under the bind parameter limits of the databases
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start:start + 500]
+        db.execute(
+            delete(AnalysisJobEvent).where(AnalysisJobEvent.job_id.in_(chunk))
+        )
+        db.execute(delete(AnalysisJob).where(AnalysisJob.id.in_(chunk)))
+        db.commit()
+    return len(job_ids)
+
+
+class _LeaseRenewer:
+    """Renews the lease of a running job from a background thread."""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"job-lease-{job_id}", daemon=True
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(JOB_LEASE_SECONDS / 3):
+            db = SessionLocal()
+            try:
+                db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == self.job_id)
+                    .values(heartbeat_at=datetime.utcnow())
+                )
+                db.commit()
+            except Exception:
+                logger.exception("Failed to renew the lease of job %s", self.job_id)
+            finally:
+                db.close()
+
+
+def job_counts() -> Dict[str, int]:
+    """Number of jobs in each status, across every worker."""
+    db = SessionLocal()
+    try:
+        counts = dict(
+            db.query(AnalysisJob.status, func.count(AnalysisJob.id))
+            .group_by(AnalysisJob.status)
+            .all()
+        )
+        return {
+            status: counts.get(status, 0)
+            for status in ("queued", "running") + TERMINAL_STATUSES
+        }
+    finally:
+        db.close()
+
+
+def add_event(db: Session, job_id: int, event: str, data) -> None:
+    """Append a progress event to a job; ``data`` is a dict or encoded JSON."""
+    if not isinstance(data, str):
+        data = json.dumps(data)
+    db.add(AnalysisJobEvent(job_id=job_id, event=event, data=data))
+    db.commit()
+
+
+def poll_job(job_id: int, after_id: int = 0) -> Tuple[Optional[str], List[tuple]]:
+    """Return the job status and its events newer than ``after_id``."""
+    db = SessionLocal()
+    try:
+        job_status = (
+            db.query(AnalysisJob.status).filter(AnalysisJob.id == job_id).scalar()
+        )
+        events = (
+            db.query(AnalysisJobEvent.id, AnalysisJobEvent.event, AnalysisJobEvent.data)
+            .filter(AnalysisJobEvent.job_id == job_id, AnalysisJobEvent.id > after_id)
+            .order_by(AnalysisJobEvent.id)
+            .all()
+        )
+        return job_status, [tuple(ev) for ev in events]
+    finally:
+        db.close()
+
+
+def run_job(db: Session, job: AnalysisJob) -> None:
+    """Execute a claimed job, recording its events and outcome."""
+    from .analysis_runner import (
+        AnalysisStream,
+        AnalyzeRequest,
+        complete_body,
+        persist_analysis,
+    )
+    from .serialization import encode_state
+
+    try:
+        request = AnalyzeRequest.parse_raw(job.request_json)
+        user = db.get(User, job.user_id)
+        if user is None:
+            raise RuntimeError("User not found")
+        if not user.openai_api_key or not user.finnhub_api_key:
+            raise RuntimeError("API keys not configured")
+
+        # Token events would add a row per token; clients get the messages
+        run = AnalysisStream(request, user, stream_tokens=False)
+        for event, data in run:
+            add_event(db, job.id, event, data)
+
+        report, sections = encode_state(run.final_state)
+        record = persist_analysis(
+            db,
+            user.id,
+            request,
+            report,
+            run.decision,
+            run.metrics,
+            sections=sections,
+            run_metrics=run.run_metrics,
+        )
+        body = complete_body(
+            request,
+            run.final_state,
+            report,
+            run.decision,
+            run.metrics,
+            record_id=record.id,
+            run_metrics=run.run_metrics,
+        )
+        add_event(db, job.id, "complete", body.decode("utf-8"))
+
+        job.status = "completed"
+        job.record_id = record.id
+        job.decision = run.decision
+    except Exception as exc:
+        logger.exception("Analysis job %s failed", job.id)
+        db.rollback()
+        add_event(db, job.id, "error", {"detail": str(exc)})
+        job.status = "failed"
+        job.error = str(exc)
+    job.finished_at = datetime.utcnow()
+    db.commit()
+
+
+def worker_loop(stop_event=None) -> None:
+    """Claim and run jobs until ``stop_event`` is set."""
+    # The analysis metrics of this process could not be scraped
+    disable_recording()
+    next_purge = 0.0
+    while stop_event is None or not stop_event.is_set():
+        db = SessionLocal()
+        try:
+            fail_stale_jobs(db)
+            if time.monotonic() >= next_purge:
+                next_purge = time.monotonic() + JOB_PURGE_INTERVAL
+                purged = purge_finished_jobs(db)
+                if purged:
+                    logger.info("Deleted %d finished jobs", purged)
+            job = claim_next_job(db)
+            if job is not None:
+                with _LeaseRenewer(job.id):
+                    run_job(db, job)
+        except Exception:
+            logger.exception("Job worker error")
+            job = None
+        finally:
+            db.close()
+        if job is None:
+            if stop_event is None:
+                time.sleep(JOB_POLL_INTERVAL)
+            else:
+                stop_event.wait(JOB_POLL_INTERVAL)
+
+
+def start_workers(count: int = JOB_WORKERS):
+    """Spawn ``count`` worker processes and return them with their stop event."""
+    ctx = multiprocessing.get_context("spawn")
+    stop_event = ctx.Event()
+    processes = []
+    for i in range(count):
+        process = ctx.Process(
+            target=worker_loop,
+            args=(stop_event,),
+            name=f"analysis-worker-{i}",
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+    return processes, stop_event
+
+
+def stop_workers(processes, stop_event, timeout: float = 5.0) -> None:
+    """Ask workers to exit after their current job, terminating stragglers."""
+    stop_event.set()
+    deadline = time.monotonic() + timeout
+    for process in processes:
+        process.join(max(deadline - time.monotonic(), 0))
+        if process.is_alive():
+            process.terminate()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    worker_loop()
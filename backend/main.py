@@ -1,31 +1,62 @@
 import os
 import json
-from langchain_core.messages import BaseMessage
+import asyncio
 from typing import List, Optional
 from datetime import datetime
 import posthog
 
 import jwt
-from fastapi import FastAPI, HTTPException, Depends, status, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Depends, Query, status, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import inspect, text
-
-from tradingagents.graph.trading_graph import TradingAgentsGraph
-from tradingagents.default_config import DEFAULT_CONFIG
-from .database import Base, engine, get_db
-from .models import User, AnalysisRecord
-from .analysis_result_service import (
-    store_analysis_in_db,
-    get_user_results_from_db,
+from sqlalchemy import inspect, select, text
+from tradingagents.graph.run_claims import RunInProgressError
+
+from .database import Base, engine, engines, get_async_db, get_db
+from .models import User, AnalysisRecord, AnalysisJob
+from .analysis_result_service import get_user_results_from_db_async
+from .analysis_runner import (
+    AnalysisStream,
+    AnalyzeRequest,
+    complete_body,
+    checkout_graph,
+    compute_metrics,
+    persist_analysis,
+    thread_id_for,
+)
+from .serialization import encode_state, join_sections, json_bytes_response, splice
+from .report_store import REPORT_FIELDS, load_sections_async, record_report_async
+from .jobs import (
+    JOB_POLL_INTERVAL,
+    JOB_WORKERS,
+    TERMINAL_EVENTS,
+    TERMINAL_STATUSES,
+    enqueue_job,
+    job_counts,
+    poll_job,
+    start_workers,
+    stop_workers,
 )
 from passlib.context import CryptContext
 from sse_starlette.sse import EventSourceResponse, ServerSentEvent
-from .posthog_middleware import PostHogMiddleware
+from .posthog_middleware import PostHogMiddleware, analytics_events
+from .graph_pool import graph_pool
+from .metrics import (
+    CONTENT_TYPE,
+    METRICS_ENABLED,
+    MetricsMiddleware,
+    data_cache_samples,
+    pool_samples,
+    registry,
+    stats_samples,
+)
 from .auth_middleware import AuthTokenMiddleware
+from .user_cache import AuthUser, user_cache
 from .posthog_config import POSTHOG_ENABLED, capture_error
 
 app = FastAPI()
@@ -56,17 +87,21 @@ app.add_middleware(
 )
 app.add_middleware(AuthTokenMiddleware)
 app.add_middleware(PostHogMiddleware)
+if METRICS_ENABLED:
+    # Outermost, so the latency covers the other middlewares too
+    app.add_middleware(MetricsMiddleware)
 
 # Initialize database
 Base.metadata.create_all(bind=engine)
 
 
 def _ensure_analysis_columns():
-    """Create new columns in analysis_records if they don't exist."""
+    """Create new columns in analysis_records and analysis_jobs if missing."""
     inspector = inspect(engine)
     if not inspector.has_table("analysis_records"):
         return
-    existing = {col["name"] for col in inspector.get_columns("analysis_records")}
+    columns = {col["name"]: col for col in inspector.get_columns("analysis_records")}
+    existing = set(columns)
     with engine.begin() as conn:
         if "tool_calls" not in existing:
             conn.execute(
@@ -86,10 +121,74 @@ def _ensure_analysis_columns():
                     "ALTER TABLE analysis_records ADD COLUMN reports_generated INTEGER DEFAULT 0"
                 )
             )
+        if "report_digest" not in existing:
+            conn.execute(
+                text("ALTER TABLE analysis_records ADD COLUMN report_digest VARCHAR(64)")
+            )
+        if "run_metrics" not in existing:
+            text_type = "CLOB" if engine.dialect.name == "oracle" else "TEXT"
+            conn.execute(
+                text(f"ALTER TABLE analysis_records ADD COLUMN run_metrics {text_type}")
+            )
+        # Oracle stores the empty full_report of blob-backed rows as NULL
+        if engine.dialect.name == "oracle" and not columns["full_report"]["nullable"]:
+            conn.execute(text("ALTER TABLE analysis_records MODIFY (full_report NULL)"))
+
+        if inspector.has_table("analysis_results"):
+            result_columns = {
+                col["name"] for col in inspector.get_columns("analysis_results")
+            }
+            if "report_digest" not in result_columns:
+                conn.execute(
+                    text(
+                        "ALTER TABLE analysis_results ADD COLUMN report_digest VARCHAR(64)"
+                    )
+                )
+
+        if inspector.has_table("analysis_jobs"):
+            job_columns = {col["name"] for col in inspector.get_columns("analysis_jobs")}
+            if "heartbeat_at" not in job_columns:
+                conn.execute(
+                    text("ALTER TABLE analysis_jobs ADD COLUMN heartbeat_at TIMESTAMP")
+                )
 
 
 _ensure_analysis_columns()
 
+
+def _ensure_indexes():
+    """Create indexes added to existing tables after their creation."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+_ensure_indexes()
+
+# Page size limits of the listing endpoints
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+
+
+@app.on_event("startup")
+def start_job_workers():
+    """Start the background analysis workers (disabled with JOB_WORKERS=0)."""
+    app.state.job_workers = start_workers(JOB_WORKERS) if JOB_WORKERS > 0 else None
+
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    if app.state.job_workers:
+        stop_workers(*app.state.job_workers)
+
+
+@app.on_event("shutdown")
+def flush_analytics():
+    """Send queued analytics events before the process exits."""
+    if POSTHOG_ENABLED:
+        analytics_events.close()
+
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.environ.get("SECRET_KEY")
 if not SECRET_KEY:
@@ -111,42 +210,61 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("id")
-    except jwt.PyJWTError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-        ) from exc
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-        )
-    return user
-
+def _invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+    )
 
-def _serialize_obj(obj):
-    """Helper to make objects JSON serializable."""
-    if isinstance(obj, BaseMessage):
-        return obj.to_json()
-    return str(obj)
 
+def _user_id_from_token(request: Request, token: str) -> int:
+    """Return the user id of the token, reusing the middleware's decode."""
+    state = request.scope.get("state", {})
+    if "auth_payload" in state:
+        payload = state["auth_payload"]
+    else:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except jwt.PyJWTError:
+            payload = None
+    user_id = payload.get("id") if payload else None
+    if user_id is None:
+        raise _invalid_token()
+    return user_id
 
-class AnalyzeRequest(BaseModel):
-    """Request model for /analyze endpoint."""
 
-    ticker: str
-    date: str
-    research_depth: int = 1
-    analysts: Optional[List[str]] = None
-    llm_provider: Optional[str] = None
-    backend_url: Optional[str] = None
-    quick_model: Optional[str] = None
-    deep_model: Optional[str] = None
+def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> AuthUser:
+    user_id = _user_id_from_token(request, token)
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise _invalid_token()
+    auth_user = AuthUser.from_user(user)
+    user_cache.put(auth_user)
+    return auth_user
+
+
+async def get_current_user_async(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthUser:
+    """Async version of ``get_current_user`` for async endpoints."""
+    user_id = _user_id_from_token(request, token)
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    user = await db.get(User, user_id)
+    if not user:
+        raise _invalid_token()
+    auth_user = AuthUser.from_user(user)
+    user_cache.put(auth_user)
+    return auth_user
 
 
 class UserCreate(BaseModel):
@@ -181,47 +299,6 @@ class AnalysisResponse(BaseModel):
         orm_mode = True
 
 
-def compute_data_availability(state: dict) -> dict:
-    """Return flags indicating which sections contain useful data."""
-    return {
-        "macro_news": bool(state.get("news_report")),
-        "analyst_breakdown": bool(
-            state.get("investment_debate_state", {}).get("history")
-        ),
-        "risk_assessment": bool(state.get("risk_debate_state", {}).get("history")),
-        "bullish_momentum": bool(state.get("market_report")),
-        "inflow_up": bool(state.get("fundamentals_report")),
-    }
-
-
-def compute_metrics(state: dict) -> dict:
-    """Return counts for tool calls, LLM calls and generated reports."""
-    messages = state.get("messages", [])
-    llm_calls = max(len(messages) - 1, 0)
-    tool_calls = 0
-    for msg in messages:
-        if hasattr(msg, "tool_calls"):
-            tool_calls += len(msg.tool_calls)
-        elif isinstance(msg, dict) and msg.get("tool_calls"):
-            tool_calls += len(msg["tool_calls"])
-
-    report_keys = [
-        "market_report",
-        "fundamentals_report",
-        "sentiment_report",
-        "news_report",
-        "investment_plan",
-        "trader_investment_plan",
-        "final_trade_decision",
-    ]
-    reports_generated = sum(1 for k in report_keys if state.get(k))
-    return {
-        "tool_calls": tool_calls,
-        "llm_calls": llm_calls,
-        "reports": reports_generated,
-    }
-
-
 @app.get("/")
 def read_root():
     """Health check route."""
@@ -260,7 +337,7 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @app.get("/me")
-def read_profile(current_user: User = Depends(get_current_user)):
+def read_profile(current_user: AuthUser = Depends(get_current_user)):
     return {
         "id": current_user.id,
         "email": current_user.email,
@@ -272,15 +349,20 @@ def read_profile(current_user: User = Depends(get_current_user)):
 @app.put("/keys")
 def update_keys(
     update: UpdateKeys,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    user = db.get(User, current_user.id)
+    if user is None:
+        # Deleted since the cached user was loaded
+        user_cache.invalidate(current_user.id)
+        raise _invalid_token()
     if update.openai_api_key is not None:
-        current_user.openai_api_key = update.openai_api_key
+        user.openai_api_key = update.openai_api_key
     if update.finnhub_api_key is not None:
-        current_user.finnhub_api_key = update.finnhub_api_key
+        user.finnhub_api_key = update.finnhub_api_key
     db.commit()
-    db.refresh(current_user)
+    user_cache.invalidate(current_user.id)
     return {"status": "ok"}
 
 
@@ -288,7 +370,7 @@ def update_keys(
 def analyze(
     request: AnalyzeRequest,
     http_request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Run the TradingAgents analysis and return the results."""
@@ -297,68 +379,42 @@ def analyze(
         raise HTTPException(status_code=400, detail="API keys not configured")
 
     try:
+        with checkout_graph(request, current_user) as graph:
+            final_state, decision = graph.propagate(
+                request.ticker,
+                request.date,
+                resume=request.resume,
+                thread_id=thread_id_for(current_user.id, request),
+            )
 
-        # Configure graph based on research depth
-        config = DEFAULT_CONFIG.copy()
-        config["max_debate_rounds"] = request.research_depth
-        config["max_risk_discuss_rounds"] = request.research_depth
-        if request.llm_provider is not None:
-            config["llm_provider"] = request.llm_provider
-        if request.backend_url is not None:
-            config["backend_url"] = request.backend_url
-        if request.quick_model is not None:
-            config["quick_think_llm"] = request.quick_model
-        if request.deep_model is not None:
-            config["deep_think_llm"] = request.deep_model
-
-        # Initialize graph with selected analysts (if provided)
-        graph = TradingAgentsGraph(
-            request.analysts or ["market", "social", "news", "fundamentals"],
-            debug=True,
-            config=config,
-            openai_api_key=current_user.openai_api_key,
-            finnhub_api_key=current_user.finnhub_api_key,
+        # Stored on the record, not in the report
+        run_metrics = final_state.pop("run_metrics", None)
+        metrics = compute_metrics(final_state, run_metrics)
+
+        # Encode the state once for the stored results and the response
+        report, sections = encode_state(final_state)
+        persist_analysis(
+            db,
+            current_user.id,
+            request,
+            report,
+            decision,
+            metrics,
+            sections=sections,
+            run_metrics=run_metrics,
         )
 
-        final_state, decision = graph.propagate(request.ticker, request.date)
-
-        metrics = compute_metrics(final_state)
-
-        # Persist detailed and summarized results
-        record = AnalysisRecord(
-            user_id=current_user.id,
-            ticker=request.ticker,
-            date=request.date,
-            decision=decision,
-            full_report=json.dumps(final_state, default=_serialize_obj),
-            tool_calls=metrics["tool_calls"],
-            llm_calls=metrics["llm_calls"],
-            reports_generated=metrics["reports"],
+        return json_bytes_response(
+            complete_body(
+                request, final_state, report, decision, metrics, run_metrics=run_metrics
+            ),
+            status_code=status.HTTP_201_CREATED,
+        )
+    except RunInProgressError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This analysis is already running",
         )
-        db.add(record)
-        db.commit()
-        db.refresh(record)
-
-        new_analysis_data = {
-            "query_text": request.ticker,
-            "result_summary": decision,
-            "full_report_json": json.dumps(final_state, default=_serialize_obj),
-            "user_id": str(current_user.id),
-            "status": "completed",
-        }
-        stored_summary = store_analysis_in_db(db=db, analysis_data=new_analysis_data)
-        if stored_summary is None:
-            raise RuntimeError("Failed to store summary")
-
-        serialized_report = json.loads(json.dumps(final_state, default=_serialize_obj))
-        return {
-            "ticker": request.ticker,
-            "date": request.date,
-            "decision": decision,
-            "report": serialized_report,
-            "availability": compute_data_availability(serialized_report),
-            "metrics": metrics,
-        }
     except Exception as exc:
         if POSTHOG_ENABLED:
             capture_error(str(current_user.id), http_request.url.path, exc)
@@ -368,7 +424,7 @@ def analyze(
 @app.post("/analyze/stream")
 def analyze_stream(
     request: AnalyzeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Stream progress of TradingAgents analysis via SSE."""
@@ -378,230 +434,32 @@ def analyze_stream(
 
     def event_generator():
         try:
-
-            config = DEFAULT_CONFIG.copy()
-            config["max_debate_rounds"] = request.research_depth
-            config["max_risk_discuss_rounds"] = request.research_depth
-            if request.llm_provider is not None:
-                config["llm_provider"] = request.llm_provider
-            if request.backend_url is not None:
-                config["backend_url"] = request.backend_url
-            if request.quick_model is not None:
-                config["quick_think_llm"] = request.quick_model
-            if request.deep_model is not None:
-                config["deep_think_llm"] = request.deep_model
-
-            graph = TradingAgentsGraph(
-                request.analysts or ["market", "social", "news", "fundamentals"],
-                debug=True,
-                config=config,
-                openai_api_key=current_user.openai_api_key,
-                finnhub_api_key=current_user.finnhub_api_key,
-            )
-
-            init_state = graph.propagator.create_initial_state(
-                request.ticker, request.date
+            run = AnalysisStream(request, current_user)
+            for event, data in run:
+                yield ServerSentEvent(event=event, data=json.dumps(data))
+
+            report, sections = encode_state(run.final_state)
+            persist_analysis(
+                db,
+                current_user.id,
+                request,
+                report,
+                run.decision,
+                run.metrics,
+                store_summary=False,
+                sections=sections,
+                run_metrics=run.run_metrics,
             )
-            args = graph.propagator.get_graph_args()
-            last_state = None
-            tool_calls = 0
-            llm_calls = 0
-            reports_generated = 0
-            agent_status = {
-                # Analyst Team
-                "Market Analyst": "pending",
-                "Social Analyst": "pending",
-                "News Analyst": "pending",
-                "Fundamentals Analyst": "pending",
-                # Research Team
-                "Bull Researcher": "pending",
-                "Bear Researcher": "pending",
-                "Research Manager": "pending",
-                "Trader": "pending",
-                # Risk Management Team
-                "Risky Analyst": "pending",
-                "Neutral Analyst": "pending",
-                "Safe Analyst": "pending",
-                # Portfolio Management Team
-                "Portfolio Manager": "pending",
-            }
-
-            def update_status(agent: str, status: str):
-                if agent_status.get(agent) != status:
-                    agent_status[agent] = status
-                    return ServerSentEvent(
-                        event="status",
-                        data=json.dumps({"agent": agent, "status": status}),
-                    )
-                return None
-
-            def update_research_team(status: str):
-                events = []
-                for a in ["Bull Researcher", "Bear Researcher", "Research Manager", "Trader"]:
-                    ev = update_status(a, status)
-                    if ev:
-                        events.append(ev)
-                return events
-
-            selected_analysts = request.analysts or ["market", "social", "news", "fundamentals"]
-            seen_messages = 0
-            seen_reports = set()
-            report_keys = [
-                "market_report",
-                "fundamentals_report",
-                "sentiment_report",
-                "news_report",
-                "investment_plan",
-                "trader_investment_plan",
-                "final_trade_decision",
-            ]
-
-            for chunk in graph.graph.stream(init_state, **args):
-                last_state = chunk
-                if chunk.get("messages"):
-                    new_messages = chunk["messages"][seen_messages:]
-                    seen_messages = len(chunk["messages"])
-                    for msg_obj in new_messages:
-                        if hasattr(msg_obj, "content"):
-                            message = msg_obj.content
-                        elif isinstance(msg_obj, dict):
-                            message = json.dumps(msg_obj)
-                        else:
-                            message = str(msg_obj)
-                        if hasattr(msg_obj, "tool_calls"):
-                            tool_calls += len(msg_obj.tool_calls)
-                        elif isinstance(msg_obj, dict) and msg_obj.get("tool_calls"):
-                            tool_calls += len(msg_obj["tool_calls"])
-                        llm_calls += 1
-                        yield ServerSentEvent(
-                            event="update",
-                            data=json.dumps(
-                                {
-                                    "message": message,
-                                    "tool_calls": tool_calls,
-                                    "llm_calls": llm_calls,
-                                    "reports": reports_generated,
-                                }
-                            ),
-                        )
-                # Agent status updates
-                events_to_send = []
-                if chunk.get("market_report"):
-                    ev = update_status("Market Analyst", "completed")
-                    if ev:
-                        events_to_send.append(ev)
-                    if "social" in selected_analysts:
-                        ev = update_status("Social Analyst", "in_progress")
-                        if ev:
-                            events_to_send.append(ev)
-
-                if chunk.get("sentiment_report"):
-                    ev = update_status("Social Analyst", "completed")
-                    if ev:
-                        events_to_send.append(ev)
-                    if "news" in selected_analysts:
-                        ev = update_status("News Analyst", "in_progress")
-                        if ev:
-                            events_to_send.append(ev)
-
-                if chunk.get("news_report"):
-                    ev = update_status("News Analyst", "completed")
-                    if ev:
-                        events_to_send.append(ev)
-                    if "fundamentals" in selected_analysts:
-                        ev = update_status("Fundamentals Analyst", "in_progress")
-                        if ev:
-                            events_to_send.append(ev)
-
-                if chunk.get("fundamentals_report"):
-                    ev = update_status("Fundamentals Analyst", "completed")
-                    if ev:
-                        events_to_send.append(ev)
-                    events_to_send.extend(update_research_team("in_progress"))
-
-                if chunk.get("investment_debate_state") and chunk["investment_debate_state"].get("judge_decision"):
-                    events_to_send.extend(update_research_team("completed"))
-                    ev = update_status("Risky Analyst", "in_progress")
-                    if ev:
-                        events_to_send.append(ev)
-
-                if chunk.get("trader_investment_plan"):
-                    ev = update_status("Trader", "completed")
-                    if ev:
-                        events_to_send.append(ev)
-
-                if chunk.get("risk_debate_state"):
-                    risk_state = chunk["risk_debate_state"]
-                    if risk_state.get("current_risky_response"):
-                        ev = update_status("Risky Analyst", "in_progress")
-                        if ev:
-                            events_to_send.append(ev)
-                    if risk_state.get("current_safe_response"):
-                        ev = update_status("Safe Analyst", "in_progress")
-                        if ev:
-                            events_to_send.append(ev)
-                    if risk_state.get("current_neutral_response"):
-                        ev = update_status("Neutral Analyst", "in_progress")
-                        if ev:
-                            events_to_send.append(ev)
-                    if risk_state.get("judge_decision"):
-                        for a in ["Risky Analyst", "Safe Analyst", "Neutral Analyst", "Portfolio Manager"]:
-                            ev = update_status(a, "completed")
-                            if ev:
-                                events_to_send.append(ev)
-
-                for ev in events_to_send:
-                    yield ev
-
-                for key in report_keys:
-                    if chunk.get(key) and key not in seen_reports:
-                        reports_generated += 1
-                        seen_reports.add(key)
-
-            if last_state is None:
-                raise RuntimeError("Analysis produced no output")
-
-            final_state = last_state
-            decision = graph.process_signal(final_state["final_trade_decision"])
-
-            record = AnalysisRecord(
-                user_id=current_user.id,
-                ticker=request.ticker,
-                date=request.date,
-                decision=decision,
-                full_report=json.dumps(final_state, default=_serialize_obj),
-                tool_calls=tool_calls,
-                llm_calls=llm_calls,
-                reports_generated=reports_generated,
-            )
-            db.add(record)
-            db.commit()
-            db.refresh(record)
-
-            serialized_report = json.loads(
-                json.dumps(final_state, default=_serialize_obj)
-            )
-            # Mark remaining agents completed
-            for agent in list(agent_status.keys()):
-                ev = update_status(agent, "completed")
-                if ev:
-                    yield ev
             yield ServerSentEvent(
                 event="complete",
-                data=json.dumps(
-                    {
-                        "ticker": request.ticker,
-                        "date": request.date,
-                        "decision": decision,
-                        "report": serialized_report,
-                        "availability": compute_data_availability(serialized_report),
-                        "metrics": {
-                            "tool_calls": tool_calls,
-                            "llm_calls": llm_calls,
-                            "reports": reports_generated,
-                        },
-                    }
-                ),
+                data=complete_body(
+                    request,
+                    run.final_state,
+                    report,
+                    run.decision,
+                    run.metrics,
+                    run_metrics=run.run_metrics,
+                ).decode("utf-8"),
             )
         except Exception as exc:
             yield ServerSentEvent(
@@ -612,17 +470,113 @@ def analyze_stream(
     return EventSourceResponse(event_generator())
 
 
+def _get_user_job(db: Session, job_id: int, user: AuthUser) -> AnalysisJob:
+    job = db.get(AnalysisJob, job_id)
+    if not job or job.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return job
+
+
+@app.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+def create_job(
+    request: AnalyzeRequest,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Queue an analysis for the background workers."""
+
+    if not current_user.openai_api_key or not current_user.finnhub_api_key:
+        raise HTTPException(status_code=400, detail="API keys not configured")
+
+    job = enqueue_job(db, current_user.id, request)
+    return {"id": job.id, "status": job.status}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(
+    job_id: int,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Return the status of a queued analysis."""
+    job = _get_user_job(db, job_id, current_user)
+    request = json.loads(job.request_json)
+    return {
+        "id": job.id,
+        "status": job.status,
+        "ticker": request["ticker"],
+        "date": request["date"],
+        "decision": job.decision,
+        "record_id": job.record_id,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+@app.get("/jobs/{job_id}/events")
+def job_events(
+    job_id: int,
+    http_request: Request,
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Stream the progress events of a job via SSE.
+
+    Events already emitted are replayed first, so clients can connect at any
+    time and reconnect with ``Last-Event-ID``.
+    """
+    _get_user_job(db, job_id, current_user)
+    try:
+        last_id = int(http_request.headers.get("last-event-id") or 0)
+    except ValueError:
+        last_id = 0
+
+    async def event_generator():
+        after_id = last_id
+        while True:
+            job_status, events = await run_in_threadpool(poll_job, job_id, after_id)
+            for event_id, event, data in events:
+                after_id = event_id
+                yield ServerSentEvent(event=event, data=data, id=str(event_id))
+                if event in TERMINAL_EVENTS:
+                    return
+            if not events and job_status in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+
+    return EventSourceResponse(event_generator())
+
+
 @app.get("/history")
-def history(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+async def history(
+    before_id: Optional[int] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Return a list of previous analyses for the authenticated user."""
+    """Return a page of previous analyses for the authenticated user.
+
+    Results are ordered newest first. Pass the id of the last entry as
+    ``before_id`` to get the next page.
+    """
+    query = select(
+        AnalysisRecord.id,
+        AnalysisRecord.ticker,
+        AnalysisRecord.date,
+        AnalysisRecord.decision,
+        AnalysisRecord.tool_calls,
+        AnalysisRecord.llm_calls,
+        AnalysisRecord.reports_generated,
+    ).where(AnalysisRecord.user_id == current_user.id)
+    if before_id is not None:
+        query = query.where(AnalysisRecord.id < before_id)
     records = (
-        db.query(AnalysisRecord)
-        .filter(AnalysisRecord.user_id == current_user.id)
-        .order_by(AnalysisRecord.id.desc())
-        .all()
-    )
+        await db.execute(query.order_by(AnalysisRecord.id.desc()).limit(limit))
+    ).all()
     return [
         {
             "id": r.id,
@@ -639,43 +593,173 @@ def history(
     ]
 
 
+async def _get_user_record(
+    db: AsyncSession, record_id: int, user: AuthUser
+) -> AnalysisRecord:
+    record = await db.get(AnalysisRecord, record_id)
+    if not record or record.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Record not found"
+        )
+    return record
+
+
+def _parse_fields(fields: str) -> List[str]:
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in REPORT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown report fields: {', '.join(unknown)}"
+        )
+    return names
+
+
 @app.get("/history/{record_id}")
-def history_detail(
+async def history_detail(
     record_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = None,
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Return full details of a past analysis."""
-    record = db.query(AnalysisRecord).filter(AnalysisRecord.id == record_id).first()
-    if not record or record.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Record not found"
+    """Return full details of a past analysis.
+
+    ``fields`` is a comma separated list of report fields; when given, the
+    report only contains those fields.
+    """
+    record = await _get_user_record(db, record_id, current_user)
+    if fields is not None:
+        names = _parse_fields(fields)
+        report = join_sections(
+            await load_sections_async(
+                db, record.report_digest, record.full_report, names
+            )
         )
-    return {
+    else:
+        report = await record_report_async(
+            db, record.report_digest, record.full_report
+        )
+    payload = {
         "id": record.id,
         "ticker": record.ticker,
         "date": record.date,
         "decision": record.decision,
-        "report": json.loads(record.full_report),
         "metrics": {
             "tool_calls": record.tool_calls,
             "llm_calls": record.llm_calls,
             "reports": record.reports_generated,
         },
+        "run_metrics": json.loads(record.run_metrics) if record.run_metrics else None,
     }
+    # The stored JSON is returned as is, without decoding it
+    return json_bytes_response(splice(payload, "report", report or b"null"))
+
+
+@app.get("/history/{record_id}/sections/{name}")
+async def history_section(
+    record_id: int,
+    name: str,
+    current_user: AuthUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Return a single report field of a past analysis."""
+    record = await _get_user_record(db, record_id, current_user)
+    if name not in REPORT_FIELDS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Section not found"
+        )
+    section = await load_sections_async(
+        db, record.report_digest, record.full_report, [name]
+    )
+    if name not in section:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Section not found"
+        )
+    return json_bytes_response(
+        splice({"id": record.id, "name": name}, "content", section[name])
+    )
 
 
 @app.get("/results/{user_id}", response_model=List[AnalysisResponse])
-def get_user_results(user_id: str, req: Request, db: Session = Depends(get_db)):
-    """Return all analysis results belonging to ``user_id``."""
+async def get_user_results(
+    user_id: str,
+    req: Request,
+    before_id: Optional[int] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    include_report: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Return a page of analysis results belonging to ``user_id``.
+
+    ``full_report_json`` is only loaded with ``include_report=true``.
+    """
 
     try:
-        return get_user_results_from_db(db=db, user_id=user_id)
+        return await get_user_results_from_db_async(
+            db=db,
+            user_id=user_id,
+            before_id=before_id,
+            limit=limit,
+            include_report=include_report,
+        )
     except Exception as exc:  # pragma: no cover - simple passthrough
         if POSTHOG_ENABLED:
             capture_error(str(user_id), req.url.path, exc)
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+def _job_queue_samples():
+    counts = job_counts()
+    depth = [
+        ("tradingagents_job_queue_depth", {"status": status}, counts[status])
+        for status in ("queued", "running")
+    ]
+    yield "tradingagents_job_queue_depth", "gauge", "Analysis jobs waiting or running.", depth
+    finished = [
+        ("tradingagents_jobs_total", {"outcome": status}, counts[status])
+        for status in TERMINAL_STATUSES
+    ]
+    yield (
+        "tradingagents_jobs_total",
+        "counter",
+        "Analysis jobs finished by any worker, by outcome.",
+        finished,
+    )
+
+
+registry.add_collector(_job_queue_samples)
+registry.add_collector(lambda: pool_samples(engines()))
+registry.add_collector(data_cache_samples)
+registry.add_collector(
+    stats_samples(
+        "tradingagents_graph_pool",
+        "Graph pool",
+        graph_pool.stats,
+        counters=("created", "reused"),
+    )
+)
+registry.add_collector(
+    stats_samples(
+        "tradingagents_analytics_events",
+        "Analytics events",
+        analytics_events.stats,
+        counters=("captured", "dropped", "failed"),
+    )
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Export the process metrics in the Prometheus text format.
+
+    Each API process keeps its own values, so scrape every API process.
+    Analyses run by job workers are only counted by the job metrics, which
+    are read from the database. Set ``METRICS_ENABLED=false`` to turn the
+    endpoint off.
+    """
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
 # To run locally:
 # uvicorn backend.main:app --host 0.0.0.0 --port 8000
@@ -0,0 +1,390 @@
+# In-process metrics exported in the Prometheus text format at /metrics.
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# False in job worker processes, which have no /metrics endpoint
+_recording = METRICS_ENABLED
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latencies range from cached reads to full analyses
+REQUEST_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300
+)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        label_text = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+        return f"{name}{{{label_text}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        if not values and not self.labelnames:
+            # Export unlabelled metrics before their first update
+            values = [((), 0)]
+        return [
+            (self.name, dict(zip(self.labelnames, key)), value) for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [count per bucket (the last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            values = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._values.items()
+            ]
+        samples = []
+        for key, counts, total in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = dict(labels, le=_format_value(bound))
+                samples.append((f"{self.name}_bucket", bucket_labels, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class Registry:
+    """Metrics updated as events happen plus collectors read at scrape time.
+
+    A collector returns ``(name, type, help, samples)`` tuples for values
+    that are cheaper to read when scraped, such as pool sizes.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[tuple]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        families = [(m.name, m.type, m.help, m.samples()) for m in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        lines = []
+        for name, type_, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type_}")
+            lines.extend(_format_sample(*sample) for sample in samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(
+    Counter(
+        "tradingagents_http_requests_total",
+        "HTTP requests by route, method and status code.",
+        ("route", "method", "status"),
+    )
+)
+http_request_duration = registry.register(
+    Histogram(
+        "tradingagents_http_request_duration_seconds",
+        "HTTP request latency by route, until the response body is sent.",
+        ("route", "method"),
+    )
+)
+analyses_in_flight = registry.register(
+    Gauge("tradingagents_analyses_in_flight", "Analyses currently running.")
+)
+analyses = registry.register(
+    Counter(
+        "tradingagents_analyses_total", "Finished analyses by outcome.", ("outcome",)
+    )
+)
+node_duration = registry.register(
+    Histogram(
+        "tradingagents_node_duration_seconds",
+        "Wall time of graph node runs.",
+        ("node",),
+        LLM_BUCKETS,
+    )
+)
+llm_duration = registry.register(
+    Histogram(
+        "tradingagents_llm_call_duration_seconds",
+        "LLM call latency by graph node.",
+        ("node",),
+        LLM_BUCKETS,
+    )
+)
+tool_duration = registry.register(
+    Histogram(
+        "tradingagents_tool_call_duration_seconds",
+        "Tool call latency.",
+        ("tool",),
+        LLM_BUCKETS,
+    )
+)
+llm_calls = registry.register(
+    Counter(
+        "tradingagents_llm_calls_total",
+        "LLM calls, including those answered by the LLM cache.",
+    )
+)
+llm_cache_hits = registry.register(
+    Counter(
+        "tradingagents_llm_cache_hits_total",
+        "LLM calls answered by the LLM response cache.",
+    )
+)
+node_cache_hits = registry.register(
+    Counter(
+        "tradingagents_node_cache_hits_total",
+        "Node runs replayed from the node cache.",
+    )
+)
+llm_tokens = registry.register(
+    Counter(
+        "tradingagents_llm_tokens_total",
+        "Tokens sent to and generated by LLMs, excluding cache hits.",
+        ("kind",),
+    )
+)
+
+_OBSERVED = {"node": node_duration, "llm": llm_duration}
+
+
+def disable_recording() -> None:
+    """Stop recording analysis metrics in this process.
+
+    Called by job worker processes: nothing scrapes them, so their analyses
+    are only counted through the job table (``tradingagents_jobs_total``).
+    """
+    global _recording
+    _recording = False
+
+
+def observe_run(kind: str, name: str, seconds: float) -> None:
+    """``run_observer`` of the API's graphs, see ``RunMetrics``."""
+    if not _recording:
+        return
+    if kind == "tool":
+        tool_duration.observe(seconds, tool=name)
+    else:
+        _OBSERVED[kind].observe(seconds, node=name)
+
+
+@contextmanager
+def track_analysis(graph):
+    """Count ``graph``'s run as in flight and record its totals when done."""
+    if not _recording:
+        yield graph
+        return
+    analyses_in_flight.inc()
+    outcome = "failed"
+    try:
+        yield graph
+        outcome = "completed"
+    finally:
+        analyses_in_flight.dec()
+        analyses.inc(outcome=outcome)
+        run_metrics = getattr(graph, "run_metrics", None)
+        if run_metrics is not None:
+            totals = run_metrics.totals()
+            llm_calls.inc(totals["llm_calls"])
+            llm_cache_hits.inc(totals["cache_hits"])
+            node_cache_hits.inc(totals["node_cache_hits"])
+            llm_tokens.inc(totals["prompt_tokens"], kind="prompt")
+            llm_tokens.inc(totals["completion_tokens"], kind="completion")
+
+
+def pool_samples(engines: Dict[str, object]) -> Iterable[tuple]:
+    """Collector of the connection pool state of SQLAlchemy engines."""
+    gauges = {
+        "size": "Configured size of the database connection pool.",
+        "checked_out": "Database connections currently in use.",
+        "checked_in": "Idle database connections in the pool.",
+        "overflow": "Database connections open beyond the pool size.",
+    }
+    for name, help in gauges.items():
+        metric = f"tradingagents_db_pool_{name}"
+        samples = []
+        for label, engine in engines.items():
+            # Single-connection pools (in-memory SQLite) have no sizing
+            method = getattr(engine.pool, name.replace("_", ""), None)
+            if method is not None:
+                # QueuePool counts overflow from -size until the pool is full
+                value = max(method(), 0) if name == "overflow" else method()
+                samples.append((metric, {"engine": label}, value))
+        yield metric, "gauge", help, samples
+
+
+def data_cache_samples() -> Iterable[tuple]:
+    """Collector of the lookups and hit ratio of the data caches."""
+    from tradingagents.dataflows.cache_stats import data_cache_stats
+
+    requests_metric = "tradingagents_data_cache_requests_total"
+    ratio_metric = "tradingagents_data_cache_hit_ratio"
+    requests = []
+    ratios = []
+    for cache, counts in data_cache_stats.snapshot().items():
+        lookups = counts["hits"] + counts["misses"]
+        requests.append(
+            (requests_metric, {"cache": cache, "result": "hit"}, counts["hits"])
+        )
+        requests.append(
+            (requests_metric, {"cache": cache, "result": "miss"}, counts["misses"])
+        )
+        ratios.append(
+            (ratio_metric, {"cache": cache}, counts["hits"] / lookups if lookups else 0.0)
+        )
+    yield requests_metric, "counter", "Data cache lookups by result.", requests
+    yield ratio_metric, "gauge", "Share of data cache lookups that hit.", ratios
+
+
+def stats_samples(
+    prefix: str, help: str, stats: Callable[[], dict], counters: Sequence[str] = ()
+) -> Callable[[], Iterable[tuple]]:
+    """Collector exporting each numeric value of ``stats()``.
+
+    The keys in ``counters`` only ever grow and are exported as counters
+    (``<prefix>_<key>_total``), the others as gauges.
+    """
+
+    def collect():
+        for key, value in stats().items():
+            if key in counters:
+                name = f"{prefix}_{key}_total"
+                yield (name, "counter", f"{help} ({key}).", [(name, {}, value)])
+            else:
+                name = f"{prefix}_{key}"
+                yield (name, "gauge", f"{help} ({key}).", [(name, {}, value)])
+
+    return collect
+
+
+class MetricsMiddleware:
+    """Record the latency and status of every HTTP request.
+
+    Requests are labelled with the route template (``/history/{record_id}``)
+    rather than the path, so the number of series stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe(
+                time.perf_counter() - start, route=path, method=scope["method"]
+            )
+            http_requests.inc(route=path, method=scope["method"], status=status_code)
@@ -0,0 +1,130 @@
+"""Move stored report JSON into compressed, deduplicated report sections."""
+
+import json
+import logging
+
+from .database import SessionLocal
+from .models import AnalysisRecord, AnalysisResult, ReportBlob, ReportSection
+from .report_store import (
+    SECTIONS_CODEC,
+    decompress_report,
+    store_report,
+    store_sections,
+)
+from .serialization import dumps
+
+
+BATCH_SIZE = 100
+
+
+def _sections(report: bytes) -> dict:
+    """Encode the top-level fields of a report."""
+    try:
+        state = json.loads(report)
+    except ValueError:
+        return {}
+    if not isinstance(state, dict):
+        return {}
+    return {str(key): dumps(value) for key, value in state.items()}
+
+
+def _split_blobs(session) -> int:
+    """Store full report blobs as sections only, like new reports."""
+    split = 0
+    last_digest = ""
+    while True:
+        blobs = (
+            session.query(ReportBlob)
+            .filter(ReportBlob.codec != SECTIONS_CODEC, ReportBlob.digest > last_digest)
+            .order_by(ReportBlob.digest)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not blobs:
+            break
+        for blob in blobs:
+            last_digest = blob.digest
+            sections = _sections(decompress_report(blob.codec, blob.data))
+            if not sections:
+                continue
+            # Blobs written before every field was a section have some already
+            stored = {
+                name
+                for (name,) in session.query(ReportSection.name).filter(
+                    ReportSection.digest == blob.digest
+                )
+            }
+            store_sections(
+                session,
+                blob.digest,
+                {name: value for name, value in sections.items() if name not in stored},
+            )
+            blob.codec = SECTIONS_CODEC
+            blob.data = dumps(list(sections))
+            split += 1
+        session.commit()
+        session.expunge_all()
+    return split
+
+
+def _migrate_table(session, model, text_column: str) -> tuple[int, int]:
+    """Move the report text of ``model`` rows into blobs.
+
+    Returns the number of migrated rows and the bytes of JSON they held.
+    """
+    column = getattr(model, text_column)
+    migrated = 0
+    text_bytes = 0
+    last_id = 0
+    while True:
+        rows = (
+            session.query(model)
+            .filter(
+                model.id > last_id,
+                model.report_digest.is_(None),
+                column.isnot(None),
+            )
+            .order_by(model.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not rows:
+            break
+        for row in rows:
+            last_id = row.id
+            if not getattr(row, text_column):
+                continue
+            report = getattr(row, text_column).encode("utf-8")
+            row.report_digest = store_report(session, report, _sections(report))
+            setattr(row, text_column, "" if model is AnalysisRecord else None)
+            migrated += 1
+            text_bytes += len(report)
+        try:
+            session.commit()
+        except Exception as exc:  # pragma: no cover - simple script
+            session.rollback()
+            logging.error("Failed to migrate %s rows: %s", model.__tablename__, exc)
+            raise
+        session.expunge_all()
+    return migrated, text_bytes
+
+
+def migrate_report_blobs() -> None:
+    """Migrate ``analysis_records`` and ``analysis_results`` to report sections."""
+    session = SessionLocal()
+    try:
+        for model, text_column in (
+            (AnalysisRecord, "full_report"),
+            (AnalysisResult, "full_report_json"),
+        ):
+            print(f"Processing {model.__tablename__}...")
+            migrated, text_bytes = _migrate_table(session, model, text_column)
+            print(f"Migrated {migrated} rows ({text_bytes / 1e6:.1f} MB of JSON).")
+        print(f"Split {_split_blobs(session)} older reports into sections.")
+    finally:
+        session.close()
+    print("Run VACUUM (SQLite) or shrink the tablespace to reclaim the space.")
+
+
+if __name__ == "__main__":  # pragma: no cover - script
+    migrate_report_blobs()
@@ -1,4 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Sequence
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    ForeignKey,
+    DateTime,
+    Sequence,
+    LargeBinary,
+    Index,
+)
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -7,16 +17,47 @@ class AnalysisRecord(Base):
     """Persist results of each analysis run."""
 
     __tablename__ = "analysis_records"
+    __table_args__ = (
+        # Keyset pagination of a user's history
+        Index("ix_analysis_records_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
     ticker = Column(String, nullable=False)
     date = Column(String, nullable=False)
     decision = Column(Text, nullable=False)
-    full_report = Column(Text, nullable=False)
+    # Empty for rows whose report lives in ``report_blobs``
+    full_report = Column(Text, nullable=True)
+    report_digest = Column(String(64), ForeignKey("report_blobs.digest"), nullable=True)
     tool_calls = Column(Integer, default=0)
     llm_calls = Column(Integer, default=0)
     reports_generated = Column(Integer, default=0)
+    # JSON of the run's per-node/per-tool timings and token counts
+    run_metrics = Column(Text, nullable=True)
+
+
+class ReportBlob(Base):
+    """Compressed report shared by every row with the same content."""
+
+    __tablename__ = "report_blobs"
+
+    # SHA-256 of the uncompressed JSON
+    digest = Column(String(64), primary_key=True)
+    codec = Column(String(10), nullable=False)
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+
+class ReportSection(Base):
+    """One top-level field of a report, stored for partial retrieval."""
+
+    __tablename__ = "report_sections"
+
+    digest = Column(String(64), ForeignKey("report_blobs.digest"), primary_key=True)
+    name = Column(String(64), primary_key=True)
+    codec = Column(String(10), nullable=False)
+    data = Column(LargeBinary, nullable=False)
 
 
 class User(Base):
@@ -33,11 +74,46 @@ class AnalysisResult(Base):
     """Store summarized analysis results."""
 
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        Index("ix_analysis_results_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, Sequence("analysis_results_id_seq"), primary_key=True)
     query_text = Column(String(500), nullable=False)
     result_summary = Column(Text, nullable=False)
     full_report_json = Column(Text, nullable=True)
+    report_digest = Column(String(64), ForeignKey("report_blobs.digest"), nullable=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     user_id = Column(String(100), nullable=True)
     status = Column(String(50), nullable=True)
+
+
+class AnalysisJob(Base):
+    """Queued analysis executed by a background worker."""
+
+    __tablename__ = "analysis_jobs"
+
+    id = Column(Integer, Sequence("analysis_jobs_id_seq"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    # queued -> running -> completed | failed
+    status = Column(String(20), index=True, nullable=False, default="queued")
+    request_json = Column(Text, nullable=False)
+    record_id = Column(Integer, ForeignKey("analysis_records.id"), nullable=True)
+    decision = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    # Renewed by the worker while the job runs, see backend/jobs.py
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class AnalysisJobEvent(Base):
+    """Progress event emitted while a job runs, replayed to SSE clients."""
+
+    __tablename__ = "analysis_job_events"
+
+    id = Column(Integer, Sequence("analysis_job_events_id_seq"), primary_key=True)
+    job_id = Column(Integer, ForeignKey("analysis_jobs.id"), index=True, nullable=False)
+    event = Column(String(20), nullable=False)
+    data = Column(Text, nullable=False)
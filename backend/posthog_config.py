@@ -9,6 +9,25 @@ if POSTHOG_ENABLED:
     posthog.project_api_key = POSTHOG_API_KEY
     posthog.host = POSTHOG_HOST
 
+# The PostHog client queues events and uploads them in batches from its own
+# thread; these tune that queue
+ANALYTICS_QUEUE_SIZE = int(os.getenv("ANALYTICS_QUEUE_SIZE", "1000"))
+ANALYTICS_BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "100"))
+ANALYTICS_FLUSH_INTERVAL = float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "2.0"))
+
+
+def configure_client(on_error=None) -> None:
+    """Set up the client behind the ``posthog`` module functions."""
+    posthog.default_client = posthog.Client(
+        POSTHOG_API_KEY,
+        host=POSTHOG_HOST,
+        max_queue_size=ANALYTICS_QUEUE_SIZE,
+        flush_at=ANALYTICS_BATCH_SIZE,
+        flush_interval=ANALYTICS_FLUSH_INTERVAL,
+        on_error=on_error,
+    )
+
+
 def capture_error(distinct_id: str, path: str, exc: Exception) -> None:
     """Send error details to PostHog if analytics are enabled."""
     if not POSTHOG_ENABLED:
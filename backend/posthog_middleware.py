@@ -1,31 +1,100 @@
+import logging
+import threading
 import uuid
 from typing import Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 import posthog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from .posthog_config import POSTHOG_ENABLED
+from .posthog_config import POSTHOG_ENABLED, configure_client
 
+logger = logging.getLogger(__name__)
 
-class PostHogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint):
-        user_id: Optional[str] = None
-        if hasattr(request.state, "user") and getattr(request.state.user, "id", None):
-            user_id = request.state.user.id
-        else:
-            user_id = str(uuid.uuid4())
 
-        response = await call_next(request)
+class AnalyticsEvents:
+    """Hand analytics events to the PostHog client and count them.
 
-        if POSTHOG_ENABLED:
-            posthog.capture(
+    ``posthog.capture`` only puts the event on the client's bounded queue,
+    which a background thread of the client uploads in batches, so recording
+    never blocks. Events the full queue refuses are counted in ``dropped``
+    and those in uploads that failed in ``failed``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.captured = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(self, **event) -> bool:
+        """Queue an event; return False if it was dropped."""
+        try:
+            queued = posthog.capture(**event) is not None
+        except Exception:
+            logger.exception("Failed to queue analytics event")
+            queued = False
+        with self._lock:
+            if queued:
+                self.captured += 1
+            else:
+                self.dropped += 1
+        return queued
+
+    def upload_failed(self, error: Exception, batch: list) -> None:
+        """``on_error`` callback of the PostHog client."""
+        logger.warning("Failed to upload %d analytics events: %s", len(batch), error)
+        with self._lock:
+            self.failed += len(batch)
+
+    def close(self) -> None:
+        """Upload the queued events and stop the client's thread."""
+        posthog.shutdown()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "captured": self.captured,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+
+analytics_events = AnalyticsEvents()
+if POSTHOG_ENABLED:
+    configure_client(on_error=analytics_events.upload_failed)
+
+
+class PostHogMiddleware:
+    """Record one ``http_request`` event per request without blocking it."""
+
+    def __init__(self, app: ASGIApp, events: Optional[AnalyticsEvents] = None):
+        self.app = app
+        self.events = events or analytics_events
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not POSTHOG_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            user = scope.get("state", {}).get("user")
+            user_id = getattr(user, "id", None) or str(uuid.uuid4())
+            self.events.record(
                 distinct_id=str(user_id),
                 event="http_request",
                 properties={
-                    "path": request.url.path,
-                    "method": request.method,
-                    "status_code": response.status_code,
+                    "path": scope["path"],
+                    "method": scope["method"],
+                    "status_code": status_code,
                 },
             )
-        return response
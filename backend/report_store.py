@@ -0,0 +1,345 @@
+# Content-addressed, compressed storage for analysis reports.
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import ReportBlob, ReportSection
+from .serialization import dumps, join_sections
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+REPORT_CODEC = os.getenv("REPORT_CODEC", "zstd" if zstandard else "gzip")
+ZSTD_LEVEL = int(os.getenv("REPORT_ZSTD_LEVEL", "10"))
+# Smaller data is stored uncompressed
+MIN_COMPRESS_SIZE = 512
+# Codec of blobs whose report is stored only as sections; their data is the
+# JSON list of the field names in report order
+SECTIONS_CODEC = "sections"
+
+# Report fields served on their own, besides the message history
+SECTION_FIELDS = (
+    "company_of_interest",
+    "trade_date",
+    "sender",
+    "market_report",
+    "sentiment_report",
+    "news_report",
+    "fundamentals_report",
+    "investment_debate_state",
+    "investment_plan",
+    "trader_investment_plan",
+    "risk_debate_state",
+    "final_trade_decision",
+)
+# Every top-level field of a final state
+REPORT_FIELDS = ("messages",) + SECTION_FIELDS
+
+
+def compress_report(data: bytes, codec: str = REPORT_CODEC) -> Tuple[str, bytes]:
+    """Compress an encoded report.
+
+    Parameters
+    ----------
+    data : bytes
+        JSON encoded report.
+    codec : str
+        ``"zstd"`` or ``"gzip"``. Falls back to gzip when zstandard is not
+        installed.
+
+    Returns
+    -------
+    Tuple[str, bytes]
+        The codec actually used and the compressed data.
+    """
+    if len(data) < MIN_COMPRESS_SIZE:
+        return "none", data
+    if codec == "zstd" and zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return "gzip", gzip.compress(data, compresslevel=6)
+
+
+def decompress_report(codec: str, data: bytes) -> bytes:
+    """Reverse ``compress_report``."""
+    if codec == "none":
+        return data
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd reports")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    raise ValueError(f"Unknown report codec: {codec}")
+
+
+def store_report(
+    db: Session, report: bytes, sections: Optional[Dict[str, bytes]] = None
+) -> str:
+    """Store a report once and return its digest.
+
+    With ``sections``, every top-level field is stored as its own compressed
+    section and the blob only keeps the field order; the full report is
+    rebuilt from the sections when read. Without, the report is stored as a
+    single compressed blob. The rows are added to the session's transaction;
+    the caller commits them together with the rows referencing the digest.
+
+    Parameters
+    ----------
+    db : Session
+        Active SQLAlchemy session.
+    report : bytes
+        JSON encoded report.
+    sections : Optional[Dict[str, bytes]]
+        Encoded top-level fields of the report, in report order, such that
+        ``join_sections(sections)`` is the report.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest of ``report``.
+    """
+    digest = hashlib.sha256(report).hexdigest()
+    if db.get(ReportBlob, digest) is not None:
+        return digest
+
+    if sections:
+        codec, data = SECTIONS_CODEC, dumps(list(sections))
+    else:
+        codec, data = compress_report(report)
+    try:
+        with db.begin_nested():
+            db.add(
+                ReportBlob(digest=digest, codec=codec, size=len(report), data=data)
+            )
+            db.flush()
+            if sections:
+                store_sections(db, digest, sections)
+    except IntegrityError:
+        # Stored concurrently by another request
+        pass
+    return digest
+
+
+def store_sections(db: Session, digest: str, sections: Dict[str, bytes]) -> None:
+    """Add the encoded top-level fields of a report to the session."""
+    for name, value in sections.items():
+        codec, data = compress_report(value)
+        db.add(ReportSection(digest=digest, name=name, codec=codec, data=data))
+
+
+def _rebuild_report(order: bytes, rows) -> bytes:
+    """Join the section ``rows`` of a sections-only blob in report order."""
+    found = {name: decompress_report(codec, data) for name, codec, data in rows}
+    return join_sections({name: found[name] for name in json.loads(order)})
+
+
+def load_sections(
+    db: Session, digest: Optional[str], text: Optional[str], names: Iterable[str]
+) -> Dict[str, bytes]:
+    """Return the encoded report fields ``names`` of a row.
+
+    Fields are read from ``report_sections``; the full report is only decoded
+    for rows saved before every field was stored as a section.
+
+    Parameters
+    ----------
+    db : Session
+        Active SQLAlchemy session.
+    digest : Optional[str]
+        ``report_digest`` of the row.
+    text : Optional[str]
+        Legacy report text column of the row.
+    names : Iterable[str]
+        Requested top-level fields.
+
+    Returns
+    -------
+    Dict[str, bytes]
+        Encoded value of every requested field present in the report.
+    """
+    names = list(dict.fromkeys(names))
+    rows = []
+    if digest:
+        rows = (
+            db.query(ReportSection.name, ReportSection.codec, ReportSection.data)
+            .filter(ReportSection.digest == digest, ReportSection.name.in_(names))
+            .all()
+        )
+
+    def report():
+        if digest:
+            blob = db.get(ReportBlob, digest)
+            if blob is None or blob.codec == SECTIONS_CODEC:
+                # Every field of the report is a section
+                return None
+            return decompress_report(blob.codec, blob.data)
+        return text.encode("utf-8") if text else None
+
+    return _decode_sections(names, rows, report)
+
+
+async def load_sections_async(
+    db: AsyncSession, digest: Optional[str], text: Optional[str], names: Iterable[str]
+) -> Dict[str, bytes]:
+    """Async version of ``load_sections``.
+
+    Only the queries run on the event loop; decompression and JSON parsing
+    of the report, which take long for large reports, run in the threadpool.
+    """
+    names = list(dict.fromkeys(names))
+    rows = []
+    if digest:
+        rows = (
+            await db.execute(
+                select(ReportSection.name, ReportSection.codec, ReportSection.data)
+                .where(ReportSection.digest == digest, ReportSection.name.in_(names))
+            )
+        ).all()
+    blob = None
+    stored = {row[0] for row in rows}
+    if digest and any(name not in stored for name in names):
+        blob = await _fetch_blob(db, digest)
+        if blob is not None and blob[0] == SECTIONS_CODEC:
+            # Every field of the report is a section
+            blob = None
+    return await run_in_threadpool(
+        _decode_sections, names, rows, lambda: _blob_report(blob, digest, text)
+    )
+
+
+def _decode_sections(
+    names: List[str], rows, report: Callable[[], Optional[bytes]]
+) -> Dict[str, bytes]:
+    """Decode section rows, reading fields missing from them from ``report()``."""
+    found = {name: decompress_report(codec, data) for name, codec, data in rows}
+    missing = [name for name in names if name not in found]
+    if missing:
+        encoded = report()
+        if encoded is not None:
+            state = json.loads(encoded)
+            for name in missing:
+                if name in state:
+                    found[name] = dumps(state[name])
+    return {name: found[name] for name in names if name in found}
+
+
+def load_report(db: Session, digest: str) -> Optional[bytes]:
+    """Return the encoded report stored under ``digest``, if any."""
+    blob = db.get(ReportBlob, digest)
+    if blob is None:
+        return None
+    if blob.codec == SECTIONS_CODEC:
+        rows = (
+            db.query(ReportSection.name, ReportSection.codec, ReportSection.data)
+            .filter(ReportSection.digest == digest)
+            .all()
+        )
+        return _rebuild_report(blob.data, rows)
+    return decompress_report(blob.codec, blob.data)
+
+
+def record_report(db: Session, digest: Optional[str], text: Optional[str]) -> Optional[bytes]:
+    """Return the encoded report of a row from its blob or legacy text column."""
+    if digest:
+        return load_report(db, digest)
+    if text:
+        return text.encode("utf-8")
+    return None
+
+
+async def _fetch_blob(db: AsyncSession, digest: str) -> Optional[Tuple[str, bytes]]:
+    row = (
+        await db.execute(
+            select(ReportBlob.codec, ReportBlob.data).where(ReportBlob.digest == digest)
+        )
+    ).first()
+    return tuple(row) if row is not None else None
+
+
+async def _fetch_sections(
+    db: AsyncSession, digests: List[str]
+) -> Dict[str, list]:
+    """Section rows of ``digests``, by digest."""
+    if not digests:
+        return {}
+    rows = (
+        await db.execute(
+            select(
+                ReportSection.digest,
+                ReportSection.name,
+                ReportSection.codec,
+                ReportSection.data,
+            ).where(ReportSection.digest.in_(digests))
+        )
+    ).all()
+    sections = {}
+    for digest, name, codec, data in rows:
+        sections.setdefault(digest, []).append((name, codec, data))
+    return sections
+
+
+def _blob_report(
+    blob: Optional[Tuple[str, bytes]],
+    digest: Optional[str],
+    text: Optional[str],
+    sections: Optional[list] = None,
+) -> Optional[bytes]:
+    if digest:
+        if blob is None:
+            return None
+        if blob[0] == SECTIONS_CODEC:
+            return _rebuild_report(blob[1], sections or [])
+        return decompress_report(*blob)
+    if text:
+        return text.encode("utf-8")
+    return None
+
+
+async def record_report_async(
+    db: AsyncSession, digest: Optional[str], text: Optional[str]
+) -> Optional[bytes]:
+    """Async version of ``record_report``; decompresses in the threadpool."""
+    blob = await _fetch_blob(db, digest) if digest else None
+    sections = None
+    if blob is not None and blob[0] == SECTIONS_CODEC:
+        sections = (await _fetch_sections(db, [digest])).get(digest)
+    return await run_in_threadpool(_blob_report, blob, digest, text, sections)
+
+
+async def load_reports_async(
+    db: AsyncSession, digests: Iterable[str]
+) -> Dict[str, bytes]:
+    """Return the encoded reports stored under ``digests``, decompressed in
+    the threadpool."""
+    digests = list(set(digests))
+    if not digests:
+        return {}
+    rows = (
+        await db.execute(
+            select(ReportBlob.digest, ReportBlob.codec, ReportBlob.data).where(
+                ReportBlob.digest.in_(digests)
+            )
+        )
+    ).all()
+    sections = await _fetch_sections(
+        db, [digest for digest, codec, _ in rows if codec == SECTIONS_CODEC]
+    )
+
+    def decode():
+        return {
+            digest: _blob_report((codec, data), digest, None, sections.get(digest))
+            for digest, codec, data in rows
+        }
+
+    return await run_in_threadpool(decode)
@@ -0,0 +1,64 @@
+# JSON encoding of graph states for storage and responses.
+#
+# A final state with its full message history can be several megabytes, so
+# it is encoded once and the resulting bytes are reused for the database
+# rows and spliced into the response body without a decode/re-encode.
+
+import json
+from typing import Dict, Tuple
+
+from fastapi.responses import Response
+from langchain_core.messages import BaseMessage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(obj):
+    """Make objects the encoder does not know JSON serializable."""
+    if isinstance(obj, BaseMessage):
+        return obj.to_json()
+    return str(obj)
+
+
+def dumps(obj) -> bytes:
+    """Encode ``obj`` to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default).encode("utf-8")
+
+
+def encode_state(state: dict) -> Tuple[bytes, Dict[str, bytes]]:
+    """Encode a state once, returning the full JSON and each top-level value.
+
+    The full JSON is assembled from the encoded values, so the per-section
+    bytes come at no extra encoding cost.
+    """
+    sections = {str(key): dumps(value) for key, value in state.items()}
+    return join_sections(sections), sections
+
+
+def join_sections(sections: Dict[str, bytes]) -> bytes:
+    """Build a JSON object from already encoded values."""
+    return (
+        b"{"
+        + b",".join(dumps(key) + b":" + value for key, value in sections.items())
+        + b"}"
+    )
+
+
+def splice(payload: dict, key: str, encoded: bytes) -> bytes:
+    """Encode ``payload`` with the pre-encoded JSON ``encoded`` added under ``key``."""
+    head = dumps(payload)
+    if head == b"{}":
+        return b'{"' + key.encode("utf-8") + b'":' + encoded + b"}"
+    return head[:-1] + b',"' + key.encode("utf-8") + b'":' + encoded + b"}"
+
+
+def json_bytes_response(content: bytes, status_code: int = 200) -> Response:
+    """Return already encoded JSON as is."""
+    return Response(
+        content=content, status_code=status_code, media_type="application/json"
+    )
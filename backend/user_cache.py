@@ -0,0 +1,72 @@
+# Short-lived cache of authenticated users.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """Read-only snapshot of a ``User`` row handed to endpoints."""
+
+    id: int
+    email: str
+    openai_api_key: Optional[str]
+    finnhub_api_key: Optional[str]
+
+    @classmethod
+    def from_user(cls, user) -> "AuthUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            openai_api_key=user.openai_api_key,
+            finnhub_api_key=user.finnhub_api_key,
+        )
+
+
+class UserCache:
+    """LRU cache of ``AuthUser`` snapshots that expire after ``ttl`` seconds.
+
+    Each process has its own cache, so a change made through another worker
+    process is picked up once the entry expires.
+    """
+
+    def __init__(self, ttl: float = USER_CACHE_TTL, max_size: int = USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[AuthUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user: AuthUser) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+user_cache = UserCache()
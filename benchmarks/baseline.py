@@ -0,0 +1,43 @@
+"""Benchmark baselines, stored per machine.
+
+Times and memory figures only compare on the machine they were recorded on,
+so a baseline file maps a machine id (host name, CPU architecture and Python
+version, or ``BENCHMARK_MACHINE`` when set, e.g. for CI runners whose host
+names change) to that machine's figures. A benchmark only compares with the
+entry of the machine it runs on. The files live in ``benchmarks/baselines/``,
+which is not committed: every developer records their own.
+"""
+
+import json
+import os
+import platform
+from typing import Optional
+
+
+def machine_id() -> str:
+    """Key of this machine in the baseline files."""
+    return os.getenv("BENCHMARK_MACHINE") or (
+        f"{platform.node()} {platform.machine()} Python {platform.python_version()}"
+    )
+
+
+def _read(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_baseline(path: str) -> Optional[dict]:
+    """This machine's entry in the baseline file at ``path``, if any."""
+    return _read(path).get(machine_id())
+
+
+def save_baseline(path: str, entry: dict) -> None:
+    """Store ``entry`` as this machine's baseline, keeping the other machines'."""
+    machines = _read(path)
+    machines[machine_id()] = entry
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(machines, f, indent=2, sort_keys=True)
+        f.write("\n")
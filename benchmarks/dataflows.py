@@ -0,0 +1,207 @@
+"""Micro-benchmarks of the offline readers in ``tradingagents.dataflows.interface``.
+
+Every public function of the interface that reads ``data_dir`` is timed on
+the synthetic datasets of ``benchmarks.fixtures``, once per ``--scales``
+entry (``1`` is about the size of the real datasets, ``10`` ten times that).
+A case is called once and then ``--repeat`` times more. Both the first call,
+which pays for any cache the reader fills, and the median of the others are
+reported, along with how much slower the median gets at the largest scale.
+
+The functions calling online services (Google News, Yahoo Finance, OpenAI)
+are not covered.
+
+Like ``benchmarks.offline_run``, the medians are compared with a baseline
+recorded with ``--save-baseline`` on the same machine (none is committed):
+a case more than ``--tolerance`` slower than its baseline fails the run,
+unless both are below ``--min-seconds``. Without a baseline the timings are
+only reported.
+
+Run from the repository root::
+
+    python -m benchmarks.dataflows --scales 1 10
+    python -m benchmarks.dataflows --only simfin reddit --repeat 10
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.baseline import load_baseline, machine_id, save_baseline
+from benchmarks.fixtures import write_fixtures
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baselines", "dataflows.json"
+)
+TICKER = "NVDA"
+DATE = "2024-05-10"
+
+
+def cases() -> Dict[str, Tuple[Callable, tuple]]:
+    """Function and arguments of each case, as the toolkit calls them."""
+    from tradingagents.dataflows import interface
+
+    return {
+        "get_YFin_data": (interface.get_YFin_data, (TICKER, "2024-04-10", DATE)),
+        "get_YFin_data_window": (interface.get_YFin_data_window, (TICKER, DATE, 30)),
+        "get_stockstats_indicator": (
+            interface.get_stockstats_indicator,
+            (TICKER, "rsi", DATE, False),
+        ),
+        "get_stock_stats_indicators_window": (
+            interface.get_stock_stats_indicators_window,
+            (TICKER, "close_50_sma", DATE, 30, False),
+        ),
+        "get_finnhub_news": (interface.get_finnhub_news, (TICKER, DATE, 7)),
+        "get_finnhub_company_insider_sentiment": (
+            interface.get_finnhub_company_insider_sentiment,
+            (TICKER, DATE, 30),
+        ),
+        "get_finnhub_company_insider_transactions": (
+            interface.get_finnhub_company_insider_transactions,
+            (TICKER, DATE, 30),
+        ),
+        "get_simfin_balance_sheet": (
+            interface.get_simfin_balance_sheet,
+            (TICKER, "quarterly", DATE),
+        ),
+        "get_simfin_cashflow": (
+            interface.get_simfin_cashflow,
+            (TICKER, "quarterly", DATE),
+        ),
+        "get_simfin_income_statements": (
+            interface.get_simfin_income_statements,
+            (TICKER, "annual", DATE),
+        ),
+        "get_reddit_global_news": (interface.get_reddit_global_news, (DATE, 7, 5)),
+        "get_reddit_company_news": (
+            interface.get_reddit_company_news,
+            (TICKER, DATE, 7, 5),
+        ),
+    }
+
+
+def time_case(func: Callable, args: tuple, repeat: int) -> Dict[str, float]:
+    """Seconds of the first call and median seconds of ``repeat`` more."""
+    timings = []
+    # The readers print progress bars and errors; keep the table readable
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        start = time.perf_counter()
+        result = func(*args)
+        first = time.perf_counter() - start
+        if result is None or len(result) == 0:
+            raise RuntimeError(f"{func.__name__} returned no data")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+    return {"first": round(first, 5), "median": round(statistics.median(timings), 5)}
+
+
+def run_scale(scale: int, names: List[str], repeat: int) -> Dict[str, dict]:
+    from tradingagents.dataflows import interface
+
+    # Import the data libraries up front, so the first case doesn't pay for it
+    import pandas  # noqa: F401
+    import stockstats  # noqa: F401
+
+    selected = cases()
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        write_fixtures(workdir, [TICKER], end=DATE, scale=scale)
+        print(f"scale {scale}: fixtures written in {time.perf_counter() - start:.1f} s")
+        # The interface functions read the module's DATA_DIR on every call
+        interface.DATA_DIR = workdir
+        for name in names:
+            func, args = selected[name]
+            results[name] = time_case(func, args, repeat)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--only", nargs="+", default=[], help="run the cases containing any of these"
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-seconds", type=float, default=0.005)
+    args = parser.parse_args()
+
+    names = [
+        name for name in cases() if not args.only or any(part in name for part in args.only)
+    ]
+    results = {str(scale): run_scale(scale, names, args.repeat) for scale in args.scales}
+
+    scales = [str(scale) for scale in args.scales]
+    print()
+    print(
+        f"{'case (ms)':42}"
+        + "".join(f"{'x' + scale + ' first':>12}{'x' + scale:>10}" for scale in scales)
+        + "    growth"
+    )
+    for name in names:
+        row = "".join(
+            f"{results[scale][name]['first'] * 1000:12.1f}"
+            f"{results[scale][name]['median'] * 1000:10.1f}"
+            for scale in scales
+        )
+        first = results[scales[0]][name]["median"]
+        last = results[scales[-1]][name]["median"]
+        growth = f"{last / first:9.1f}x" if len(scales) > 1 and first else ""
+        print(f"{name:42}{row}{growth}")
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline) or {}
+        baseline["repeat"] = args.repeat
+        for scale, timings in results.items():
+            baseline.setdefault("scales", {}).setdefault(scale, {}).update(
+                {name: timing["median"] for name, timing in timings.items()}
+            )
+        save_baseline(args.baseline, baseline)
+        print(f"\nbaseline for {machine_id()} saved to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(
+            f"\nno baseline for {machine_id()} in {args.baseline};"
+            " record one with --save-baseline"
+        )
+        return 0
+    baseline = baseline.get("scales", {})
+
+    regressions = []
+    for scale, timings in results.items():
+        for name, timing in timings.items():
+            now = timing["median"]
+            before = baseline.get(scale, {}).get(name)
+            if before is None or max(now, before) < args.min_seconds:
+                continue
+            if now > before * (1 + args.tolerance):
+                regressions.append(
+                    f"{name} x{scale}: {now * 1000:.1f} ms vs {before * 1000:.1f} ms"
+                    f" baseline (+{(now / before - 1) * 100:.0f}%)"
+                )
+    if regressions:
+        print(f"\nregressions beyond {args.tolerance:.0%} of the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nwithin {args.tolerance:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
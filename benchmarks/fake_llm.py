@@ -0,0 +1,144 @@
+"""Deterministic chat model for running the graph without an LLM provider.
+
+``ScriptedChatModel`` plays every agent of ``TradingAgentsGraph``:
+
+* bound to tools (the analysts), its first answer calls each scripted tool
+  it was given with arguments for the run's ticker and date; once the tool
+  results are in, it writes the report,
+* otherwise it writes a report of ``report_words`` words seeded from a hash
+  of the prompt, so the same prompt always gets the same answer,
+* the signal processor's "extract the investment decision" prompt gets the
+  bare decision.
+
+Responses carry ``usage_metadata`` (about 4 characters per token) and can be
+delayed by ``latency`` seconds to mimic a provider.
+"""
+
+import hashlib
+import random
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchmarks.fixtures import WORDS
+
+INDICATORS = ("close_50_sma", "close_200_sma", "rsi", "macd", "boll", "atr")
+
+
+def _days_before(day: str, days: int) -> str:
+    return (date.fromisoformat(day) - timedelta(days=days)).isoformat()
+
+
+def tool_script(ticker: str, trade_date: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Arguments of the calls made to each offline tool, by tool name."""
+    month_ago = _days_before(trade_date, 30)
+    week_ago = _days_before(trade_date, 7)
+    return {
+        "get_YFin_data": [
+            {"symbol": ticker, "start_date": month_ago, "end_date": trade_date}
+        ],
+        "get_stockstats_indicators_report": [
+            {"symbol": ticker, "indicator": indicator, "curr_date": trade_date}
+            for indicator in INDICATORS
+        ],
+        "get_reddit_stock_info": [{"ticker": ticker, "curr_date": trade_date}],
+        "get_finnhub_news": [
+            {"ticker": ticker, "start_date": week_ago, "end_date": trade_date}
+        ],
+        "get_reddit_news": [{"curr_date": trade_date}],
+        "get_finnhub_company_insider_sentiment": [
+            {"ticker": ticker, "curr_date": trade_date}
+        ],
+        "get_finnhub_company_insider_transactions": [
+            {"ticker": ticker, "curr_date": trade_date}
+        ],
+        "get_simfin_balance_sheet": [
+            {"ticker": ticker, "freq": "quarterly", "curr_date": trade_date}
+        ],
+        "get_simfin_cashflow": [
+            {"ticker": ticker, "freq": "quarterly", "curr_date": trade_date}
+        ],
+        "get_simfin_income_stmt": [
+            {"ticker": ticker, "freq": "quarterly", "curr_date": trade_date}
+        ],
+    }
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model answering from a script instead of a provider."""
+
+    model_name: str = "scripted"
+    ticker: str = "NVDA"
+    trade_date: str = "2024-05-10"
+    decision: str = "BUY"
+    report_words: int = 400
+    latency: float = 0.0
+    tool_names: Tuple[str, ...] = ()
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "tool_names": self.tool_names}
+
+    def bind_tools(self, tools, **kwargs) -> "ScriptedChatModel":
+        return self.model_copy(
+            update={"tool_names": tuple(getattr(t, "name", str(t)) for t in tools)}
+        )
+
+    def _tool_calls(self) -> List[Dict[str, Any]]:
+        script = tool_script(self.ticker, self.trade_date)
+        calls = []
+        for name in self.tool_names:
+            for args in script.get(name, ()):
+                calls.append(
+                    {"name": name, "args": args, "id": f"call_{len(calls)}"}
+                )
+        return calls
+
+    def _report(self, prompt: str) -> str:
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+        rng = random.Random(seed)
+        words = [rng.choice(WORDS) for _ in range(self.report_words)]
+        return (
+            f"{' '.join(words)}\n\n"
+            f"FINAL TRANSACTION PROPOSAL: **{self.decision}**"
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = "\n".join(str(message.content) for message in messages)
+        tool_calls = []
+        if self.tool_names and not isinstance(messages[-1], ToolMessage):
+            tool_calls = self._tool_calls()
+        if "extract the investment decision" in prompt:
+            content = self.decision
+        elif tool_calls:
+            content = ""
+        else:
+            content = self._report(prompt)
+        input_tokens = len(prompt) // 4
+        output_tokens = len(content) // 4 + 10 * len(tool_calls)
+        message = AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
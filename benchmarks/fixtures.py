@@ -0,0 +1,291 @@
+"""Synthetic offline data in the layout the dataflows read from ``data_dir``.
+
+``write_fixtures`` writes, for each ticker:
+
+* ``market_data/price_data/<T>-YFin-data-2015-01-01-2025-03-25.csv``: daily
+  prices for every business day of the range,
+* ``finnhub_data/{news_data,insider_senti,insider_trans}/<T>_data_formatted.json``,
+* ``fundamental_data/simfin_data_all/...`` balance sheet, cash flow and
+  income statement CSVs (``;`` separated, shared by all tickers plus
+  filler companies),
+* ``reddit_data/{global_news,company_news}/*.jsonl`` posts.
+
+``scale=1`` approximates the size of the real datasets; larger scales
+multiply the rows (prices get ``scale`` rows per day, each with a time).
+The data is generated from a fixed seed, so runs are comparable.
+"""
+
+import csv
+import json
+import os
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+PRICE_START = date(2015, 1, 1)
+PRICE_END = date(2025, 3, 25)
+# First day of the finnhub and reddit data
+NEWS_START = date(2024, 1, 1)
+
+# Rows per unit of scale
+SIMFIN_COMPANIES = 200
+SIMFIN_QUARTERS = 40
+NEWS_PER_DAY = 5
+POSTS_PER_DAY = 10
+SUBREDDITS = {
+    "global_news": ("worldnews", "economics", "news"),
+    "company_news": ("stocks", "investing", "wallstreetbets"),
+}
+COMPANY_NAMES = {"NVDA": "Nvidia", "AAPL": "Apple", "MSFT": "Microsoft"}
+
+BALANCE_COLUMNS = (
+    "Cash, Cash Equivalents & Short Term Investments",
+    "Accounts & Notes Receivable",
+    "Inventories",
+    "Total Current Assets",
+    "Property, Plant & Equipment, Net",
+    "Long Term Investments & Receivables",
+    "Other Long Term Assets",
+    "Total Noncurrent Assets",
+    "Total Assets",
+    "Payables & Accruals",
+    "Short Term Debt",
+    "Total Current Liabilities",
+    "Long Term Debt",
+    "Total Noncurrent Liabilities",
+    "Total Liabilities",
+    "Share Capital & Additional Paid-In Capital",
+    "Treasury Stock",
+    "Retained Earnings",
+    "Total Equity",
+    "Total Liabilities & Equity",
+)
+CASHFLOW_COLUMNS = (
+    "Net Income/Starting Line",
+    "Depreciation & Amortization",
+    "Non-Cash Items",
+    "Change in Working Capital",
+    "Net Cash from Operating Activities",
+    "Change in Fixed Assets & Intangibles",
+    "Net Change in Long Term Investment",
+    "Net Cash from Investing Activities",
+    "Dividends Paid",
+    "Cash from (Repayment of) Debt",
+    "Cash from (Repurchase of) Equity",
+    "Net Cash from Financing Activities",
+    "Net Change in Cash",
+)
+INCOME_COLUMNS = (
+    "Revenue",
+    "Cost of Revenue",
+    "Gross Profit",
+    "Operating Expenses",
+    "Selling, General & Administrative",
+    "Research & Development",
+    "Depreciation & Amortization",
+    "Operating Income (Loss)",
+    "Non-Operating Income (Loss)",
+    "Interest Expense, Net",
+    "Pretax Income (Loss)",
+    "Income Tax (Expense) Benefit, Net",
+    "Net Income",
+)
+SIMFIN_FILES = {
+    "balance_sheet": ("balance", BALANCE_COLUMNS),
+    "cash_flow": ("cashflow", CASHFLOW_COLUMNS),
+    "income_statements": ("income", INCOME_COLUMNS),
+}
+
+WORDS = (
+    "market revenue guidance margin demand supply chip datacenter growth "
+    "outlook analyst upgrade downgrade earnings rate inflation fed yield "
+    "export policy competition launch partnership valuation buyback"
+).split()
+
+
+def _days(start: date, end: date) -> Iterator[date]:
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _write_json(path: str, data) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def write_prices(data_dir: str, ticker: str, rng: random.Random, scale: int) -> str:
+    path = os.path.join(
+        data_dir,
+        "market_data",
+        "price_data",
+        f"{ticker}-YFin-data-{PRICE_START}-{PRICE_END}.csv",
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    price = 50.0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Open", "High", "Low", "Close", "Adj Close", "Volume"])
+        for day in _days(PRICE_START, PRICE_END):
+            if day.weekday() >= 5:
+                continue
+            for row in range(scale):
+                stamp = day.isoformat()
+                if scale > 1:
+                    stamp += f" {9 + row * 7 // scale:02d}:{(row * 37) % 60:02d}:00"
+                open_ = price
+                price = max(1.0, price * (1 + rng.gauss(0.0004, 0.02)))
+                high = max(open_, price) * (1 + rng.random() * 0.01)
+                low = min(open_, price) * (1 - rng.random() * 0.01)
+                writer.writerow(
+                    [
+                        stamp,
+                        round(open_, 4),
+                        round(high, 4),
+                        round(low, 4),
+                        round(price, 4),
+                        round(price, 4),
+                        rng.randint(1_000_000, 90_000_000),
+                    ]
+                )
+    return path
+
+
+def write_finnhub(
+    data_dir: str, ticker: str, rng: random.Random, scale: int, end: date
+) -> None:
+    base = os.path.join(data_dir, "finnhub_data")
+    news, senti, trans = {}, {}, {}
+    for day in _days(NEWS_START, end):
+        key = day.isoformat()
+        news[key] = [
+            {
+                "headline": f"{ticker} {_sentence(rng, 8)}",
+                "summary": _sentence(rng, 40),
+            }
+            for _ in range(NEWS_PER_DAY * scale)
+        ]
+        if day.day == 1:
+            senti[key] = [
+                {
+                    "symbol": ticker,
+                    "year": day.year,
+                    "month": day.month,
+                    "change": rng.randint(-50_000, 50_000),
+                    "mspr": round(rng.uniform(-100, 100), 4),
+                }
+                for _ in range(scale)
+            ]
+        if day.weekday() in (1, 3):
+            trans[key] = [
+                {
+                    "name": f"INSIDER {rng.randint(1, 40)}",
+                    "share": rng.randint(1_000, 900_000),
+                    "change": rng.randint(-90_000, 20_000),
+                    "filingDate": key,
+                    "transactionDate": key,
+                    "transactionCode": rng.choice("SPMAG"),
+                    "transactionPrice": round(rng.uniform(20, 900), 2),
+                }
+                for _ in range(scale)
+            ]
+    _write_json(os.path.join(base, "news_data", f"{ticker}_data_formatted.json"), news)
+    _write_json(os.path.join(base, "insider_senti", f"{ticker}_data_formatted.json"), senti)
+    _write_json(os.path.join(base, "insider_trans", f"{ticker}_data_formatted.json"), trans)
+
+
+def _quarter_ends(count: int) -> Iterator[date]:
+    year, quarter = PRICE_END.year, 1
+    for _ in range(count):
+        month = quarter * 3
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        yield next_month - timedelta(days=1)
+        quarter -= 1
+        if quarter == 0:
+            year, quarter = year - 1, 4
+
+
+def write_simfin(
+    data_dir: str, tickers: Iterable[str], rng: random.Random, scale: int
+) -> None:
+    companies = list(tickers) + [
+        f"CO{i:05d}" for i in range(SIMFIN_COMPANIES * scale)
+    ]
+    for folder, (name, columns) in SIMFIN_FILES.items():
+        directory = os.path.join(
+            data_dir, "fundamental_data", "simfin_data_all", folder, "companies", "us"
+        )
+        os.makedirs(directory, exist_ok=True)
+        for freq, periods in (
+            ("quarterly", list(_quarter_ends(SIMFIN_QUARTERS))),
+            ("annual", [end for end in _quarter_ends(SIMFIN_QUARTERS) if end.month == 12]),
+        ):
+            path = os.path.join(directory, f"us-{name}-{freq}.csv")
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f, delimiter=";")
+                writer.writerow(
+                    ["Ticker", "SimFinId", "Currency", "Fiscal Year", "Fiscal Period",
+                     "Report Date", "Publish Date", "Restated Date",
+                     "Shares (Basic)", "Shares (Diluted)", *columns]
+                )
+                for sim_id, ticker in enumerate(companies):
+                    for end in periods:
+                        published = end + timedelta(days=30 + rng.randint(0, 20))
+                        writer.writerow(
+                            [ticker, sim_id, "USD", end.year,
+                             f"Q{(end.month - 1) // 3 + 1}" if freq == "quarterly" else "FY",
+                             end.isoformat(), published.isoformat(), published.isoformat(),
+                             rng.randint(10**8, 10**10), rng.randint(10**8, 10**10),
+                             *(rng.randint(-10**9, 10**11) for _ in columns)]
+                        )
+
+
+def write_reddit(
+    data_dir: str, tickers: Iterable[str], rng: random.Random, scale: int, end: date
+) -> None:
+    names = [COMPANY_NAMES.get(t, t) for t in tickers]
+    for category, subreddits in SUBREDDITS.items():
+        directory = os.path.join(data_dir, "reddit_data", category)
+        os.makedirs(directory, exist_ok=True)
+        for subreddit in subreddits:
+            with open(os.path.join(directory, f"{subreddit}.jsonl"), "w", encoding="utf-8") as f:
+                for day in _days(NEWS_START, end):
+                    midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+                    for i in range(POSTS_PER_DAY * scale):
+                        title = _sentence(rng, 10)
+                        if category == "company_news" and i % 2 == 0:
+                            title = f"{rng.choice(names)} {title}"
+                        post = {
+                            "id": f"{subreddit}{day:%Y%m%d}{i}",
+                            "created_utc": int(midnight.timestamp()) + rng.randint(0, 86_399),
+                            "title": title,
+                            "selftext": _sentence(rng, 60) if i % 3 else "",
+                            "url": f"https://www.reddit.com/r/{subreddit}/{i}",
+                            "ups": rng.randint(0, 20_000),
+                            "num_comments": rng.randint(0, 2_000),
+                        }
+                        f.write(json.dumps(post) + "\n")
+
+
+def write_fixtures(
+    data_dir: str, tickers: Iterable[str] = ("NVDA",), end: str = "2024-05-31", scale: int = 1
+) -> str:
+    """Write the synthetic datasets for ``tickers`` and return ``data_dir``.
+
+    News and reddit posts run from ``NEWS_START`` to ``end``.
+    """
+    tickers = list(tickers)
+    end_date = date.fromisoformat(end)
+    rng = random.Random(42)
+    for ticker in tickers:
+        write_prices(data_dir, ticker, rng, scale)
+        write_finnhub(data_dir, ticker, rng, scale, end_date)
+    write_simfin(data_dir, tickers, rng, scale)
+    write_reddit(data_dir, tickers, rng, scale, end_date)
+    return data_dir
@@ -0,0 +1,129 @@
+"""Load test for the paginated history endpoints.
+
+Fills a throwaway SQLite database with ``--records`` analyses for a single
+user and times ``GET /history`` and ``GET /results/{user_id}`` for the first,
+a middle and the last page. With keyset pagination the latency should stay
+flat however deep the page is.
+
+Run from the repository root::
+
+    python -m benchmarks.history_load --records 100000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPORT = "x" * 20_000  # stands in for the full report of legacy rows
+
+
+def _fill(engine, models, records: int, user_id: int) -> None:
+    start = datetime(2024, 1, 1)
+    batch = 10_000
+    with engine.begin() as conn:
+        for offset in range(0, records, batch):
+            count = min(batch, records - offset)
+            conn.execute(
+                models.AnalysisRecord.__table__.insert(),
+                [
+                    {
+                        "user_id": user_id,
+                        "ticker": "NVDA",
+                        "date": "2024-05-10",
+                        "decision": "BUY",
+                        "full_report": REPORT,
+                        "tool_calls": 3,
+                        "llm_calls": 12,
+                        "reports_generated": 7,
+                    }
+                    for _ in range(count)
+                ],
+            )
+            conn.execute(
+                models.AnalysisResult.__table__.insert(),
+                [
+                    {
+                        "query_text": "NVDA",
+                        "result_summary": "BUY",
+                        "full_report_json": REPORT,
+                        "created_at": start + timedelta(minutes=offset + i),
+                        "user_id": str(user_id),
+                        "status": "completed",
+                    }
+                    for i in range(count)
+                ],
+            )
+
+
+def _time(client, url: str, headers: dict, repeat: int) -> float:
+    """Median latency of ``url`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/history_load.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ["JOB_WORKERS"] = "0"
+
+    from fastapi.testclient import TestClient
+
+    from backend import main as backend_main, models
+    from backend.database import SessionLocal, engine
+
+    db = SessionLocal()
+    user = models.User(email="load@test", password_hash="-")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    print(f"Inserting {args.records} records...")
+    _fill(engine, models, args.records, user_id)
+
+    token = backend_main.create_access_token({"id": user_id, "email": "load@test"})
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(backend_main.app)
+
+    history = client.get("/history", params={"limit": args.limit}, headers=headers)
+    newest = history.json()[0]["id"]
+    results = client.get(
+        f"/results/{user_id}", params={"limit": args.limit}, headers=headers
+    )
+    newest_result = results.json()[0]["id"]
+
+    print(f"{'page':<8}{'/history ms':>14}{'/results ms':>14}")
+    for name, depth in (
+        ("first", None),
+        ("middle", args.records // 2),
+        ("last", args.records - args.limit),
+    ):
+        history_url = f"/history?limit={args.limit}"
+        results_url = f"/results/{user_id}?limit={args.limit}"
+        if depth is not None:
+            history_url += f"&before_id={newest - depth + 1}"
+            results_url += f"&before_id={newest_result - depth + 1}"
+        print(
+            f"{name:<8}"
+            f"{_time(client, history_url, headers, args.repeat):>14.2f}"
+            f"{_time(client, results_url, headers, args.repeat):>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Import time regression check based on ``python -X importtime``.
+
+Imports each target module in a fresh interpreter, reports its cumulative
+import time with the slowest dependencies, and fails when:
+
+* a module listed in ``DEFERRED`` is loaded at import time, or
+* a target takes longer than ``--max-seconds``.
+
+The best of ``--runs`` runs is reported to reduce noise.
+
+Run from the repository root::
+
+    python -m benchmarks.import_time --max-seconds 3
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+TARGETS = (
+    "tradingagents.graph.trading_graph",
+    "backend.main",
+    "cli.main",
+)
+
+# Loaded on first use; importing any of them at startup is a regression
+DEFERRED = (
+    "chromadb",
+    "pandas",
+    "yfinance",
+    "stockstats",
+    "bs4",
+    "tqdm",
+    "langchain_openai",
+    "langchain_anthropic",
+    "langchain_google_genai",
+)
+
+
+def import_times(module: str, env: dict) -> dict:
+    """Return the cumulative import time in seconds of every loaded module."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=TARGETS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float)
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(
+            os.environ,
+            SECRET_KEY="benchmark",
+            JOB_WORKERS="0",
+            DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'users.db')}",
+        )
+        for module in args.modules:
+            runs = [import_times(module, env) for _ in range(args.runs)]
+            times = min(runs, key=lambda t: t[module])
+            total = times[module]
+            print(f"{module}: {total:.2f} s")
+            slowest = sorted(
+                (item for item in times.items() if item[0] != module),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            for name, seconds in slowest[: args.top]:
+                print(f"    {seconds:6.2f} s  {name}")
+
+            loaded = [name for name in DEFERRED if name in times]
+            if loaded:
+                print(f"    imported eagerly: {', '.join(loaded)}")
+                failed = True
+            if args.max_seconds and total > args.max_seconds:
+                print(f"    above budget of {args.max_seconds} s")
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
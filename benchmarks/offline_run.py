@@ -0,0 +1,248 @@
+"""End-to-end ``TradingAgentsGraph.propagate`` runs without LLMs or APIs.
+
+Writes synthetic datasets to a temporary ``data_dir`` (see
+``benchmarks.fixtures``), runs the graph with the offline tools and a
+``ScriptedChatModel`` in place of both LLMs (see ``benchmarks.fake_llm``),
+and reports:
+
+* the wall time of a run and of each node (median over ``--runs``),
+* the time spent in each tool, summed over its calls: a tool node runs its
+  calls in parallel threads, so these add up to more than the node's wall
+  time,
+* the peak resident set size (RSS) of the process,
+* the peak of memory allocated by Python during one extra run traced with
+  ``tracemalloc``, and the source files holding the most memory at its end.
+
+Everything measured is the graph, the prompts, the state handling and the
+dataflows, since the model answers instantly (``--latency`` adds a delay
+per call).
+
+The results are compared with a baseline recorded with ``--save-baseline``
+on the same machine (see ``benchmarks.baseline``); none is committed, so
+without one the results are only reported. A run time, node or tool time or
+memory figure more than ``--tolerance`` above its baseline fails the run,
+except for times below ``--min-seconds`` which are mostly noise. Record the
+baseline on the base branch and compare with the same ``--runs``. Linux and
+macOS only (uses ``resource``).
+
+Run from the repository root::
+
+    python -m benchmarks.offline_run --runs 5
+    python -m benchmarks.offline_run --save-baseline
+"""
+
+import argparse
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+from benchmarks.baseline import load_baseline, machine_id, save_baseline
+from benchmarks.fixtures import write_fixtures
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baselines", "offline_run.json"
+)
+ANALYSTS = ["market", "social", "news", "fundamentals"]
+
+
+def build_graph(data_dir: str, workdir: str, args):
+    """Graph running the offline tools against ``data_dir`` with scripted LLMs."""
+    from benchmarks.fake_llm import ScriptedChatModel
+    from tradingagents.default_config import DEFAULT_CONFIG
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    class OfflineGraph(TradingAgentsGraph):
+        def _create_llms(self):
+            return tuple(
+                ScriptedChatModel(
+                    model_name=name,
+                    ticker=args.ticker,
+                    trade_date=args.date,
+                    latency=args.latency,
+                )
+                for name in ("scripted-deep", "scripted-quick")
+            )
+
+    config = dict(
+        DEFAULT_CONFIG,
+        data_dir=data_dir,
+        results_dir=workdir,
+        data_cache_dir=os.path.join(workdir, "data_cache"),
+        online_tools=False,
+        memory_enabled=False,
+        checkpoint_enabled=False,
+        node_cache_enabled=False,
+        llm_cache=None,
+    )
+    return OfflineGraph(selected_analysts=args.analysts, config=config)
+
+
+def _rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _median_by_name(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    names = sorted({name for run in runs for name in run})
+    return {
+        name: round(statistics.median(run.get(name, 0.0) for run in runs), 4)
+        for name in names
+    }
+
+
+def measure(graph, args) -> dict:
+    from tradingagents.graph.state_log import state_log_writer
+
+    seconds = []
+    nodes = []
+    tools = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        final_state, _ = graph.propagate(args.ticker, args.date)
+        seconds.append(time.perf_counter() - start)
+        run_metrics = final_state["run_metrics"]
+        nodes.append(
+            {name: node["seconds"] for name, node in run_metrics["nodes"].items()}
+        )
+        tools.append(
+            {name: tool["seconds"] for name, tool in run_metrics["tools"].items()}
+        )
+    state_log_writer.flush()
+    rss_mb = _rss_mb()
+
+    tracemalloc.start()
+    graph.propagate(args.ticker, args.date)
+    state_log_writer.flush()
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    top_files = [
+        {"file": str(stat.traceback[0].filename), "mb": round(stat.size / 2**20, 2)}
+        for stat in snapshot.statistics("filename")[:5]
+    ]
+
+    totals = run_metrics["totals"]
+    return {
+        "seconds": round(statistics.median(seconds), 4),
+        "peak_rss_mb": round(rss_mb, 1),
+        "peak_alloc_mb": round(peak / 2**20, 1),
+        "llm_calls": totals["llm_calls"],
+        "tool_calls": totals["tool_calls"],
+        "nodes": _median_by_name(nodes),
+        "tools": _median_by_name(tools),
+        "top_alloc_files": top_files,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_seconds: float) -> List[str]:
+    """Return a line per figure more than ``tolerance`` above its baseline."""
+    checks = [
+        ("run", results["seconds"], baseline["seconds"], "s"),
+        ("peak RSS", results["peak_rss_mb"], baseline["peak_rss_mb"], "MB"),
+        ("peak allocated", results["peak_alloc_mb"], baseline["peak_alloc_mb"], "MB"),
+    ]
+    for group in ("nodes", "tools"):
+        for name, before in baseline[group].items():
+            if name in results[group]:
+                label = f"node {name}" if group == "nodes" else f"tool {name} (summed)"
+                checks.append((label, results[group][name], before, "s"))
+
+    regressions = []
+    for label, now, before, unit in checks:
+        if unit == "s" and max(now, before) < min_seconds:
+            continue
+        if now > before * (1 + tolerance):
+            regressions.append(
+                f"{label}: {now:.3f} {unit} vs {before:.3f} {unit} baseline"
+                f" (+{(now / before - 1) * 100 if before else float('inf'):.0f}%)"
+            )
+    for key in ("llm_calls", "tool_calls"):
+        if results[key] != baseline[key]:
+            print(f"note: {key} changed from {baseline[key]} to {results[key]}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--ticker", default="NVDA")
+    parser.add_argument("--date", default="2024-05-10")
+    parser.add_argument("--analysts", nargs="+", default=ANALYSTS, choices=ANALYSTS)
+    parser.add_argument("--scale", type=int, default=1, help="fixture size multiplier")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per LLM call")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-seconds", type=float, default=0.05)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        data_dir = os.path.join(workdir, "data")
+        start = time.perf_counter()
+        write_fixtures(data_dir, [args.ticker], end=args.date, scale=args.scale)
+        print(f"fixtures written in {time.perf_counter() - start:.1f} s")
+
+        # The dataflows read data_dir when first imported; the graph writes
+        # its state logs under the working directory
+        os.environ["TRADINGAGENTS_DATA_DIR"] = data_dir
+        os.environ["TRADINGAGENTS_RESULTS_DIR"] = workdir
+        os.environ["TRADINGAGENTS_MEMORY"] = "false"
+        os.chdir(workdir)
+        try:
+            graph = build_graph(data_dir, workdir, args)
+            results = measure(graph, args)
+        finally:
+            os.chdir(cwd)
+
+    print(
+        f"run {results['seconds']:8.3f} s  peak RSS {results['peak_rss_mb']:.1f} MB"
+        f"  peak allocated {results['peak_alloc_mb']:.1f} MB"
+        f"  ({results['llm_calls']} LLM calls, {results['tool_calls']} tool calls)"
+    )
+    for group, title in (
+        ("nodes", "nodes (wall time)"),
+        ("tools", "tools (time summed over calls, which run in parallel)"),
+    ):
+        print(f"\n{title}:")
+        for name, seconds in sorted(results[group].items(), key=lambda item: -item[1]):
+            print(f"  {name:45} {seconds:8.3f} s")
+    print("\nlargest allocations at the end of the traced run:")
+    for entry in results["top_alloc_files"]:
+        print(f"  {entry['mb']:8.2f} MB  {entry['file']}")
+
+    if args.save_baseline:
+        baseline = {k: v for k, v in results.items() if k != "top_alloc_files"}
+        baseline.update(runs=args.runs, scale=args.scale)
+        save_baseline(args.baseline, baseline)
+        print(f"\nbaseline for {machine_id()} saved to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(
+            f"\nno baseline for {machine_id()} in {args.baseline};"
+            " record one with --save-baseline"
+        )
+        return 0
+    if baseline.get("scale", 1) != args.scale:
+        print(f"\nbaseline was recorded at --scale {baseline.get('scale', 1)}")
+        return 0
+    regressions = compare(results, baseline, args.tolerance, args.min_seconds)
+    if regressions:
+        print(f"\nregressions beyond {args.tolerance:.0%} of the baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nwithin {args.tolerance:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Startup time and memory of an API worker.
+
+Each scenario runs in a fresh interpreter and reports its wall time and
+resident set size (RSS):
+
+* ``idle``: ``import backend.main``, i.e. a worker that has not run an
+  analysis yet.
+* ``graph``: an idle worker that has also built one analysis graph, which is
+  what every in-flight analysis holds on to.
+* ``graph-no-memory``: the same with ``TRADINGAGENTS_MEMORY=false``.
+
+No API calls are made. Pass ``--max-idle-mb``/``--max-graph-mb`` to exit
+non-zero when a budget is exceeded. Linux only (reads ``/proc``).
+
+Run from the repository root::
+
+    python -m benchmarks.startup_rss --max-idle-mb 150
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+SCENARIO = r"""
+import json, time
+start = time.perf_counter()
+import backend.main
+if {build_graph}:
+    from types import SimpleNamespace
+    from backend.analysis_runner import AnalyzeRequest, create_graph
+    user = SimpleNamespace(id=0, openai_api_key="sk-test", finnhub_api_key="test")
+    create_graph(AnalyzeRequest(ticker="NVDA", date="2024-05-10"), user)
+elapsed = time.perf_counter() - start
+rss = next(
+    int(line.split()[1]) for line in open("/proc/self/status")
+    if line.startswith("VmRSS")
+)
+print(json.dumps({{"seconds": elapsed, "rss_mb": rss / 1024}}))
+"""
+
+SCENARIOS = {
+    "idle": (False, {}),
+    "graph": (True, {"TRADINGAGENTS_MEMORY": "true"}),
+    "graph-no-memory": (True, {"TRADINGAGENTS_MEMORY": "false"}),
+}
+
+
+def measure(name: str, workdir: str) -> dict:
+    build_graph, extra_env = SCENARIOS[name]
+    env = dict(
+        os.environ,
+        SECRET_KEY="benchmark",
+        JOB_WORKERS="0",
+        POSTHOG_API_KEY="",
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'users.db')}",
+        TRADINGAGENTS_RESULTS_DIR=workdir,
+        **extra_env,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", SCENARIO.format(build_graph=build_graph)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-idle-mb", type=float)
+    parser.add_argument("--max-graph-mb", type=float)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in SCENARIOS:
+            runs = [measure(name, workdir) for _ in range(args.runs)]
+            results[name] = {
+                "seconds": min(r["seconds"] for r in runs),
+                "rss_mb": max(r["rss_mb"] for r in runs),
+            }
+            print(
+                f"{name:16} {results[name]['seconds']:6.2f} s"
+                f" {results[name]['rss_mb']:8.1f} MB"
+            )
+
+    failed = False
+    if args.max_idle_mb and results["idle"]["rss_mb"] > args.max_idle_mb:
+        print(f"idle RSS above budget of {args.max_idle_mb} MB")
+        failed = True
+    if args.max_graph_mb and results["graph-no-memory"]["rss_mb"] > args.max_graph_mb:
+        print(f"graph RSS above budget of {args.max_graph_mb} MB")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
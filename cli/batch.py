@@ -0,0 +1,133 @@
+import csv
+import datetime
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Sections written to <results_dir>/<ticker>/<date>/reports, as in `analyze`
+REPORT_SECTIONS = (
+    "market_report",
+    "sentiment_report",
+    "news_report",
+    "fundamentals_report",
+    "investment_plan",
+    "trader_investment_plan",
+    "final_trade_decision",
+)
+
+
+def _validate_date(date_str: str) -> str:
+    analysis_date = datetime.datetime.strptime(date_str, "%Y-%m-%d")
+    if analysis_date.date() > datetime.datetime.now().date():
+        raise ValueError(f"Analysis date {date_str} is in the future")
+    return date_str
+
+
+def _read_job_file(path: Path) -> Iterable[Tuple[str, str]]:
+    """Read (ticker, date) pairs from a CSV or JSONL file."""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield row["ticker"], row["date"]
+            return
+        for row in csv.reader(f):
+            if not row or row[0].strip().lower() in ("", "ticker"):
+                continue
+            yield row[0], row[1]
+
+
+def load_jobs(
+    tickers: Iterable[str], dates: Iterable[str], path: Optional[Path] = None
+) -> List[Tuple[str, str]]:
+    """Every ticker on every date, plus the pairs listed in ``path``.
+
+    Tickers are upper-cased, dates validated and duplicates dropped.
+    """
+    pairs = [(ticker, date) for ticker in tickers for date in dates]
+    if path is not None:
+        pairs.extend(_read_job_file(path))
+
+    jobs = []
+    for ticker, date in pairs:
+        job = (ticker.strip().upper(), _validate_date(date.strip()))
+        if job not in jobs:
+            jobs.append(job)
+    return jobs
+
+
+def write_results(
+    results_dir: Path, ticker: str, date: str, final_state: dict, decision: str, seconds: float
+) -> Path:
+    """Write the report sections and a summary of one run."""
+    run_dir = results_dir / ticker / date
+    report_dir = run_dir / "reports"
+    report_dir.mkdir(parents=True, exist_ok=True)
+    for section in REPORT_SECTIONS:
+        if final_state.get(section):
+            with open(report_dir / f"{section}.md", "w", encoding="utf-8") as f:
+                f.write(final_state[section])
+    with open(run_dir / "summary.json", "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "ticker": ticker,
+                "date": date,
+                "decision": decision,
+                "seconds": seconds,
+                "run_metrics": final_state.get("run_metrics"),
+            },
+            f,
+            indent=2,
+        )
+    return run_dir
+
+
+def run_batch(
+    jobs: List[Tuple[str, str]],
+    config: Dict,
+    analysts: List[str],
+    workers: int,
+    on_result: Callable[[str, str, Optional[str], float, Optional[Exception]], None],
+) -> int:
+    """Run ``jobs`` on up to ``workers`` threads and return the failure count.
+
+    Each worker thread builds one graph and reuses it for its later jobs.
+    ``on_result(ticker, date, decision, seconds, error)`` is called from the
+    calling thread as runs finish.
+    """
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    local = threading.local()
+    results_dir = Path(config["results_dir"])
+
+    def run(ticker: str, date: str):
+        start = time.monotonic()
+        try:
+            graph = getattr(local, "graph", None)
+            if graph is None:
+                graph = local.graph = TradingAgentsGraph(analysts, config=dict(config))
+            else:
+                graph.reset()
+            final_state, decision = graph.propagate(ticker, date)
+            seconds = time.monotonic() - start
+            write_results(results_dir, ticker, date, final_state, decision, seconds)
+            return decision, seconds, None
+        except Exception as exc:
+            return None, time.monotonic() - start, exc
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run, ticker, date): (ticker, date) for ticker, date in jobs
+        }
+        for future in as_completed(futures):
+            ticker, date = futures[future]
+            decision, seconds, error = future.result()
+            if error is not None:
+                failures += 1
+            on_result(ticker, date, decision, seconds, error)
+    return failures
@@ -0,0 +1,60 @@
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+
+class BufferedFileWriter:
+    """Writes the CLI's message log and report files from a background thread.
+
+    Log lines are buffered and appended through one open handle, and report
+    files are debounced: only the latest content of each file is written,
+    at most once per ``flush_interval`` seconds. Call ``close`` to write
+    everything still pending.
+    """
+
+    def __init__(self, log_path: Path, report_dir: Path, flush_interval: float = 1.0):
+        self.report_dir = Path(report_dir)
+        self.flush_interval = flush_interval
+        self._log = open(log_path, "a", encoding="utf-8", errors="ignore")
+        self._lines: List[str] = []
+        self._reports: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="cli-file-writer", daemon=True
+        )
+        self._thread.start()
+
+    def append_line(self, line: str) -> None:
+        """Queue a line for the message log."""
+        with self._lock:
+            self._lines.append(line + "\n")
+
+    def write_report(self, file_name: str, content: str) -> None:
+        """Replace the pending content of a report file."""
+        with self._lock:
+            self._reports[file_name] = content
+
+    def _flush(self) -> None:
+        with self._lock:
+            lines, self._lines = self._lines, []
+            reports, self._reports = self._reports, {}
+        if lines:
+            self._log.write("".join(lines))
+            self._log.flush()
+        for file_name, content in reports.items():
+            with open(
+                self.report_dir / file_name, "w", encoding="utf-8", errors="ignore"
+            ) as f:
+                f.write(content)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+
+    def close(self) -> None:
+        """Stop the writer thread and write everything still pending."""
+        self._stop.set()
+        self._thread.join()
+        self._flush()
+        self._log.close()
@@ -3,6 +3,7 @@ import datetime
 import typer
 from pathlib import Path
 from functools import wraps
+from contextlib import closing
 from rich.console import Console
 from rich.panel import Panel
 from rich.spinner import Spinner
@@ -20,9 +21,9 @@ from rich import box
 from rich.align import Align
 from rich.rule import Rule
 
-from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
+from cli.file_writer import BufferedFileWriter
 from cli.utils import *
 
 console = Console()
@@ -40,7 +41,13 @@ class MessageBuffer:
         self.messages = deque(maxlen=max_length)
         self.tool_calls = deque(maxlen=max_length)
         self.current_report = None
-        self.final_report = None  # Store the complete final report
+        # Bumped on every change so the display only rebuilds what changed
+        self.messages_version = 0
+        self.report_version = 0
+        self._final_report = None
+        self._final_report_version = 0
+        # RunMetrics collector of the run in progress
+        self.run_metrics = None
         self.agent_status = {
             # Analyst Team
             "Market Analyst": "pending",
@@ -74,10 +81,12 @@ class MessageBuffer:
     def add_message(self, message_type, content):
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         self.messages.append((timestamp, message_type, content))
+        self.messages_version += 1
 
     def add_tool_call(self, tool_name, args):
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         self.tool_calls.append((timestamp, tool_name, args))
+        self.messages_version += 1
 
     def update_agent_status(self, agent, status):
         if agent in self.agent_status:
@@ -86,9 +95,26 @@ class MessageBuffer:
 
     def update_report_section(self, section_name, content):
         if section_name in self.report_sections:
+            if self.report_sections[section_name] == content:
+                return
             self.report_sections[section_name] = content
+            self.report_version += 1
             self._update_current_report()
 
+    def reset_reports(self):
+        for section in self.report_sections:
+            self.report_sections[section] = None
+        self.current_report = None
+        self.report_version += 1
+
+    @property
+    def final_report(self):
+        """The complete report, joined again only after a section changed."""
+        if self._final_report_version != self.report_version:
+            self._final_report = self._build_final_report()
+            self._final_report_version = self.report_version
+        return self._final_report
+
     def _update_current_report(self):
         # For the panel display, only show the most recently updated section
         latest_section = None
@@ -115,10 +141,7 @@ class MessageBuffer:
                 f"### {section_titles[latest_section]}\n{latest_content}"
             )
 
-        # Update the final complete report
-        self._update_final_report()
-
-    def _update_final_report(self):
+    def _build_final_report(self):
         report_parts = []
 
         # Analyst Team Reports
@@ -164,7 +187,7 @@ class MessageBuffer:
             report_parts.append("## Portfolio Management Decision")
             report_parts.append(f"{self.report_sections['final_trade_decision']}")
 
-        self.final_report = "\n\n".join(report_parts) if report_parts else None
+        return "\n\n".join(report_parts) if report_parts else None
 
 
 message_buffer = MessageBuffer()
@@ -175,7 +198,7 @@ def create_layout():
     layout.split_column(
         Layout(name="header", size=3),
         Layout(name="main"),
-        Layout(name="footer", size=3),
+        Layout(name="footer", size=4),
     )
     layout["main"].split_column(
         Layout(name="upper", ratio=3), Layout(name="analysis", ratio=5)
@@ -183,22 +206,64 @@ def create_layout():
     layout["upper"].split_row(
         Layout(name="progress", ratio=2), Layout(name="messages", ratio=3)
     )
+    _panel_keys.clear()
     return layout
 
 
-def update_display(layout, spinner_text=None):
-    # Header with welcome message
-    layout["header"].update(
-        Panel(
-            "[bold green]Welcome to TradingAgents CLI[/bold green]\n"
-            "[dim]© [Tauric Research](https://github.com/TauricResearch)[/dim]",
-            title="Welcome to TradingAgents",
-            border_style="green",
-            padding=(1, 2),
-            expand=True,
-        )
+class ThrottledMarkdown:
+    """Markdown renderable that re-parses its text at most every ``min_interval`` seconds.
+
+    The Live display re-renders several times a second, so text set by
+    ``update`` still shows up shortly after the last change.
+    """
+
+    def __init__(self, min_interval=0.5):
+        self.min_interval = min_interval
+        self.text = ""
+        self._parsed_text = None
+        self._markdown = None
+        self._parsed_at = 0.0
+
+    def update(self, text):
+        self.text = text
+
+    def __rich_console__(self, console, options):
+        now = time.monotonic()
+        if self.text != self._parsed_text and (
+            self._markdown is None or now - self._parsed_at >= self.min_interval
+        ):
+            self._markdown = Markdown(self.text)
+            self._parsed_text = self.text
+            self._parsed_at = now
+        yield self._markdown
+
+
+# Key of the inputs each layout section was last rendered from
+_panel_keys = {}
+# Stands in for sections not rendered yet, so any key (even None) renders once
+_NOT_RENDERED = object()
+report_markdown = ThrottledMarkdown()
+
+
+def _update_panel(layout, name, key, build):
+    """Replace a layout section only when the inputs it shows changed."""
+    if _panel_keys.get(name, _NOT_RENDERED) != key:
+        layout[name].update(build())
+        _panel_keys[name] = key
+
+
+def _header_panel():
+    return Panel(
+        "[bold green]Welcome to TradingAgents CLI[/bold green]\n"
+        "[dim]© [Tauric Research](https://github.com/TauricResearch)[/dim]",
+        title="Welcome to TradingAgents",
+        border_style="green",
+        padding=(1, 2),
+        expand=True,
     )
 
+
+def _progress_panel():
     # Progress panel showing agent status
     progress_table = Table(
         show_header=True,
@@ -265,10 +330,10 @@ def update_display(layout, spinner_text=None):
         # Add horizontal line after each team
         progress_table.add_row("─" * 20, "─" * 20, "─" * 20, style="dim")
 
-    layout["progress"].update(
-        Panel(progress_table, title="Progress", border_style="cyan", padding=(1, 2))
-    )
+    return Panel(progress_table, title="Progress", border_style="cyan", padding=(1, 2))
+
 
+def _messages_panel(spinner_text=None):
     # Messages panel showing recent messages and tool calls
     messages_table = Table(
         show_header=True,
@@ -344,51 +409,99 @@ def update_display(layout, spinner_text=None):
             f"[dim]Showing last {max_messages} of {len(all_messages)} messages[/dim]"
         )
 
-    layout["messages"].update(
-        Panel(
-            messages_table,
-            title="Messages & Tools",
-            border_style="blue",
-            padding=(1, 2),
-        )
+    return Panel(
+        messages_table,
+        title="Messages & Tools",
+        border_style="blue",
+        padding=(1, 2),
     )
 
+
+def _analysis_panel():
     # Analysis panel showing current report
     if message_buffer.current_report:
-        layout["analysis"].update(
-            Panel(
-                Markdown(message_buffer.current_report),
-                title="Current Report",
-                border_style="green",
-                padding=(1, 2),
-            )
-        )
-    else:
-        layout["analysis"].update(
-            Panel(
-                "[italic]Waiting for analysis report...[/italic]",
-                title="Current Report",
-                border_style="green",
-                padding=(1, 2),
-            )
+        return Panel(
+            report_markdown,
+            title="Current Report",
+            border_style="green",
+            padding=(1, 2),
         )
+    return Panel(
+        "[italic]Waiting for analysis report...[/italic]",
+        title="Current Report",
+        border_style="green",
+        padding=(1, 2),
+    )
 
+
+def _footer_panel():
     # Footer with statistics
-    tool_calls_count = len(message_buffer.tool_calls)
-    llm_calls_count = sum(
-        1 for _, msg_type, _ in message_buffer.messages if msg_type == "Reasoning"
-    )
     reports_count = sum(
         1 for content in message_buffer.report_sections.values() if content is not None
     )
 
     stats_table = Table(show_header=False, box=None, padding=(0, 2), expand=True)
     stats_table.add_column("Stats", justify="center")
-    stats_table.add_row(
-        f"Tool Calls: {tool_calls_count} | LLM Calls: {llm_calls_count} | Generated Reports: {reports_count}"
-    )
+    if message_buffer.run_metrics is None:
+        tool_calls_count = len(message_buffer.tool_calls)
+        llm_calls_count = sum(
+            1 for _, msg_type, _ in message_buffer.messages if msg_type == "Reasoning"
+        )
+        stats_table.add_row(
+            f"Tool Calls: {tool_calls_count} | LLM Calls: {llm_calls_count} | Generated Reports: {reports_count}"
+        )
+    else:
+        # Counted by the run's callbacks, so cleared messages are included
+        totals = message_buffer.run_metrics.totals()
+        ttft = (
+            f"{totals['ttft_seconds']:.1f}s"
+            if totals["ttft_seconds"] is not None
+            else "-"
+        )
+        stats_table.add_row(
+            f"Tool Calls: {totals['tool_calls']} | LLM Calls: {totals['llm_calls']} | Generated Reports: {reports_count}"
+        )
+        stats_table.add_row(
+            f"Tokens: {totals['prompt_tokens']} in / {totals['completion_tokens']} out"
+            f" | LLM Time: {totals['llm_seconds']:.1f}s | First Token: {ttft}"
+            f" | Tool Time: {totals['tool_seconds']:.1f}s"
+            f" | Cache Hits: {totals['cache_hits'] + totals['node_cache_hits']}"
+        )
+
+    return Panel(stats_table, border_style="grey50")
 
-    layout["footer"].update(Panel(stats_table, border_style="grey50"))
+
+def update_display(layout, spinner_text=None):
+    _update_panel(layout, "header", "static", _header_panel)
+    _update_panel(
+        layout,
+        "progress",
+        tuple(message_buffer.agent_status.values()),
+        _progress_panel,
+    )
+    _update_panel(
+        layout,
+        "messages",
+        (message_buffer.messages_version, spinner_text),
+        lambda: _messages_panel(spinner_text),
+    )
+    if message_buffer.current_report:
+        report_markdown.update(message_buffer.current_report)
+    _update_panel(
+        layout, "analysis", bool(message_buffer.current_report), _analysis_panel
+    )
+    run_metrics = message_buffer.run_metrics
+    _update_panel(
+        layout,
+        "footer",
+        (
+            message_buffer.messages_version,
+            message_buffer.report_version,
+            # The totals shown change with every LLM and tool call
+            run_metrics.version if run_metrics is not None else None,
+        ),
+        _footer_panel,
+    )
 
 
 def get_user_selections():
@@ -732,6 +845,9 @@ def extract_content_string(content):
         return str(content)
 
 def run_analysis():
+    # Loaded here so the CLI starts without importing the agents and LLM clients
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
     # First get all user selections
     selections = get_user_selections()
 
@@ -756,6 +872,8 @@ def run_analysis():
     report_dir.mkdir(parents=True, exist_ok=True)
     log_file = results_dir / "message_tool.log"
     log_file.touch(exist_ok=True)
+    # Writes happen on a background thread so they don't stall the display
+    file_writer = BufferedFileWriter(log_file, report_dir)
 
     def save_message_decorator(obj, func_name):
         func = getattr(obj, func_name)
@@ -764,8 +882,7 @@ def run_analysis():
             func(*args, **kwargs)
             timestamp, message_type, content = obj.messages[-1]
             content = content.replace("\n", " ")  # Replace newlines with spaces
-            with open(log_file, "a", encoding="utf-8", errors="ignore") as f:
-                f.write(f"{timestamp} [{message_type}] {content}\n")
+            file_writer.append_line(f"{timestamp} [{message_type}] {content}")
         return wrapper
     
     def save_tool_call_decorator(obj, func_name):
@@ -775,8 +892,7 @@ def run_analysis():
             func(*args, **kwargs)
             timestamp, tool_name, args = obj.tool_calls[-1]
             args_str = ", ".join(f"{k}={v}" for k, v in args.items())
-            with open(log_file, "a", encoding="utf-8", errors="ignore") as f:
-                f.write(f"{timestamp} [Tool Call] {tool_name}({args_str})\n")
+            file_writer.append_line(f"{timestamp} [Tool Call] {tool_name}({args_str})")
         return wrapper
 
     def save_report_section_decorator(obj, func_name):
@@ -787,9 +903,7 @@ def run_analysis():
             if section_name in obj.report_sections and obj.report_sections[section_name] is not None:
                 content = obj.report_sections[section_name]
                 if content:
-                    file_name = f"{section_name}.md"
-                    with open(report_dir / file_name, "w", encoding="utf-8", errors="ignore") as f:
-                        f.write(content)
+                    file_writer.write_report(f"{section_name}.md", content)
         return wrapper
 
     message_buffer.add_message = save_message_decorator(message_buffer, "add_message")
@@ -799,7 +913,7 @@ def run_analysis():
     # Now start the display layout
     layout = create_layout()
 
-    with Live(layout, refresh_per_second=4) as live:
+    with Live(layout, refresh_per_second=4) as live, closing(file_writer):
         # Initial display
         update_display(layout)
 
@@ -819,10 +933,7 @@ def run_analysis():
             message_buffer.update_agent_status(agent, "pending")
 
         # Reset report sections
-        for section in message_buffer.report_sections:
-            message_buffer.report_sections[section] = None
-        message_buffer.current_report = None
-        message_buffer.final_report = None
+        message_buffer.reset_reports()
 
         # Update agent status to in_progress for the first analyst
         first_analyst = f"{selections['analysts'][0].value.capitalize()} Analyst"
@@ -836,10 +947,10 @@ def run_analysis():
         update_display(layout, spinner_text)
 
         # Initialize state and get graph args
-        init_agent_state = graph.propagator.create_initial_state(
+        init_agent_state, args = graph.prepare_run(
             selections["ticker"], selections["analysis_date"]
         )
-        args = graph.propagator.get_graph_args()
+        message_buffer.run_metrics = graph.run_metrics
 
         # Stream the analysis
         trace = []
@@ -1072,6 +1183,7 @@ def run_analysis():
                 update_display(layout)
 
             trace.append(chunk)
+        graph.finish_run(args, completed=bool(trace))
 
         # Get final state and decision
         final_state = trace[-1]
@@ -1101,5 +1213,70 @@ def analyze():
     run_analysis()
 
 
+@app.command()
+def batch(
+    tickers: str = typer.Option("", help="Comma separated ticker symbols"),
+    dates: str = typer.Option("", help="Comma separated analysis dates (YYYY-MM-DD)"),
+    file: Optional[Path] = typer.Option(
+        None, exists=True, dir_okay=False, help="CSV (ticker,date) or JSONL file of runs"
+    ),
+    analysts: str = typer.Option(
+        ",".join(analyst.value for analyst in AnalystType),
+        help="Comma separated analysts",
+    ),
+    research_depth: int = typer.Option(1, min=1, help="Debate and risk discussion rounds"),
+    llm_provider: str = typer.Option(DEFAULT_CONFIG["llm_provider"]),
+    backend_url: str = typer.Option(DEFAULT_CONFIG["backend_url"]),
+    quick_model: str = typer.Option(DEFAULT_CONFIG["quick_think_llm"]),
+    deep_model: str = typer.Option(DEFAULT_CONFIG["deep_think_llm"]),
+    workers: int = typer.Option(2, min=1, help="Analyses run at the same time"),
+):
+    """Run analyses for every ticker and date without prompts or a live display."""
+    from cli.batch import load_jobs, run_batch
+
+    def split(value):
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    try:
+        selected_analysts = [AnalystType(a.lower()).value for a in split(analysts)]
+        jobs = load_jobs(split(tickers), split(dates), file)
+    except (ValueError, KeyError, IndexError) as exc:
+        console.print(f"[red]Error: {exc}[/red]")
+        raise typer.Exit(code=2)
+    if not jobs:
+        console.print("[red]Error: no runs given; use --tickers and --dates or --file[/red]")
+        raise typer.Exit(code=2)
+
+    config = DEFAULT_CONFIG.copy()
+    config["max_debate_rounds"] = research_depth
+    config["max_risk_discuss_rounds"] = research_depth
+    config["llm_provider"] = llm_provider.lower()
+    config["backend_url"] = backend_url
+    config["quick_think_llm"] = quick_model
+    config["deep_think_llm"] = deep_model
+
+    done = 0
+    start = time.monotonic()
+
+    def report(ticker, date, decision, seconds, error):
+        nonlocal done
+        done += 1
+        prefix = f"[{done}/{len(jobs)}] {ticker} {date}"
+        if error is None:
+            console.print(f"{prefix} {decision} ({seconds:.0f}s)")
+        else:
+            console.print(f"{prefix} [red]failed[/red] ({seconds:.0f}s): {error}")
+
+    console.print(f"Running {len(jobs)} analyses with {workers} workers")
+    failures = run_batch(jobs, config, selected_analysts, workers, report)
+    console.print(
+        f"Finished in {time.monotonic() - start:.0f}s: "
+        f"{len(jobs) - failures} succeeded, {failures} failed. "
+        f"Results in {config['results_dir']}"
+    )
+    if failures:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     app()
@@ -15,7 +15,11 @@ class HistoryScreen extends StatefulWidget {
 }
 
 class _HistoryScreenState extends State<HistoryScreen> {
+  static const int _pageSize = 50;
+
   bool _loading = false;
+  bool _loadingMore = false;
+  bool _hasMore = false;
   String? _error;
   List<dynamic> _records = [];
 
@@ -33,13 +37,14 @@ class _HistoryScreenState extends State<HistoryScreen> {
 
     try {
       final response = await http.get(
-        Uri.parse('$backendUrl/history'),
+        Uri.parse('$backendUrl/history?limit=$_pageSize'),
         headers: {'Authorization': 'Bearer ${AuthService.token}'},
       );
       if (response.statusCode == 200) {
         final data = jsonDecode(response.body) as List<dynamic>;
         setState(() {
           _records = data;
+          _hasMore = data.length == _pageSize;
         });
       } else {
         setState(() {
@@ -57,6 +62,32 @@ class _HistoryScreenState extends State<HistoryScreen> {
     }
   }
 
+  Future<void> _fetchMore() async {
+    if (_loadingMore || _records.isEmpty) return;
+    setState(() {
+      _loadingMore = true;
+    });
+
+    try {
+      final beforeId = (_records.last as Map<String, dynamic>)['id'];
+      final response = await http.get(
+        Uri.parse('$backendUrl/history?limit=$_pageSize&before_id=$beforeId'),
+        headers: {'Authorization': 'Bearer ${AuthService.token}'},
+      );
+      if (response.statusCode == 200) {
+        final data = jsonDecode(response.body) as List<dynamic>;
+        setState(() {
+          _records.addAll(data);
+          _hasMore = data.length == _pageSize;
+        });
+      }
+    } finally {
+      setState(() {
+        _loadingMore = false;
+      });
+    }
+  }
+
   @override
   Widget build(BuildContext context) {
     return Scaffold(
@@ -70,8 +101,21 @@ class _HistoryScreenState extends State<HistoryScreen> {
               : _records.isEmpty
                   ? const Center(child: Text('No past analyses yet'))
                   : ListView.builder(
-                      itemCount: _records.length,
+                      itemCount: _records.length + (_hasMore ? 1 : 0),
                       itemBuilder: (context, index) {
+                        if (index == _records.length) {
+                          return Center(
+                            child: _loadingMore
+                                ? const Padding(
+                                    padding: EdgeInsets.all(16),
+                                    child: CircularProgressIndicator(),
+                                  )
+                                : TextButton(
+                                    onPressed: _fetchMore,
+                                    child: const Text('Load more'),
+                                  ),
+                          );
+                        }
                         final item = _records[index] as Map<String, dynamic>;
                         final title = '${item['ticker']} on ${item['date']}';
                         final subtitle = (item['decision'] ?? '').toString();
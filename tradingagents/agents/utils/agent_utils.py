@@ -3,13 +3,14 @@ from typing import List
 from typing import Annotated
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import RemoveMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
+from dataclasses import dataclass, field
+from typing import Optional
 from datetime import date, timedelta, datetime
 import functools
-import pandas as pd
 import os
 from dateutil.relativedelta import relativedelta
-from langchain_openai import ChatOpenAI
 import tradingagents.dataflows.interface as interface
 from tradingagents.default_config import DEFAULT_CONFIG
 from langchain_core.messages import HumanMessage
@@ -31,6 +32,26 @@ def create_msg_delete():
     return delete_messages
 
 
+@dataclass(frozen=True)
+class ApiKeys:
+    """API keys of one graph run, passed to the tools in the run config.
+
+    An object rather than plain strings so LangChain and LangGraph don't
+    copy the keys into run metadata or checkpoints.
+    """
+
+    openai_api_key: Optional[str] = field(default=None, repr=False)
+    finnhub_api_key: Optional[str] = field(default=None, repr=False)
+
+
+def run_api_key(config: Optional[RunnableConfig], name: str) -> Optional[str]:
+    """Key ``name`` of the run's ``ApiKeys``, else of the toolkit config."""
+    keys = ((config or {}).get("configurable") or {}).get("api_keys")
+    if keys is not None:
+        return getattr(keys, name)
+    return Toolkit._config.get(name)
+
+
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
@@ -350,6 +371,7 @@ class Toolkit:
     def get_stock_news_openai(
         ticker: Annotated[str, "the company's ticker"],
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
+        config: RunnableConfig,
     ):
         """
         Retrieve the latest news about a given stock by using OpenAI's news API.
@@ -360,7 +382,7 @@ class Toolkit:
             str: A formatted string containing the latest news about the company on the given date.
         """
 
-        openai_news_results = interface.get_stock_news_openai(ticker, curr_date, Toolkit._config.get("openai_api_key"))
+        openai_news_results = interface.get_stock_news_openai(ticker, curr_date, run_api_key(config, "openai_api_key"))
 
         return openai_news_results
 
@@ -368,6 +390,7 @@ class Toolkit:
     @tool
     def get_global_news_openai(
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
+        config: RunnableConfig,
     ):
         """
         Retrieve the latest macroeconomics news on a given date using OpenAI's macroeconomics news API.
@@ -377,7 +400,7 @@ class Toolkit:
             str: A formatted string containing the latest macroeconomic news on the given date.
         """
 
-        openai_news_results = interface.get_global_news_openai(curr_date, Toolkit._config.get("openai_api_key"))
+        openai_news_results = interface.get_global_news_openai(curr_date, run_api_key(config, "openai_api_key"))
 
         return openai_news_results
 
@@ -386,6 +409,7 @@ class Toolkit:
     def get_fundamentals_openai(
         ticker: Annotated[str, "the company's ticker"],
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
+        config: RunnableConfig,
     ):
         """
         Retrieve the latest fundamental information about a given stock on a given date by using OpenAI's news API.
@@ -397,7 +421,7 @@ class Toolkit:
         """
 
         openai_fundamentals_results = interface.get_fundamentals_openai(
-            ticker, curr_date, Toolkit._config.get("openai_api_key")
+            ticker, curr_date, run_api_key(config, "openai_api_key")
         )
 
         return openai_fundamentals_results
@@ -0,0 +1,120 @@
+import functools
+import hashlib
+import re
+import threading
+from collections import defaultdict
+
+from langgraph.constants import TAG_NOSTREAM
+
+# Every debate turn is appended to the history as "\n<Speaker> Analyst: ..."
+_TURN_START = re.compile(r"\n(?=(?:Bull|Bear|Risky|Safe|Neutral) Analyst: )")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # tiktoken missing or its encoding cannot be downloaded
+        return None
+
+
+def count_tokens(text):
+    """Count tokens with tiktoken, or estimate four characters per token"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+class DebateContext:
+    """Bound the debate history pasted into debater prompts.
+
+    The last ``keep_last_turns`` turns are kept verbatim and older turns are
+    folded, one at a time, into a running summary written by ``llm``. With
+    ``keep_last_turns=None`` the history is passed through unchanged and only
+    prompt sizes are recorded.
+    """
+
+    def __init__(self, llm, keep_last_turns=None):
+        self.llm = llm
+        self.keep_last_turns = keep_last_turns
+        self._summaries = {}  # digest of the summarized turns -> summary
+        self._lock = threading.Lock()
+        self.prompt_tokens = defaultdict(list)
+
+    @staticmethod
+    def split_turns(history):
+        """Split a debate history string into its turns"""
+        return [turn for turn in _TURN_START.split(history) if turn.strip()]
+
+    @staticmethod
+    def _digest(turns):
+        return hashlib.sha256("\n".join(turns).encode("utf-8")).hexdigest()
+
+    def render(self, history):
+        """Return the history to paste into a prompt"""
+        if self.keep_last_turns is None:
+            return history
+
+        turns = self.split_turns(history)
+        if len(turns) <= self.keep_last_turns:
+            return history
+
+        cutoff = len(turns) - self.keep_last_turns
+        summary = self._summarize(turns[:cutoff])
+        recent = "\n".join(turns[cutoff:])
+        return f"Summary of the earlier debate: {summary}\n{recent}"
+
+    def _summarize(self, turns):
+        """Summarize ``turns``, reusing the summary of the longest known prefix"""
+        with self._lock:
+            start, summary = 0, ""
+            for end in range(len(turns), 0, -1):
+                cached = self._summaries.get(self._digest(turns[:end]))
+                if cached is not None:
+                    start, summary = end, cached
+                    break
+
+        for end in range(start + 1, len(turns) + 1):
+            summary = self.llm.invoke(
+                "You keep a running summary of a debate between financial analysts. "
+                "Update the summary with the new turn. Keep each speaker's position, "
+                "their key arguments and any figures they cite, and drop repetition. "
+                "Reply with the updated summary only.\n\n"
+                f"Current summary: {summary or 'None yet.'}\n\n"
+                f"New turn: {turns[end - 1]}",
+                # Keep the summary out of the debater's streamed tokens
+                config={"tags": [TAG_NOSTREAM, "debate_summary"]},
+            ).content
+            with self._lock:
+                self._summaries[self._digest(turns[:end])] = summary
+
+        return summary
+
+    def record(self, node_name, prompt):
+        """Record the token count of a prompt sent by ``node_name``"""
+        tokens = count_tokens(prompt)
+        with self._lock:
+            self.prompt_tokens[node_name].append(tokens)
+        return tokens
+
+    def reset(self):
+        """Forget cached summaries and recorded prompt sizes"""
+        with self._lock:
+            self._summaries.clear()
+            self.prompt_tokens.clear()
+
+    def stats(self):
+        """Per-node prompt token counts"""
+        with self._lock:
+            return {
+                node: {
+                    "calls": len(counts),
+                    "total": sum(counts),
+                    "max": max(counts),
+                    "last": counts[-1],
+                }
+                for node, counts in self.prompt_tokens.items()
+            }
@@ -1,10 +1,10 @@
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
-
-
 class FinancialSituationMemory:
     def __init__(self, name, config, openai_api_key=None):
+        # chromadb and openai are only loaded when memories are used
+        import chromadb
+        from chromadb.config import Settings
+        from openai import OpenAI
+
         if config["backend_url"] == "http://localhost:11434/v1":
             self.embedding = "nomic-embed-text"
         else:
@@ -37,6 +37,12 @@ class FinancialSituationMemory:
             self.situation_collection = self.chroma_client.get_collection(name=name)
 
 
+    def set_api_key(self, openai_api_key):
+        """Use another API key for embedding requests"""
+        from openai import OpenAI
+
+        self.client = OpenAI(api_key=openai_api_key, base_url=self.client.base_url)
+
     def get_embedding(self, text):
         """Get OpenAI embedding for a text"""
         
@@ -45,6 +51,10 @@ class FinancialSituationMemory:
         )
         return response.data[0].embedding
 
+    def count(self):
+        """Number of stored situations"""
+        return self.situation_collection.count()
+
     def add_situations(self, situations_and_advice):
         """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
 
@@ -91,6 +101,28 @@ class FinancialSituationMemory:
         return matched_results
 
 
+class NullMemory:
+    """Stand-in for ``FinancialSituationMemory`` that stores nothing.
+
+    Used when ``memory_enabled`` is off to avoid loading chromadb.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def set_api_key(self, openai_api_key):
+        pass
+
+    def count(self):
+        return 0
+
+    def add_situations(self, situations_and_advice):
+        pass
+
+    def get_memories(self, current_situation, n_matches=1):
+        return []
+
+
 if __name__ == "__main__":
     # Example usage
     matcher = FinancialSituationMemory()
@@ -1,29 +1,34 @@
-from .finnhub_utils import get_data_in_range
-from .googlenews_utils import getNewsData
-from .yfin_utils import YFinanceUtils
-from .reddit_utils import fetch_top_from_category
-from .stockstats_utils import StockstatsUtils
-from .yfin_utils import YFinanceUtils
+# Data vendor modules and the libraries they use (pandas, yfinance,
+# stockstats, ...) are imported on first access.
 
-from .interface import (
+from tradingagents.lazy_exports import lazy_exports
+
+_EXPORTS = {
+    "get_data_in_range": ".finnhub_utils",
+    "getNewsData": ".googlenews_utils",
+    "YFinanceUtils": ".yfin_utils",
+    "fetch_top_from_category": ".reddit_utils",
+    "StockstatsUtils": ".stockstats_utils",
     # News and sentiment functions
-    get_finnhub_news,
-    get_finnhub_company_insider_sentiment,
-    get_finnhub_company_insider_transactions,
-    get_google_news,
-    get_reddit_global_news,
-    get_reddit_company_news,
+    "get_finnhub_news": ".interface",
+    "get_finnhub_company_insider_sentiment": ".interface",
+    "get_finnhub_company_insider_transactions": ".interface",
+    "get_google_news": ".interface",
+    "get_reddit_global_news": ".interface",
+    "get_reddit_company_news": ".interface",
     # Financial statements functions
-    get_simfin_balance_sheet,
-    get_simfin_cashflow,
-    get_simfin_income_statements,
+    "get_simfin_balance_sheet": ".interface",
+    "get_simfin_cashflow": ".interface",
+    "get_simfin_income_statements": ".interface",
     # Technical analysis functions
-    get_stock_stats_indicators_window,
-    get_stockstats_indicator,
+    "get_stock_stats_indicators_window": ".interface",
+    "get_stockstats_indicator": ".interface",
     # Market data functions
-    get_YFin_data_window,
-    get_YFin_data,
-)
+    "get_YFin_data_window": ".interface",
+    "get_YFin_data": ".interface",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     # News and sentiment functions
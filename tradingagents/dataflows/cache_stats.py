@@ -0,0 +1,30 @@
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class CacheStats:
+    """Hit and miss counts of the data caches, by cache name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+
+    def record(self, cache: str, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits[cache] += 1
+            else:
+                self._misses[cache] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Return ``{cache: {"hits": n, "misses": n}}``."""
+        with self._lock:
+            return {
+                cache: {"hits": self._hits[cache], "misses": self._misses[cache]}
+                for cache in sorted(set(self._hits) | set(self._misses))
+            }
+
+
+data_cache_stats = CacheStats()
@@ -1,20 +1,16 @@
 from typing import Annotated, Dict
 from .reddit_utils import fetch_top_from_category
-from .yfin_utils import *
-from .stockstats_utils import *
-from .googlenews_utils import *
 from .finnhub_utils import get_data_in_range
 from dateutil.relativedelta import relativedelta
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import os
-import pandas as pd
-from tqdm import tqdm
-import yfinance as yf
-from openai import OpenAI
 from .config import get_config, set_config, DATA_DIR
 
+# pandas, yfinance, stockstats, BeautifulSoup, tqdm and openai are imported
+# inside the functions using them, so importing this module stays cheap.
+
 
 def get_finnhub_news(
     ticker: Annotated[
@@ -149,6 +145,8 @@ def get_simfin_balance_sheet(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
+    import pandas as pd
+
     data_path = os.path.join(
         DATA_DIR,
         "fundamental_data",
@@ -196,6 +194,8 @@ def get_simfin_cashflow(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
+    import pandas as pd
+
     data_path = os.path.join(
         DATA_DIR,
         "fundamental_data",
@@ -243,6 +243,8 @@ def get_simfin_income_statements(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
+    import pandas as pd
+
     data_path = os.path.join(
         DATA_DIR,
         "fundamental_data",
@@ -287,6 +289,8 @@ def get_google_news(
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
 ) -> str:
+    from .googlenews_utils import getNewsData
+
     query = query.replace(" ", "+")
 
     start_date = datetime.strptime(curr_date, "%Y-%m-%d")
@@ -321,6 +325,7 @@ def get_reddit_global_news(
     Returns:
         str: A formatted dataframe containing the latest news articles posts on reddit and meta information in these columns: "created_utc", "id", "title", "selftext", "score", "num_comments", "url"
     """
+    from tqdm import tqdm
 
     start_date = datetime.strptime(start_date, "%Y-%m-%d")
     before = start_date - relativedelta(days=look_back_days)
@@ -375,6 +380,7 @@ def get_reddit_company_news(
     Returns:
         str: A formatted dataframe containing the latest news articles posts on reddit and meta information in these columns: "created_utc", "id", "title", "selftext", "score", "num_comments", "url"
     """
+    from tqdm import tqdm
 
     start_date = datetime.strptime(start_date, "%Y-%m-%d")
     before = start_date - relativedelta(days=look_back_days)
@@ -429,6 +435,8 @@ def get_stock_stats_indicators_window(
     online: Annotated[bool, "to fetch data online or offline"],
 ) -> str:
 
+    import pandas as pd
+
     best_ind_params = {
         # Moving Averages
         "close_50_sma": (
@@ -564,6 +572,8 @@ def get_stockstats_indicator(
     online: Annotated[bool, "to fetch data online or offline"],
 ) -> str:
 
+    from .stockstats_utils import StockstatsUtils
+
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     curr_date = curr_date.strftime("%Y-%m-%d")
 
@@ -589,6 +599,8 @@ def get_YFin_data_window(
     curr_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
 ) -> str:
+    import pandas as pd
+
     # calculate past days
     date_obj = datetime.strptime(curr_date, "%Y-%m-%d")
     before = date_obj - relativedelta(days=look_back_days)
@@ -631,6 +643,8 @@ def get_YFin_data_online(
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ):
 
+    import yfinance as yf
+
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
@@ -672,6 +686,8 @@ def get_YFin_data(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
+    import pandas as pd
+
     # read in data
     data = pd.read_csv(
         os.path.join(
@@ -703,6 +719,8 @@ def get_YFin_data(
 
 
 def get_stock_news_openai(ticker, curr_date, openai_api_key=None):
+    from openai import OpenAI
+
     config = get_config()
     client = OpenAI(api_key=openai_api_key or config.get("openai_api_key"), base_url=config["backend_url"])
 
@@ -738,6 +756,8 @@ def get_stock_news_openai(ticker, curr_date, openai_api_key=None):
 
 
 def get_global_news_openai(curr_date, openai_api_key=None):
+    from openai import OpenAI
+
     config = get_config()
     client = OpenAI(api_key=openai_api_key or config.get("openai_api_key"), base_url=config["backend_url"])
 
@@ -773,6 +793,8 @@ def get_global_news_openai(curr_date, openai_api_key=None):
 
 
 def get_fundamentals_openai(ticker, curr_date, openai_api_key=None):
+    from openai import OpenAI
+
     config = get_config()
     client = OpenAI(api_key=openai_api_key or config.get("openai_api_key"), base_url=config["backend_url"])
 
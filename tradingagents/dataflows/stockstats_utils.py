@@ -4,6 +4,7 @@ from stockstats import wrap
 from typing import Annotated
 import os
 from .config import get_config
+from .cache_stats import data_cache_stats
 
 
 class StockstatsUtils:
@@ -58,7 +59,9 @@ class StockstatsUtils:
                 f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
             )
 
-            if os.path.exists(data_file):
+            cached = os.path.exists(data_file)
+            data_cache_stats.record("yfin_prices", cached)
+            if cached:
                 data = pd.read_csv(data_file)
                 data["Date"] = pd.to_datetime(data["Date"])
             else:
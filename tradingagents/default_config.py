@@ -17,6 +17,27 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Debate turns kept verbatim in debater prompts; older turns are replaced
+    # by a running summary. None pastes the full history.
+    "debate_context_turns": None,
+    # Situation memories of the researchers, trader and managers (chromadb)
+    "memory_enabled": os.getenv("TRADINGAGENTS_MEMORY", "true").lower()
+    in ("1", "true", "yes"),
+    # Checkpoint settings
+    "checkpoint_enabled": os.getenv("TRADINGAGENTS_CHECKPOINTS", "").lower()
+    in ("1", "true", "yes"),
+    "checkpoint_db_path": os.getenv(
+        "TRADINGAGENTS_CHECKPOINT_DB",
+        os.path.join(os.getenv("TRADINGAGENTS_RESULTS_DIR", "./results"), "checkpoints.sqlite"),
+    ),
+    # LLM response cache: None, "sqlite", "memory" or a langchain BaseCache
+    "llm_cache": None,
+    "llm_cache_path": None,  # defaults to <data_cache_dir>/llm_cache.sqlite
+    # Node output cache settings
+    "node_cache_enabled": False,
+    "node_cache_path": None,  # defaults to <data_cache_dir>/node_cache.sqlite
+    # Gzip the per-ticker JSONL state logs written by propagate()
+    "state_log_compress": False,
     # Tool settings
     "online_tools": True,
     "openai_api_key": None,
@@ -1,11 +1,21 @@
 # TradingAgents/graph/__init__.py
 
-from .trading_graph import TradingAgentsGraph
-from .conditional_logic import ConditionalLogic
-from .setup import GraphSetup
-from .propagation import Propagator
-from .reflection import Reflector
-from .signal_processing import SignalProcessor
+# Submodules are imported on first access; see tradingagents.lazy_exports.
+
+from tradingagents.lazy_exports import lazy_exports
+
+_EXPORTS = {
+    "TradingAgentsGraph": ".trading_graph",
+    "ConditionalLogic": ".conditional_logic",
+    "GraphSetup": ".setup",
+    "Propagator": ".propagation",
+    "Reflector": ".reflection",
+    "SignalProcessor": ".signal_processing",
+    "NodeCache": ".node_cache",
+    "SQLiteLLMCache": ".llm_cache",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "TradingAgentsGraph",
@@ -14,4 +24,6 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "NodeCache",
+    "SQLiteLLMCache",
 ]
@@ -0,0 +1,213 @@
+# TradingAgents/graph/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+# Set in the generation_info of cached generations so callbacks can tell
+# cache hits apart from model calls
+CACHE_HIT_KEY = "llm_cache_hit"
+
+
+def _generation_tokens(generation: Generation) -> int:
+    """Return the total token count recorded on a generation, if any."""
+    message = getattr(generation, "message", None)
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return usage.get("total_tokens", 0)
+    token_usage = (getattr(message, "response_metadata", None) or {}).get(
+        "token_usage"
+    ) or {}
+    return token_usage.get("total_tokens", 0)
+
+
+class SQLiteLLMCache(BaseCache):
+    """Exact-match chat model response cache backed by SQLite.
+
+    Entries are keyed by a hash of the serialized message list and the LLM
+    string, which LangChain builds from the provider, model, sampling
+    parameters and any bound tool schemas.
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        """Open (or create) the cache at ``db_path``."""
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, generations TEXT NOT NULL, "
+                "tokens INTEGER NOT NULL, created_at REAL NOT NULL)"
+            )
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """Return cached generations for the prompt, or ``None`` on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generations, tokens FROM llm_cache WHERE key = ?",
+                (self._key(prompt, llm_string),),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_tokens += row[1]
+
+        generations = []
+        for entry in json.loads(row[0]):
+            generation_info = dict(entry.get("generation_info") or {})
+            generation_info[CACHE_HIT_KEY] = True
+            if "message" in entry:
+                generations.append(
+                    ChatGeneration(
+                        message=messages_from_dict([entry["message"]])[0],
+                        generation_info=generation_info,
+                    )
+                )
+            else:
+                generations.append(
+                    Generation(text=entry["text"], generation_info=generation_info)
+                )
+        return generations
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        """Store the generations produced for the prompt."""
+        entries = []
+        for generation in return_val:
+            entry = {"generation_info": generation.generation_info}
+            if isinstance(generation, ChatGeneration):
+                entry["message"] = message_to_dict(generation.message)
+            else:
+                entry["text"] = generation.text
+            entries.append(entry)
+        tokens = sum(_generation_tokens(generation) for generation in return_val)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, generations, tokens, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self._key(prompt, llm_string), json.dumps(entries), tokens, time.time()),
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Delete all cached responses."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lookup counts, hit rate and tokens saved by cache hits."""
+        return _stats(self.hits, self.misses, self.saved_tokens)
+
+
+class CountingCache(BaseCache):
+    """Wraps another ``BaseCache`` to give it the stats of ``SQLiteLLMCache``.
+
+    Generations returned on a hit are copied with ``CACHE_HIT_KEY`` set, so
+    run metrics count them as cache hits rather than model calls.
+    """
+
+    def __init__(self, cache: BaseCache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+
+    def _count(
+        self, generations: Optional[Sequence[Generation]]
+    ) -> Optional[Sequence[Generation]]:
+        with self._lock:
+            if generations is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_tokens += sum(_generation_tokens(g) for g in generations)
+        return [
+            generation.model_copy(
+                update={
+                    "generation_info": {
+                        **(generation.generation_info or {}),
+                        CACHE_HIT_KEY: True,
+                    }
+                }
+            )
+            for generation in generations
+        ]
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        return self._count(self.cache.lookup(prompt, llm_string))
+
+    async def alookup(
+        self, prompt: str, llm_string: str
+    ) -> Optional[Sequence[Generation]]:
+        return self._count(await self.cache.alookup(prompt, llm_string))
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        self.cache.update(prompt, llm_string, return_val)
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        await self.cache.aupdate(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear(**kwargs)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        await self.cache.aclear(**kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lookup counts, hit rate and tokens saved by cache hits."""
+        return _stats(self.hits, self.misses, self.saved_tokens)
+
+
+def _stats(hits: int, misses: int, saved_tokens: int) -> Dict[str, Any]:
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "saved_tokens": saved_tokens,
+    }
+
+
+def create_llm_cache(config: Dict[str, Any]) -> Optional[BaseCache]:
+    """Build the LLM cache selected by ``config["llm_cache"]``.
+
+    Supported values are ``None`` (no caching), ``"sqlite"``, ``"memory"`` or
+    any ``BaseCache`` instance, which is wrapped in a ``CountingCache``.
+    """
+    backend = config.get("llm_cache")
+    if backend is None or isinstance(backend, (SQLiteLLMCache, CountingCache)):
+        return backend
+    if isinstance(backend, BaseCache):
+        return CountingCache(backend)
+    if backend == "memory":
+        return SQLiteLLMCache(":memory:")
+    if backend == "sqlite":
+        return SQLiteLLMCache(
+            config.get("llm_cache_path")
+            or os.path.join(config["data_cache_dir"], "llm_cache.sqlite")
+        )
+    raise ValueError(f"Unsupported LLM cache: {backend}")
@@ -0,0 +1,227 @@
+# TradingAgents/graph/node_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+
+def prompt_fingerprint(node: Callable) -> str:
+    """Hash the string constants of a node function and its nested code.
+
+    Agent prompts are written inline in the node functions, so their text is
+    part of the code objects' constants. Editing a prompt changes the
+    fingerprint and therefore invalidates the cached outputs of that node.
+    """
+    digest = hashlib.sha256()
+    stack = [getattr(node, "__code__", None)]
+    while stack:
+        code = stack.pop()
+        if code is None:
+            continue
+        for const in code.co_consts:
+            if isinstance(const, str):
+                digest.update(const.encode("utf-8"))
+            elif hasattr(const, "co_consts"):
+                stack.append(const)
+    return digest.hexdigest()
+
+
+def _llm_identity(llm) -> Dict[str, Any]:
+    """Return the model name and temperature of a chat model."""
+    return {
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+    }
+
+
+class NodeCache:
+    """Caches node outputs keyed by the node name and a hash of its inputs.
+
+    The key covers the state fields the node reads, the model name and
+    temperature of its LLM and the fingerprint of its prompt, so a replay of
+    the same (ticker, date, model, prompt) skips the LLM entirely.
+    """
+
+    def __init__(self, db_path: str):
+        """Open (or create) the SQLite cache at ``db_path``."""
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS node_cache ("
+                "key TEXT PRIMARY KEY, node TEXT NOT NULL, ticker TEXT, "
+                "trade_date TEXT, output TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    def make_key(
+        self,
+        node_name: str,
+        state: Dict[str, Any],
+        fields: Iterable[str],
+        llm,
+        fingerprint: str,
+        extra: Any = None,
+    ) -> str:
+        """Build the cache key for a node invocation."""
+        payload = {
+            "node": node_name,
+            "inputs": {field: state.get(field) for field in fields},
+            "llm": _llm_identity(llm),
+            "prompt": fingerprint,
+            "extra": extra,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, node_name: str) -> Optional[Dict[str, Any]]:
+        """Return the cached output for ``key`` and record a hit or miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output FROM node_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses[node_name] += 1
+                return None
+            self.hits[node_name] += 1
+        return json.loads(row[0])
+
+    def put(
+        self, key: str, node_name: str, state: Dict[str, Any], output: Dict[str, Any]
+    ) -> None:
+        """Store the output of a node invocation."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO node_cache "
+                "(key, node, ticker, trade_date, output, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    node_name,
+                    state.get("company_of_interest"),
+                    state.get("trade_date"),
+                    json.dumps(output),
+                    time.time(),
+                ),
+            )
+
+    def invalidate(
+        self,
+        node_name: Optional[str] = None,
+        ticker: Optional[str] = None,
+        trade_date: Optional[str] = None,
+    ) -> int:
+        """Delete cached outputs matching all given filters.
+
+        Calling without arguments clears the whole cache.
+
+        Returns:
+            Number of deleted entries
+        """
+        clauses = []
+        params = []
+        for column, value in (
+            ("node", node_name),
+            ("ticker", ticker),
+            ("trade_date", trade_date),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(f"DELETE FROM node_cache{where}", params)
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counts overall and per node."""
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "nodes": {
+                name: {"hits": self.hits[name], "misses": self.misses[name]}
+                for name in sorted(set(self.hits) | set(self.misses))
+            },
+        }
+
+    def wrap_analyst(
+        self,
+        node_name: str,
+        node: Callable,
+        llm,
+        report_field: str,
+        extra: Optional[Callable[[], Any]] = None,
+    ) -> Callable:
+        """Short-circuit an analyst's tool loop when its report is cached.
+
+        On a hit the analyst answers with the cached report and no tool
+        calls, so the graph moves straight on to the message clear node.
+        """
+        fingerprint = prompt_fingerprint(node)
+        fields = ("company_of_interest", "trade_date")
+
+        def cached_analyst_node(state):
+            key = self.make_key(
+                node_name, state, fields, llm, fingerprint, extra() if extra else None
+            )
+
+            # Only the first call of the tool loop can be answered from cache
+            if not isinstance(state["messages"][-1], ToolMessage):
+                cached = self.get(key, node_name)
+                if cached is not None:
+                    report = cached[report_field]
+                    return {
+                        "messages": [AIMessage(content=report)],
+                        report_field: report,
+                    }
+
+            result = node(state)
+            if result.get(report_field):
+                self.put(key, node_name, state, {report_field: result[report_field]})
+            return result
+
+        return cached_analyst_node
+
+    def wrap_node(
+        self,
+        node_name: str,
+        node: Callable,
+        llm,
+        fields: Iterable[str],
+        extra: Optional[Callable[[], Any]] = None,
+    ) -> Callable:
+        """Cache the full output of a node that reads ``fields`` from the state."""
+        fingerprint = prompt_fingerprint(node)
+        fields = tuple(fields)
+
+        def cached_node(state):
+            key = self.make_key(
+                node_name, state, fields, llm, fingerprint, extra() if extra else None
+            )
+            cached = self.get(key, node_name)
+            if cached is not None:
+                return cached
+
+            result = node(state)
+            self.put(key, node_name, state, result)
+            return result
+
+        return cached_node
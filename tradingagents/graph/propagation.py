@@ -1,6 +1,6 @@
 # TradingAgents/graph/propagation.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -41,9 +41,21 @@ class Propagator:
             "news_report": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_thread_id(self, company_name: str, trade_date: str) -> str:
+        """Get the checkpoint thread id for a (ticker, date) run."""
+        return f"{company_name}:{trade_date}"
+
+    def get_graph_args(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        Args:
+            thread_id: Checkpoint thread to run on. Only needed when the graph
+                was compiled with a checkpointer.
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        if thread_id is not None:
+            config["configurable"] = {"thread_id": thread_id}
         return {
             "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "config": config,
         }
@@ -0,0 +1,87 @@
+# TradingAgents/graph/run_claims.py
+
+import os
+import sqlite3
+import threading
+import time
+
+
+class RunInProgressError(RuntimeError):
+    """Another run is using the checkpoint thread."""
+
+
+# (database, thread) pairs claimed by graphs of this process
+_active = set()
+_active_lock = threading.Lock()
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":
+        # No cheap check; only claims of this process are enforced
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class RunClaims:
+    """Marks the checkpoint threads with a run in progress.
+
+    Claims are kept in a table of the checkpoint database, so runs of other
+    processes sharing it are seen too. A claim left by a process that has
+    exited (POSIX only) is taken over.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock, db_path: str):
+        self._conn = conn
+        self._db = os.path.abspath(db_path)
+        self._lock = lock
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS run_claims ("
+                "thread_id TEXT PRIMARY KEY, pid INTEGER NOT NULL, "
+                "claimed_at REAL NOT NULL)"
+            )
+
+    def claim(self, thread_id: str) -> None:
+        """Claim ``thread_id``, raising ``RunInProgressError`` if it is taken."""
+        pid = os.getpid()
+        key = (self._db, thread_id)
+        with _active_lock:
+            if key in _active:
+                raise RunInProgressError(f"A run on {thread_id} is in progress")
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._conn.execute(
+                        "SELECT pid FROM run_claims WHERE thread_id = ?", (thread_id,)
+                    ).fetchone()
+                    # A claim of this pid outside _active is left from an
+                    # earlier process that had the same pid
+                    if row and row[0] != pid and _pid_alive(row[0]):
+                        raise RunInProgressError(
+                            f"A run on {thread_id} is in progress"
+                        )
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO run_claims VALUES (?, ?, ?)",
+                        (thread_id, pid, time.time()),
+                    )
+                except BaseException:
+                    self._conn.rollback()
+                    raise
+                self._conn.commit()
+            _active.add(key)
+
+    def release(self, thread_id: str) -> None:
+        """Drop this process's claim on ``thread_id``."""
+        with _active_lock:
+            _active.discard((self._db, thread_id))
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "DELETE FROM run_claims WHERE thread_id = ? AND pid = ?",
+                    (thread_id, os.getpid()),
+                )
@@ -0,0 +1,267 @@
+# TradingAgents/graph/run_metrics.py
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from .llm_cache import CACHE_HIT_KEY
+
+
+def _new_node() -> Dict[str, Any]:
+    return {
+        "runs": 0,
+        "seconds": 0.0,
+        "llm_calls": 0,
+        "llm_seconds": 0.0,
+        "ttft_seconds": 0.0,
+        "ttft_count": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cache_hits": 0,
+        "node_cache_hits": 0,
+    }
+
+
+def _new_tool() -> Dict[str, Any]:
+    return {"calls": 0, "seconds": 0.0, "errors": 0}
+
+
+def _token_usage(response: LLMResult):
+    """Return the (prompt, completion) token counts of an LLM response."""
+    prompt = completion = 0
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+                found = True
+    if not found:
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt = token_usage.get("prompt_tokens", 0)
+        completion = token_usage.get("completion_tokens", 0)
+    return prompt, completion
+
+
+def _is_cache_hit(response: LLMResult) -> bool:
+    return any(
+        (generation.generation_info or {}).get(CACHE_HIT_KEY)
+        for generations in response.generations
+        for generation in generations
+    )
+
+
+class RunMetrics(BaseCallbackHandler):
+    """Callback handler recording where the time of one graph run goes.
+
+    Per node it records the wall time of its runs and, for the LLM calls made
+    inside it, latency, time to first token (only seen when the model
+    streams), prompt/completion tokens and response cache hits. Per tool it
+    records calls, wall time and errors. Pass it in the ``callbacks`` of the
+    run config; callbacks may arrive from several threads.
+
+    ``observer(kind, name, seconds)`` is called as each node run, LLM call
+    or tool call ends, with ``kind`` one of ``"node"``, ``"llm"`` (named after
+    its node) or ``"tool"``, e.g. to feed latency histograms.
+    """
+
+    def __init__(
+        self,
+        node_cache=None,
+        observer: Optional[Callable[[str, str, float], None]] = None,
+    ):
+        """Start a new run. ``node_cache`` hits are reported per node."""
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._nodes = defaultdict(_new_node)
+        self._tools = defaultdict(_new_tool)
+        # run_id -> (name, start time) of the runs in progress
+        self._node_runs: Dict[UUID, tuple] = {}
+        self._llm_runs: Dict[UUID, tuple] = {}
+        self._tool_runs: Dict[UUID, tuple] = {}
+        self._first_tokens: Dict[UUID, float] = {}
+        self._observer = observer
+        self._node_cache = node_cache
+        self._node_cache_start = dict(node_cache.hits) if node_cache else {}
+        # Bumped whenever a node, LLM call or tool call ends, so displays can
+        # tell when the totals may have changed without computing them
+        self.version = 0
+
+    @staticmethod
+    def _node_of(metadata: Optional[Dict[str, Any]]) -> str:
+        return (metadata or {}).get("langgraph_node") or "-"
+
+    # Nodes
+
+    def on_chain_start(
+        self, serialized, inputs, *, run_id, tags=None, metadata=None, **kwargs
+    ):
+        node = (metadata or {}).get("langgraph_node")
+        # Only the node run itself, not the chains nested inside it
+        if node and kwargs.get("name") == node and any(
+            tag.startswith("graph:step:") for tag in tags or ()
+        ):
+            with self._lock:
+                self._node_runs[run_id] = (node, time.monotonic())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end_node(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end_node(run_id)
+
+    def _end_node(self, run_id: UUID) -> None:
+        with self._lock:
+            run = self._node_runs.pop(run_id, None)
+            if run is None:
+                return
+            node, start = run
+            seconds = time.monotonic() - start
+            stats = self._nodes[node]
+            stats["runs"] += 1
+            stats["seconds"] += seconds
+            self.version += 1
+        self._observe("node", node, seconds)
+
+    def _observe(self, kind: str, name: str, seconds: float) -> None:
+        if self._observer is not None:
+            self._observer(kind, name, seconds)
+
+    # LLM calls
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        with self._lock:
+            self._llm_runs[run_id] = (self._node_of(metadata), time.monotonic())
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        with self._lock:
+            self._llm_runs[run_id] = (self._node_of(metadata), time.monotonic())
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if run_id not in self._first_tokens:
+            with self._lock:
+                self._first_tokens.setdefault(run_id, time.monotonic())
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs):
+        prompt_tokens, completion_tokens = _token_usage(response)
+        cache_hit = _is_cache_hit(response)
+        with self._lock:
+            run = self._llm_runs.pop(run_id, None)
+            first_token = self._first_tokens.pop(run_id, None)
+            if run is None:
+                return
+            node, start = run
+            seconds = time.monotonic() - start
+            stats = self._nodes[node]
+            stats["llm_calls"] += 1
+            stats["llm_seconds"] += seconds
+            if first_token is not None:
+                stats["ttft_seconds"] += first_token - start
+                stats["ttft_count"] += 1
+            if cache_hit:
+                # Cached responses carry the usage of the original call
+                stats["cache_hits"] += 1
+            else:
+                stats["prompt_tokens"] += prompt_tokens
+                stats["completion_tokens"] += completion_tokens
+            self.version += 1
+        self._observe("llm", node, seconds)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            self._llm_runs.pop(run_id, None)
+            self._first_tokens.pop(run_id, None)
+
+    # Tools
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name") or "-"
+        with self._lock:
+            self._tool_runs[run_id] = (name, time.monotonic())
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end_tool(run_id, error=False)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end_tool(run_id, error=True)
+
+    def _end_tool(self, run_id: UUID, error: bool) -> None:
+        with self._lock:
+            run = self._tool_runs.pop(run_id, None)
+            if run is None:
+                return
+            name, start = run
+            seconds = time.monotonic() - start
+            stats = self._tools[name]
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["errors"] += int(error)
+            self.version += 1
+        self._observe("tool", name, seconds)
+
+    # Results
+
+    def _node_cache_hits(self) -> Dict[str, int]:
+        """Node cache hits per node since the run started."""
+        if self._node_cache is None:
+            return {}
+        return {
+            node: hits - self._node_cache_start.get(node, 0)
+            for node, hits in list(self._node_cache.hits.items())
+            if hits > self._node_cache_start.get(node, 0)
+        }
+
+    def totals(self) -> Dict[str, Any]:
+        """Return the run totals; cheap enough to call while the run goes on."""
+        with self._lock:
+            nodes = [dict(stats) for stats in self._nodes.values()]
+            tools = [dict(stats) for stats in self._tools.values()]
+        ttft_count = sum(n["ttft_count"] for n in nodes)
+        return {
+            "seconds": round(time.monotonic() - self._started, 3),
+            "llm_calls": sum(n["llm_calls"] for n in nodes),
+            "llm_seconds": round(sum(n["llm_seconds"] for n in nodes), 3),
+            "ttft_seconds": (
+                round(sum(n["ttft_seconds"] for n in nodes) / ttft_count, 3)
+                if ttft_count
+                else None
+            ),
+            "prompt_tokens": sum(n["prompt_tokens"] for n in nodes),
+            "completion_tokens": sum(n["completion_tokens"] for n in nodes),
+            "cache_hits": sum(n["cache_hits"] for n in nodes),
+            "node_cache_hits": sum(self._node_cache_hits().values()),
+            "tool_calls": sum(t["calls"] for t in tools),
+            "tool_seconds": round(sum(t["seconds"] for t in tools), 3),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the per-node, per-tool and total metrics as plain JSON data.
+
+        ``ttft_seconds`` is the mean time to first token, or ``None`` when
+        no LLM call of the node streamed.
+        """
+        node_cache_hits = self._node_cache_hits()
+        with self._lock:
+            for node, hits in node_cache_hits.items():
+                self._nodes[node]["node_cache_hits"] = hits
+            nodes = {}
+            for name, stats in self._nodes.items():
+                node = dict(stats)
+                count = node.pop("ttft_count")
+                node["ttft_seconds"] = (
+                    round(node["ttft_seconds"] / count, 3) if count else None
+                )
+                node["seconds"] = round(node["seconds"], 3)
+                node["llm_seconds"] = round(node["llm_seconds"], 3)
+                nodes[name] = node
+            tools = {
+                name: dict(stats, seconds=round(stats["seconds"], 3))
+                for name, stats in self._tools.items()
+            }
+        return {"nodes": nodes, "tools": tools, "totals": self.totals()}
@@ -1,15 +1,45 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+from langchain_core.language_models.chat_models import BaseChatModel
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
 
-from tradingagents.agents import *
+from tradingagents.agents.analysts.fundamentals_analyst import create_fundamentals_analyst
+from tradingagents.agents.analysts.market_analyst import create_market_analyst
+from tradingagents.agents.analysts.news_analyst import create_news_analyst
+from tradingagents.agents.analysts.social_media_analyst import create_social_media_analyst
+from tradingagents.agents.managers.research_manager import create_research_manager
+from tradingagents.agents.managers.risk_manager import create_risk_manager
+from tradingagents.agents.researchers.bear_researcher import create_bear_researcher
+from tradingagents.agents.researchers.bull_researcher import create_bull_researcher
+from tradingagents.agents.risk_mgmt.aggresive_debator import create_risky_debator
+from tradingagents.agents.risk_mgmt.conservative_debator import create_safe_debator
+from tradingagents.agents.risk_mgmt.neutral_debator import create_neutral_debator
+from tradingagents.agents.trader.trader import create_trader
 from tradingagents.agents.utils.agent_states import AgentState
-from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.agents.utils.agent_utils import Toolkit, create_msg_delete
+from tradingagents.agents.utils.debate_context import DebateContext
 
 from .conditional_logic import ConditionalLogic
+from .node_cache import NodeCache
+
+ANALYST_REPORT_FIELDS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
+RESEARCHER_INPUT_FIELDS = (
+    "company_of_interest",
+    "trade_date",
+    "market_report",
+    "sentiment_report",
+    "news_report",
+    "fundamentals_report",
+    "investment_debate_state",
+)
 
 
 class GraphSetup:
@@ -17,8 +47,8 @@ class GraphSetup:
 
     def __init__(
         self,
-        quick_thinking_llm: ChatOpenAI,
-        deep_thinking_llm: ChatOpenAI,
+        quick_thinking_llm: BaseChatModel,
+        deep_thinking_llm: BaseChatModel,
         toolkit: Toolkit,
         tool_nodes: Dict[str, ToolNode],
         bull_memory,
@@ -27,6 +57,8 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        node_cache: NodeCache = None,
+        debate_context: DebateContext = None,
     ):
         """Initialize with required components."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -39,9 +71,19 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.node_cache = node_cache
+        self.debate_context = debate_context
+
+    def _kept_turns(self):
+        """Number of verbatim debate turns in prompts, part of researcher cache keys."""
+        if self.debate_context is None:
+            return None
+        return self.debate_context.keep_last_turns
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        checkpointer=None,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +93,8 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            checkpointer: Optional LangGraph checkpointer. When given, the state
+                is persisted after every node so interrupted runs can resume.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -90,20 +134,51 @@ class GraphSetup:
 
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self.quick_thinking_llm, self.bull_memory, self.debate_context
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self.quick_thinking_llm, self.bear_memory, self.debate_context
         )
         research_manager_node = create_research_manager(
             self.deep_thinking_llm, self.invest_judge_memory
         )
         trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
+        # Replay cached analyst reports and researcher turns
+        if self.node_cache is not None:
+            for analyst_type, node in analyst_nodes.items():
+                analyst_nodes[analyst_type] = self.node_cache.wrap_analyst(
+                    f"{analyst_type.capitalize()} Analyst",
+                    node,
+                    self.quick_thinking_llm,
+                    ANALYST_REPORT_FIELDS[analyst_type],
+                    extra=lambda: self.toolkit.config["online_tools"],
+                )
+            bull_researcher_node = self.node_cache.wrap_node(
+                "Bull Researcher",
+                bull_researcher_node,
+                self.quick_thinking_llm,
+                RESEARCHER_INPUT_FIELDS,
+                extra=lambda: (self.bull_memory.count(), self._kept_turns()),
+            )
+            bear_researcher_node = self.node_cache.wrap_node(
+                "Bear Researcher",
+                bear_researcher_node,
+                self.quick_thinking_llm,
+                RESEARCHER_INPUT_FIELDS,
+                extra=lambda: (self.bear_memory.count(), self._kept_turns()),
+            )
+
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(
+            self.quick_thinking_llm, self.debate_context
+        )
+        neutral_analyst = create_neutral_debator(
+            self.quick_thinking_llm, self.debate_context
+        )
+        safe_analyst = create_safe_debator(
+            self.quick_thinking_llm, self.debate_context
+        )
         risk_manager_node = create_risk_manager(
             self.deep_thinking_llm, self.risk_manager_memory
         )
@@ -202,4 +277,4 @@ class GraphSetup:
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
@@ -1,25 +1,94 @@
 # TradingAgents/graph/signal_processing.py
 
-from langchain_openai import ChatOpenAI
+import re
+from typing import Dict, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+# A decision word, not the start of "Sell-side" or "Holdings"
+_WORD = r"(BUY|HOLD|SELL)\b(?!-)"
+# Not part of a list such as "BUY/HOLD/SELL" or "Buy, Sell, or Hold" copied
+# from the prompts
+_NOT_LIST = r"(?!\s*\**\s*(?:/|,|or\b)\s*(?:or\s+)?\**\s*(?:BUY|HOLD|SELL)\b)"
+
+_PATTERNS = [
+    # The format every agent is instructed to end with
+    re.compile(
+        r"FINAL TRANSACTION PROPOSAL:\s*\**\s*" + _WORD + _NOT_LIST, re.IGNORECASE
+    ),
+    # "Recommendation: Buy", "Final decision - **SELL**.", ... The word must
+    # end the statement, so "Recommendation: Hold off on buying" is no match
+    re.compile(
+        r"(?:recommendation|decision|verdict)\s*\**\s*[:\-]\s*\**\s*"
+        + _WORD
+        + r"[ \t]*\**[ \t]*(?=$|[.!;:)\n])",
+        re.IGNORECASE | re.MULTILINE,
+    ),
+    # A decision bolded on its own, as in "**BUY**", not "**Hold**ings" nor
+    # the last item of "**Buy**, **Sell** or **Hold**"
+    re.compile(
+        r"(?<!or )(?<!, )(?<!/)\*\*\s*"
+        + _WORD
+        + r"\s*[.!]?\s*\*\*(?![\w-])"
+        + _NOT_LIST,
+        re.IGNORECASE,
+    ),
+]
 
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
+    def __init__(self, quick_thinking_llm: BaseChatModel):
         """Initialize with an LLM for processing."""
         self.quick_thinking_llm = quick_thinking_llm
+        self.parsed_count = 0
+        self.fallback_count = 0
+
+    def parse_signal(self, full_signal: str) -> Optional[str]:
+        """
+        Extract the decision by pattern matching, without an LLM call.
+
+        Patterns are tried from most to least explicit. The first one that
+        matches decides: the last explicit proposal wins, while weaker
+        patterns must agree on a single decision.
+
+        Args:
+            full_signal: Complete trading signal text
+
+        Returns:
+            BUY, SELL or HOLD, or None if the text is ambiguous
+        """
+        for i, pattern in enumerate(_PATTERNS):
+            matches = [m.upper() for m in pattern.findall(full_signal)]
+            if not matches:
+                continue
+            if i == 0:
+                return matches[-1]
+            if len(set(matches)) == 1:
+                return matches[0]
+            return None
+        return None
 
     def process_signal(self, full_signal: str) -> str:
         """
         Process a full trading signal to extract the core decision.
 
+        Falls back to the quick thinking LLM only when pattern matching
+        cannot find an unambiguous decision.
+
         Args:
             full_signal: Complete trading signal text
 
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
+        decision = self.parse_signal(full_signal)
+        if decision is not None:
+            self.parsed_count += 1
+            return decision
+
+        self.fallback_count += 1
         messages = [
             (
                 "system",
@@ -29,3 +98,12 @@ class SignalProcessor:
         ]
 
         return self.quick_thinking_llm.invoke(messages).content
+
+    def stats(self) -> Dict[str, float]:
+        """Return how often decisions were parsed versus sent to the LLM."""
+        total = self.parsed_count + self.fallback_count
+        return {
+            "parsed": self.parsed_count,
+            "fallback": self.fallback_count,
+            "fallback_rate": self.fallback_count / total if total else 0.0,
+        }
@@ -0,0 +1,123 @@
+# TradingAgents/graph/state_log.py
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _open_log(path: str, mode: str):
+    """Open a state log, compressed with gzip when ``path`` ends in ``.gz``."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+class StateLogWriter:
+    """Appends run records to JSONL state logs from a background thread.
+
+    ``append`` only queues the record; serialization and file I/O happen on
+    the writer thread, which appends every pending record of a file with a
+    single open. Gzip logs get one gzip member per batch, which ``gzip``
+    reads back as one stream.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def append(self, path: str, record: Dict[str, Any]) -> None:
+        """Queue ``record`` to be appended to the log at ``path``."""
+        self._ensure_thread()
+        self._queue.put((path, record))
+
+    def flush(self) -> None:
+        """Block until every queued record has been written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="state-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(items)
+            except Exception:
+                logger.exception("Failed to write state log records")
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    def _write(self, items) -> None:
+        by_path = defaultdict(list)
+        for path, record in items:
+            try:
+                by_path[path].append(json.dumps(record, ensure_ascii=False) + "\n")
+            except Exception:
+                logger.exception("Skipping unserializable state log record for %s", path)
+        for path, lines in by_path.items():
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                with _open_log(path, "ab") as f:
+                    f.write("".join(lines).encode("utf-8"))
+            except Exception:
+                logger.exception("Failed to write state log %s", path)
+
+
+state_log_writer = StateLogWriter()
+atexit.register(state_log_writer.flush)
+
+
+def read_state_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a state log one at a time, oldest first."""
+    with _open_log(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def index_state_log(path: str) -> Dict[str, int]:
+    """Map each trade date in a state log to the offset of its latest record.
+
+    Offsets are positions in the uncompressed stream, for
+    ``read_state_record``.
+    """
+    index = {}
+    with _open_log(path, "rb") as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                index[json.loads(line)["trade_date"]] = offset
+    return index
+
+
+def read_state_record(path: str, offset: int) -> Dict[str, Any]:
+    """Read the record starting at ``offset`` (see ``index_state_log``)."""
+    with _open_log(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.readline())
@@ -1,20 +1,16 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
-from pathlib import Path
-import json
+import sqlite3
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
-
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import Callable, Dict, Any, Tuple, List, Optional
 
 from langgraph.prebuilt import ToolNode
 
-from tradingagents.agents import *
+from tradingagents.agents.utils.agent_utils import ApiKeys, Toolkit
 from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.memory import FinancialSituationMemory, NullMemory
+from tradingagents.agents.utils.debate_context import DebateContext
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -23,10 +19,33 @@ from tradingagents.agents.utils.agent_states import (
 from tradingagents.dataflows.interface import set_config
 
 from .conditional_logic import ConditionalLogic
+from .node_cache import NodeCache
+from .llm_cache import create_llm_cache
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
+from .run_claims import RunClaims
+from .run_metrics import RunMetrics
 from .signal_processing import SignalProcessor
+from .state_log import state_log_writer
+
+
+class LLMHandle:
+    """Stable reference to a chat model whose client can be replaced.
+
+    Agent nodes capture their LLM when the graph is compiled. Giving them a
+    handle lets a compiled graph switch to a client with other credentials.
+    """
+
+    def __init__(self, llm):
+        self._llm = llm
+
+    def swap(self, llm):
+        """Point the handle at another chat model."""
+        self._llm = llm
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
 
 
 class TradingAgentsGraph:
@@ -39,6 +58,7 @@ class TradingAgentsGraph:
         config: Dict[str, Any] = None,
         openai_api_key: str | None = None,
         finnhub_api_key: str | None = None,
+        run_observer: Optional[Callable[[str, str, float], None]] = None,
     ):
         """Initialize the trading agents graph and components.
 
@@ -46,8 +66,11 @@ class TradingAgentsGraph:
             selected_analysts: List of analyst types to include
             debug: Whether to run in debug mode
             config: Configuration dictionary. If None, uses default config
+            run_observer: Called with each node, LLM and tool timing of a
+                run, see ``RunMetrics``
         """
         self.debug = debug
+        self.run_observer = run_observer
         self.config = config or DEFAULT_CONFIG
         if openai_api_key is not None:
             self.config["openai_api_key"] = openai_api_key
@@ -63,51 +86,35 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
-        # Initialize LLMs
-        if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(
-                model=self.config["deep_think_llm"],
-                base_url=self.config["backend_url"],
-                openai_api_key=self.config.get("openai_api_key"),
-            )
-            self.quick_thinking_llm = ChatOpenAI(
-                model=self.config["quick_think_llm"],
-                base_url=self.config["backend_url"],
-                openai_api_key=self.config.get("openai_api_key"),
-            )
-        elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
-        elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
-        
+        # Initialize LLMs, sharing one response cache between both models.
+        # Nodes hold handles so the clients can be swapped by set_api_keys.
+        self.llm_cache = create_llm_cache(self.config)
+        deep_thinking_llm, quick_thinking_llm = self._create_llms()
+        self.deep_thinking_llm = LLMHandle(deep_thinking_llm)
+        self.quick_thinking_llm = LLMHandle(quick_thinking_llm)
+
         self.toolkit = Toolkit(config=self.config)
 
         # Initialize memories
-        self.bull_memory = FinancialSituationMemory(
-            "bull_memory", self.config, self.config.get("openai_api_key")
-        )
-        self.bear_memory = FinancialSituationMemory(
-            "bear_memory", self.config, self.config.get("openai_api_key")
-        )
-        self.trader_memory = FinancialSituationMemory(
-            "trader_memory", self.config, self.config.get("openai_api_key")
-        )
-        self.invest_judge_memory = FinancialSituationMemory(
-            "invest_judge_memory", self.config, self.config.get("openai_api_key")
-        )
-        self.risk_manager_memory = FinancialSituationMemory(
-            "risk_manager_memory", self.config, self.config.get("openai_api_key")
-        )
+        self.bull_memory = self._create_memory("bull_memory")
+        self.bear_memory = self._create_memory("bear_memory")
+        self.trader_memory = self._create_memory("trader_memory")
+        self.invest_judge_memory = self._create_memory("invest_judge_memory")
+        self.risk_manager_memory = self._create_memory("risk_manager_memory")
 
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
 
         # Initialize components
-        self.conditional_logic = ConditionalLogic()
+        self.node_cache = self._create_node_cache()
+        self.debate_context = DebateContext(
+            self.quick_thinking_llm,
+            keep_last_turns=self.config.get("debate_context_turns"),
+        )
+        self.conditional_logic = ConditionalLogic(
+            max_debate_rounds=self.config["max_debate_rounds"],
+            max_risk_discuss_rounds=self.config["max_risk_discuss_rounds"],
+        )
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -119,6 +126,8 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            self.node_cache,
+            self.debate_context,
         )
 
         self.propagator = Propagator()
@@ -128,10 +137,129 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.run_metrics = None
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.checkpointer = self._create_checkpointer()
+        self.run_claims = (
+            RunClaims(
+                self.checkpointer.conn,
+                self.checkpointer.lock,
+                self.config["checkpoint_db_path"],
+            )
+            if self.checkpointer is not None
+            else None
+        )
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts, checkpointer=self.checkpointer
+        )
+
+    def _create_llms(self):
+        """Create the deep and quick thinking LLMs for the configured provider.
+
+        Only the client package of the configured provider is imported.
+        """
+        if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
+            from langchain_openai import ChatOpenAI
+
+            deep_thinking_llm = ChatOpenAI(
+                model=self.config["deep_think_llm"],
+                base_url=self.config["backend_url"],
+                openai_api_key=self.config.get("openai_api_key"),
+                cache=self.llm_cache,
+            )
+            quick_thinking_llm = ChatOpenAI(
+                model=self.config["quick_think_llm"],
+                base_url=self.config["backend_url"],
+                openai_api_key=self.config.get("openai_api_key"),
+                cache=self.llm_cache,
+            )
+        elif self.config["llm_provider"].lower() == "anthropic":
+            from langchain_anthropic import ChatAnthropic
+
+            deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+        elif self.config["llm_provider"].lower() == "google":
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], cache=self.llm_cache)
+            quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], cache=self.llm_cache)
+        else:
+            raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
+        return deep_thinking_llm, quick_thinking_llm
+
+    def _create_memory(self, name):
+        """Create a situation memory, or a no-op one when memories are disabled."""
+        if not self.config.get("memory_enabled", True):
+            return NullMemory(name)
+        return FinancialSituationMemory(
+            name, self.config, self.config.get("openai_api_key")
+        )
+
+    def set_api_keys(self, openai_api_key=None, finnhub_api_key=None):
+        """Switch the API keys used by the LLMs, memories and tools.
+
+        Lets a compiled graph be reused for another user without rebuilding
+        the memories, tool nodes or the graph itself. The keys stay on this
+        graph: the tools get them through the run config built by
+        ``prepare_run``, not the process-wide config, so graphs running at
+        the same time for different users keep their own keys.
+        """
+        key_changed = openai_api_key != self.config.get("openai_api_key")
+        self.config["openai_api_key"] = openai_api_key
+        self.config["finnhub_api_key"] = finnhub_api_key
+
+        if key_changed:
+            deep_thinking_llm, quick_thinking_llm = self._create_llms()
+            self.deep_thinking_llm.swap(deep_thinking_llm)
+            self.quick_thinking_llm.swap(quick_thinking_llm)
+            for memory in (
+                self.bull_memory,
+                self.bear_memory,
+                self.trader_memory,
+                self.invest_judge_memory,
+                self.risk_manager_memory,
+            ):
+                memory.set_api_key(openai_api_key)
+
+    def reset(self):
+        """Drop per-run state before the graph is reused for another run."""
+        self.curr_state = None
+        self.ticker = None
+        self.run_metrics = None
+        self.debate_context.reset()
+
+    def close(self):
+        """Close the SQLite connections of the checkpointer and node cache."""
+        if self.checkpointer is not None:
+            self.checkpointer.conn.close()
+        if self.node_cache is not None:
+            self.node_cache.close()
+
+    def _create_node_cache(self) -> Optional[NodeCache]:
+        """Create the node output cache if it is enabled."""
+        if not self.config.get("node_cache_enabled"):
+            return None
+        return NodeCache(
+            self.config.get("node_cache_path")
+            or os.path.join(self.config["data_cache_dir"], "node_cache.sqlite")
+        )
+
+    def _create_checkpointer(self):
+        """Create the SQLite checkpointer if checkpointing is enabled."""
+        if not self.config.get("checkpoint_enabled"):
+            return None
+
+        try:
+            from langgraph.checkpoint.sqlite import SqliteSaver
+        except ImportError as exc:
+            raise ImportError(
+                "Checkpointing requires the langgraph-checkpoint-sqlite package"
+            ) from exc
+
+        db_path = self.config["checkpoint_db_path"]
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        return SqliteSaver(sqlite3.connect(db_path, check_same_thread=False))
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
@@ -178,31 +306,114 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def _add_run_config(self, config):
+        """Attach the metrics collector and this graph's API keys to a run."""
+        config["callbacks"] = [self.run_metrics]
+        config.setdefault("configurable", {})["api_keys"] = ApiKeys(
+            self.config.get("openai_api_key"), self.config.get("finnhub_api_key")
+        )
+
+    def prepare_run(self, company_name, trade_date, resume=False, thread_id=None):
+        """Get the graph input and invocation args for a run.
+
+        Args:
+            company_name: Ticker to analyze
+            trade_date: Date of the analysis
+            resume: Continue from the last completed node of a previous run
+                on the same thread instead of starting over
+            thread_id: Checkpoint thread to use. Defaults to one per
+                (ticker, date)
+
+        Returns:
+            Tuple of the graph input (``None`` when resuming) and the keyword
+            arguments for ``graph.stream``/``graph.invoke``. The arguments
+            carry a new ``RunMetrics`` collector, kept in ``self.run_metrics``.
+
+        With checkpointing, the thread is claimed for the run until
+        ``finish_run`` is called, and ``RunInProgressError`` is raised if
+        another run holds it.
+        """
+        self.run_metrics = RunMetrics(self.node_cache, self.run_observer)
+        if self.checkpointer is None:
+            if resume:
+                raise ValueError("Resuming a run requires checkpoint_enabled")
+            args = self.propagator.get_graph_args()
+            self._add_run_config(args["config"])
+            return self.propagator.create_initial_state(company_name, trade_date), args
+
+        thread_id = thread_id or self.propagator.get_thread_id(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args(thread_id=thread_id)
+        self._add_run_config(args["config"])
+
+        self.run_claims.claim(thread_id)
+        try:
+            if resume and self.graph.get_state(args["config"]).values:
+                return None, args
+
+            # Start from scratch, dropping any checkpoints of an earlier run
+            self.checkpointer.delete_thread(thread_id)
+        except BaseException:
+            self.run_claims.release(thread_id)
+            raise
+        return self.propagator.create_initial_state(company_name, trade_date), args
+
+    def finish_run(self, args, completed):
+        """Release the checkpoint thread of a run started by ``prepare_run``.
+
+        The checkpoints of a completed run are deleted; those of a failed one
+        are kept so it can be resumed.
+        """
+        if self.checkpointer is None:
+            return
+        thread_id = args["config"]["configurable"]["thread_id"]
+        try:
+            if completed:
+                self.checkpointer.delete_thread(thread_id)
+        finally:
+            self.run_claims.release(thread_id)
+
+    def propagate(self, company_name, trade_date, resume=False, thread_id=None):
+        """Run the trading agents graph for a company on a specific date.
+
+        When checkpointing is enabled, ``resume=True`` continues an
+        interrupted run from its last completed node.
+        """
 
         self.ticker = company_name
 
         # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
+        init_agent_state, args = self.prepare_run(
+            company_name, trade_date, resume=resume, thread_id=thread_id
         )
-        args = self.propagator.get_graph_args()
-
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+
+        completed = False
+        try:
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                for chunk in self.graph.stream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1] if trace else None
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, **args)
+
+            if not final_state and self.checkpointer is not None:
+                # Resuming an already finished run yields no new steps
+                final_state = self.graph.get_state(args["config"]).values
+            completed = bool(final_state)
+        finally:
+            self.finish_run(args, completed)
+
+        # Timings and token counts of this run
+        final_state = dict(final_state, run_metrics=self.run_metrics.summary())
 
         # Store current state for reflection
         self.curr_state = final_state
@@ -213,9 +424,25 @@ class TradingAgentsGraph:
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
+    def state_log_path(self, ticker=None):
+        """Path of the JSONL state log of ``ticker`` (defaults to the last run)."""
+        path = os.path.join(
+            "eval_results",
+            ticker or self.ticker,
+            "TradingAgentsStrategy_logs",
+            "full_states_log.jsonl",
+        )
+        if self.config.get("state_log_compress"):
+            path += ".gz"
+        return path
+
     def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        """Append the final state to the ticker's JSONL state log.
+
+        The record is written by a background thread; call
+        ``state_log_writer.flush()`` before reading the log back.
+        """
+        record = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -243,18 +470,10 @@ class TradingAgentsGraph:
             },
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
+            "run_metrics": final_state.get("run_metrics"),
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
-
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-            encoding="utf-8",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        state_log_writer.append(self.state_log_path(), record)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
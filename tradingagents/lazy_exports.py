@@ -0,0 +1,27 @@
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Build PEP 562 ``__getattr__``/``__dir__`` functions for a package.
+
+    ``exports`` maps each public name to the submodule defining it, relative
+    to ``package``. A submodule is imported the first time one of its names
+    is accessed, and the value is cached in the package namespace.
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__